@@ -0,0 +1,350 @@
+"""
+Generators of synthetic Multa Recipes configurations used by the benchmarks. Every generator receives the size of the
+configuration (number of functions, resource trees, channels...) and the Lambda code path to use. Recipes that define a
+single resource (IoT Lambda pipes, IoT Policy, S3 Lambda pipes, SageMaker notebook, SPA hosting, SSM String) scale the
+size of its payload instead, or ignore the size.
+
+Registered recipes without a generator:
+ - AwsApiGatewayLambdaPipesAsync: its authorizers loop iterates the authorizer definition as a list and reads the
+   'iam_actions' of an undefined 'configuration', no configuration accepted by its schema synthesizes.
+ - AwsIotAnalyticsFanOut: the construct reads a 'channel' key while IOT_ANALYTICS_FAN_OUT_SCHEMA only accepts
+   'channel_definition', no valid configuration synthesizes.
+ - AwsLambdaLayerVenv: synthesis installs the layer requirements with pip or Docker, the benchmark would measure the
+   build and the network instead of the synthesis.
+ - AwsUserPoolCognitoGroups: the groups are created from the construct kwargs instead of the group definitions, so it
+   fails with a KeyError for any configuration.
+ - PipelineServerless: the construct validates against SNS_CONFIG_SCHEMA and defines no resources.
+"""
+import os
+
+DEFAULT_CODE_PATH = "./code"
+SCRIPTS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "multacdkrecipies", "recipies", "scripts")
+
+
+def lambda_definition(name: str, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "lambda_name": name,
+        "description": f"Handler for {name}.",
+        "code_path": code_path,
+        "runtime": "PYTHON_3_8",
+        "handler": f"{name}.lambda_handler",
+        "timeout": 10,
+        "environment_vars": {"LOG_LEVEL": "INFO", "TABLE": f"{name}_table"},
+        "iam_actions": ["dynamodb:GetItem", "dynamodb:PutItem"],
+        "alarms": [{"name": "Errors", "number": 1, "periods": 1, "points": 1, "actions": False}],
+    }
+
+
+def iot_rule_definition(name: str) -> dict:
+    return {
+        "rule_name": name,
+        "rule_disabled": False,
+        "sql": f"SELECT * FROM 'devices/+/{name}'",
+        "aws_iot_sql_version": "2016-03-23",
+    }
+
+
+def lambda_functions_cluster_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {"functions": [lambda_definition(f"function_{index}", code_path) for index in range(size)]}
+
+
+def api_gateway_robust_web_service_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "api": {
+            "apigateway_name": "benchmark",
+            "settings": {
+                "proxy": False,
+                "default_http_methods": ["GET"],
+                "default_handler": lambda_definition("default", code_path),
+                "default_stage_options": {"metrics_enabled": True, "logging_level": "INFO"},
+            },
+            "resource_trees": [
+                {
+                    "resource_name": f"resource_{index}",
+                    "methods": ["GET", "POST"],
+                    "handler": lambda_definition(f"resource_{index}", code_path),
+                    "child": {
+                        "resource_name": "child",
+                        "methods": ["GET"],
+                        "handler": lambda_definition(f"resource_{index}_child", code_path),
+                        "childs": [
+                            {
+                                "resource_name": "grandchild",
+                                "methods": ["GET"],
+                                "handler": lambda_definition(f"resource_{index}_grandchild", code_path),
+                            }
+                        ],
+                    },
+                }
+                for index in range(size)
+            ],
+        }
+    }
+
+
+def user_serverless_backend_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "dynamo_tables": [
+            {
+                "table_name": f"table_{index}",
+                "partition_key": "id",
+                "sort_key": {"name": "timestamp", "type": "integer"},
+                "stream": {"enabled": True, "function": lambda_definition(f"stream_{index}", code_path)},
+            }
+            for index in range(size)
+        ],
+        "user_pool": {
+            "pool_name": "benchmark",
+            "password_policy": {"minimum_length": 8},
+            "sign_up": {"enabled": True, "user_verification": {}},
+            "invitation": {},
+            "sign_in": {"order": ["email"]},
+            "attributes": {"standard": [{"name": "email", "mutable": True, "required": True}]},
+        },
+    }
+
+
+def iot_analytics_fan_in_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "channel_pipe_definition": [{"name": f"channel_{index}", "channel_retention_period": 7} for index in range(size)],
+        "datastore_definition": {"name": "benchmark", "datastore_retention_period": 30},
+    }
+
+
+def s3_buckets_cluster_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "buckets": [{"bucket_name": f"bucket-{index}", "versioned": False, "public_read_access": False} for index in range(size)]
+    }
+
+
+def sqs_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "queue": {"queue_name": "benchmark"},
+        "lambda_handlers": [lambda_definition(f"sqs_handler_{index}", code_path) for index in range(size)],
+    }
+
+
+def sns_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "topic": {"topic_name": "benchmark"},
+        "lambda_handlers": [lambda_definition(f"sns_handler_{index}", code_path) for index in range(size)],
+    }
+
+
+def iot_rules_sqs_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return dict(sqs_pipes_configuration(size, code_path), iot_rule=iot_rule_definition("benchmark_sqs"))
+
+
+def iot_rules_sns_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return dict(sns_pipes_configuration(size, code_path), iot_rule=iot_rule_definition("benchmark_sns"))
+
+
+def api_gateway_fan_out_web_service_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "functions": [lambda_definition(f"fan_out_{index}", code_path) for index in range(size)],
+        "api": {
+            "apigateway_name": "benchmark",
+            "settings": {"proxy": True, "default_handler": lambda_definition("default", code_path)},
+            "resource": {
+                "resource_name": "fan_out",
+                "methods": ["POST"],
+                "handler": lambda_definition("fan_out", code_path),
+            },
+        },
+    }
+
+
+def cloudwatch_lambda_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "cloudwatch_rule": {"rule_name": "benchmark", "enabled": True, "schedule": "0/5 * * * ? *"},
+        "lambda_handlers": [lambda_definition(f"scheduled_{index}", code_path) for index in range(size)],
+    }
+
+
+def iot_rules_kinesis_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "stream": {"stream_name": "benchmark", "shard_count": 1},
+        "lambda_handlers": [
+            {
+                "lambda_handler": lambda_definition(f"kinesis_handler_{index}", code_path),
+                "event_settings": {"starting_position": "LATEST", "batch_size": 100},
+            }
+            for index in range(size)
+        ],
+        "iot_rule": dict(iot_rule_definition("benchmark_kinesis"), partition_key="${topic(2)}"),
+    }
+
+
+def iot_rules_kinesis_firehose_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "stream": {
+            "stream_name": "benchmark",
+            "destinations": {
+                "extended_s3_destination_configuration": {
+                    "bucket": {"bucket_name": "benchmark-firehose", "versioned": False, "public_read_access": False},
+                    "buffering_hints": {"size": 64, "interval": 60},
+                    "prefix": "".join(f"key_{index}=!{{partitionKeyFromQuery:key_{index}}}/" for index in range(size)),
+                    "error_output_prefix": "errors/",
+                    "dynamic_partitioning": {
+                        "enabled": True,
+                        "partition_keys": {f"key_{index}": f".key_{index}" for index in range(size)},
+                    },
+                }
+            },
+        },
+        "iot_rule": iot_rule_definition("benchmark_firehose"),
+    }
+
+
+def iot_rules_lambda_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {"lambda_handler": lambda_definition("iot_handler", code_path), "iot_rule": iot_rule_definition("benchmark_lambda")}
+
+
+def iot_analytics_dataset_definition(name: str) -> dict:
+    return {
+        "dataset_name": name,
+        "retention_period": 7,
+        "sql_action": {"sql_query": f"SELECT * FROM datastore WHERE name = '{name}'"},
+        "trigger_action": {"schedule": "cron(0 * * * ? *)"},
+    }
+
+
+def iot_analytics_data_workflow_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "name": "benchmark",
+        "retention_periods": {"channel": 7, "datastore": 30},
+        "datasets": [iot_analytics_dataset_definition(f"dataset_{index}") for index in range(size)],
+    }
+
+
+def iot_analytics_simple_pipeline_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "analytics_resource_name": "benchmark",
+        "retention_periods": {"channel": 7, "datastore": 30},
+        "iot_rules": [iot_rule_definition(f"analytics_{index}") for index in range(size)],
+    }
+
+
+def iot_policy_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "name": "benchmark",
+        "policy_document": {
+            "Version": "2012-10-17",
+            "Statement": [
+                {"Effect": "Allow", "Action": ["iot:Publish"], "Resource": [f"arn:aws:iot:*:*:topic/devices/{index}/*"]}
+                for index in range(size)
+            ],
+        },
+    }
+
+
+def s3_lambda_pipes_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "bucket": {"bucket_name": "benchmark-uploads", "versioned": False, "public_read_access": False},
+        "lambda_handler": lambda_definition("upload_handler", code_path),
+        "events": ["OBJECT_CREATED", "OBJECT_REMOVED"],
+    }
+
+
+def iot_analytics_sagemaker_notebook_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "name": "benchmark",
+        "scripts": {
+            "on_create": os.path.join(SCRIPTS_PATH, "iot_analytics_notebook", "on_create.sh"),
+            "on_start": os.path.join(SCRIPTS_PATH, "iot_analytics_notebook", "on_start.sh"),
+        },
+        "instance_type": "ml.t2.medium",
+    }
+
+
+def s3_single_page_app_hosting_pipeline_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {
+        "hosting": {
+            "bucket": {"bucket_name": "benchmark-spa", "versioned": False, "public_read_access": True},
+            "cloudfront_distribution": {"name": "benchmark", "origin_config": {"behaviours": {"is_default_behavior": True}}},
+        },
+        "pipeline": {
+            "name": "benchmark",
+            "stages": {
+                "github_source": {
+                    "name": "source",
+                    "branch": "main",
+                    "repo": "benchmark",
+                    "owner": "multa",
+                    "oauth_token_secret_arn": "arn:aws:secretsmanager:us-east-1:123456789012:secret:github-token",
+                },
+                "build": {
+                    "name": "build",
+                    "commands": ["npm ci"] + [f"npm run build:{index}" for index in range(size)],
+                    "build_directory": "dist",
+                },
+                "deploy": {"name": "deploy"},
+            },
+        },
+    }
+
+
+def ssm_string_configuration(size: int, code_path: str = DEFAULT_CODE_PATH) -> dict:
+    return {"name": "benchmark", "string_value": {f"setting_{index}": f"value_{index}" for index in range(size)}}
+
+
+# Recipe name -> (Multa CDK Construct, Schema, configuration generator)
+RECIPES = {
+    "lambda_functions_cluster": (
+        "AwsLambdaFunctionsCluster",
+        "LAMBDA_FUNCTIONS_CLUSTER_SCHEMA",
+        lambda_functions_cluster_configuration,
+    ),
+    "api_gateway_robust_web_service": (
+        "AwsApiGatewayLambdaPipes",
+        "APIGATEWAY_ROBUST_WEB_SERVICE_SCHEMA",
+        api_gateway_robust_web_service_configuration,
+    ),
+    "user_serverless_backend": (
+        "AwsUserServerlessBackend",
+        "USER_SERVERLESS_BACKEND_SCHEMA",
+        user_serverless_backend_configuration,
+    ),
+    "iot_analytics_fan_in": ("AwsIotAnalyticsFanIn", "IOT_ANALYTICS_FAN_IN_SCHEMA", iot_analytics_fan_in_configuration),
+    "s3_buckets_cluster": ("AwsS3BucketsCluster", "S3_BUCKETS_CLUSTER_SCHEMA", s3_buckets_cluster_configuration),
+    "sqs_pipes": ("AwsSqsPipes", "SQS_CONFIG_SCHEMA", sqs_pipes_configuration),
+    "sns_pipes": ("AwsSnsPipes", "SNS_CONFIG_SCHEMA", sns_pipes_configuration),
+    "iot_rules_sqs_pipes": ("AwsIotRulesSqsPipes", "IOT_SQS_CONFIG_SCHEMA", iot_rules_sqs_pipes_configuration),
+    "iot_rules_sns_pipes": ("AwsIotRulesSnsPipes", "IOT_SNS_CONFIG_SCHEMA", iot_rules_sns_pipes_configuration),
+    "api_gateway_fan_out_web_service": (
+        "AwsApiGatewayLambdaFanOutBE",
+        "APIGATEWAY_FAN_OUT_WEB_SERVICE_SCHEMA",
+        api_gateway_fan_out_web_service_configuration,
+    ),
+    "cloudwatch_lambda_pipes": ("AwsCloudwatchLambdaPipes", "CLOUDWATCH_CONFIG_SCHEMA", cloudwatch_lambda_pipes_configuration),
+    "iot_rules_kinesis_pipes": ("AwsIotRulesKinesisPipes", "IOT_KINESIS_CONFIG_SCHEMA", iot_rules_kinesis_pipes_configuration),
+    "iot_rules_kinesis_firehose_pipes": (
+        "AwsIotRulesKinesisFirehosePipes",
+        "IOT_KINESIS_FIREHOSE_CONFIG_SCHEMA",
+        iot_rules_kinesis_firehose_pipes_configuration,
+    ),
+    "iot_rules_lambda_pipes": ("AwsIotRulesLambdaPipes", "IOT_LAMBDA_CONFIG_SCHEMA", iot_rules_lambda_pipes_configuration),
+    "iot_analytics_data_workflow": (
+        "AwsIotAnalyticsDataWorkflow",
+        "IOT_ANALYTICS_DATA_WORKFLOW_SCHEMA",
+        iot_analytics_data_workflow_configuration,
+    ),
+    "iot_analytics_simple_pipeline": (
+        "AwsIotAnalyticsSimplePipeline",
+        "IOT_ANALYTICS_SIMPLE_PIPELINE_SCHEMA",
+        iot_analytics_simple_pipeline_configuration,
+    ),
+    "iot_analytics_sagemaker_notebook": (
+        "AwsIoTAnalyticsSageMakerNotebook",
+        "SAGEMAKER_NOTEBOOK_SCHEMA",
+        iot_analytics_sagemaker_notebook_configuration,
+    ),
+    "iot_policy": ("AwsIotPolicy", "IOT_POLICY_SCHEMA", iot_policy_configuration),
+    "s3_lambda_pipes": ("AwsS3LambdaPipes", "S3_LAMBDA_CONFIG_SCHEMA", s3_lambda_pipes_configuration),
+    "s3_spa_hosting_pipeline": (
+        "AwsS3SinglePageAppHostingPipeline",
+        "S3_SPA_SIMPLE_PIPELINE_HOSTING_SCHEMA",
+        s3_single_page_app_hosting_pipeline_configuration,
+    ),
+    "ssm_string": ("AwsSsmString", "SSM_PARAMETER_STRING_SCHEMA", ssm_string_configuration),
+}
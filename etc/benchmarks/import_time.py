@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Cold import time benchmark for multacdkrecipies.
+
+Every scenario is executed in a fresh Python interpreter so nothing is reused from previous imports, which is what a
+`cdk synth` execution sees. The 'eager' scenario imports every Multa CDK Construct (like the old package namespace
+did), the rest of the scenarios show the cost of importing only what a CDK App really uses.
+
+Usage: python etc/benchmarks/import_time.py [--runs 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "package": "import multacdkrecipies",
+    "sqs_pipes": "from multacdkrecipies import AwsIotRulesSqsPipes",
+    "api_gateway": "from multacdkrecipies import AwsApiGatewayLambdaPipes",
+    "eager": "from multacdkrecipies import *",
+}
+
+REPOSITORY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def cold_import_time(statement: str) -> float:
+    """
+    Measures the wall time of a Python statement executed in a new interpreter.
+    :param statement: Python statement to execute.
+    :return: Elapsed seconds.
+    """
+    environment = dict(os.environ, PYTHONPATH=REPOSITORY_PATH, JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION="1")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], env=environment, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time benchmark for multacdkrecipies.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per scenario.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    arguments = parser.parse_args()
+
+    baseline = cold_import_time("pass")
+    results = dict()
+    for scenario, statement in SCENARIOS.items():
+        timings = [cold_import_time(statement) - baseline for _ in range(arguments.runs)]
+        results[scenario] = {
+            "statement": statement,
+            "median_seconds": round(statistics.median(timings), 4),
+            "min_seconds": round(min(timings), 4),
+        }
+
+    if arguments.json is True:
+        print(json.dumps(results, indent=2))
+        return
+
+    for scenario, result in results.items():
+        print(f"{scenario:<12} {result['median_seconds']:>8.3f}s (min {result['min_seconds']:.3f}s)  {result['statement']}")
+
+
+if __name__ == "__main__":
+    main()
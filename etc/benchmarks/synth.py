@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Synthesis benchmark for the Multa CDK Constructs. For every recipe and size a synthetic configuration is generated
+(see configurations.py) and the wall time, peak RSS and template size are measured for the three phases of a
+`cdk synth`: configuration validation, construct instantiation and app.synth(). Constructs validate their
+configuration again when instantiated, that time is subtracted from the instantiation phase.
+
+Every measure runs in a fresh Python interpreter, so imports and caches of previous measures are not reused and the
+peak RSS of each phase is the peak of the process up to the end of that phase. The RSS of the jsii Node.js runtime is
+not included. Results are printed, or written with --output, as JSON for regression tracking.
+
+Usage: python etc/benchmarks/synth.py [--recipes lambda_functions_cluster ...] [--sizes 10 50 100] [--output results.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPOSITORY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, REPOSITORY_PATH)
+
+from configurations import RECIPES  # noqa: E402
+
+
+def peak_rss_kilobytes() -> int:
+    """
+    :return: Peak resident set size of the process in kilobytes.
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss // 1024 if sys.platform == "darwin" else peak_rss
+
+
+def measure(recipe: str, size: int) -> dict:
+    """
+    Measures the phases of the synthesis of a recipe, executed in the worker interpreter.
+    :param recipe: Recipe name, key of RECIPES.
+    :param size: Size of the generated configuration.
+    :return: Dictionary with the measures of every phase.
+    """
+    construct_name, schema_name, generator = RECIPES[recipe]
+    phases = dict()
+
+    start = time.perf_counter()
+    from aws_cdk import core
+    import multacdkrecipies
+
+    construct_class = getattr(multacdkrecipies, construct_name)
+    phases["import"] = {"seconds": time.perf_counter() - start, "peak_rss_kb": peak_rss_kilobytes()}
+
+    with tempfile.TemporaryDirectory() as working_directory:
+        code_path = os.path.join(working_directory, "code")
+        os.makedirs(code_path)
+        with open(os.path.join(code_path, "handler.py"), "w") as handler_file:
+            handler_file.write("def lambda_handler(event, context):\n    return event\n")
+        configuration = generator(size, code_path)
+
+        start = time.perf_counter()
+        multacdkrecipies.validate_configuration(getattr(multacdkrecipies, schema_name), configuration)
+        phases["validation"] = {"seconds": time.perf_counter() - start, "peak_rss_kb": peak_rss_kilobytes()}
+
+        # The construct validates its configuration again, that time is already counted in the validation phase
+        construct_module = sys.modules[construct_class.__module__]
+        construct_validation_seconds = list()
+
+        def timed_validate_configuration(*args, **kwargs):
+            validation_start = time.perf_counter()
+            try:
+                return multacdkrecipies.validate_configuration(*args, **kwargs)
+            finally:
+                construct_validation_seconds.append(time.perf_counter() - validation_start)
+
+        construct_module.validate_configuration = timed_validate_configuration
+
+        app = core.App(outdir=os.path.join(working_directory, "cdk.out"))
+        stack = core.Stack(app, "BenchmarkStack")
+        start = time.perf_counter()
+        construct_class(stack, "Benchmark", prefix="benchmark", environment="dev", configuration=configuration)
+        phases["instantiation"] = {
+            "seconds": time.perf_counter() - start - sum(construct_validation_seconds),
+            "peak_rss_kb": peak_rss_kilobytes(),
+        }
+
+        start = time.perf_counter()
+        assembly = app.synth()
+        phases["synth"] = {"seconds": time.perf_counter() - start, "peak_rss_kb": peak_rss_kilobytes()}
+
+        templates = [json.dumps(stack_artifact.template) for stack_artifact in assembly.stacks]
+        resources = sum(len(stack_artifact.template.get("Resources", {})) for stack_artifact in assembly.stacks)
+
+    return {
+        "recipe": recipe,
+        "size": size,
+        "phases": phases,
+        "stacks": len(templates),
+        "resources": resources,
+        "template_bytes": sum(len(template) for template in templates),
+    }
+
+
+def run_worker(recipe: str, size: int) -> dict:
+    """
+    Runs a measure in a fresh Python interpreter.
+    :param recipe: Recipe name, key of RECIPES.
+    :param size: Size of the generated configuration.
+    :return: Dictionary with the measures of every phase.
+    """
+    environment = dict(os.environ, JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION="1")
+    completed_process = subprocess.run(
+        [sys.executable, __file__, "--worker", recipe, str(size)],
+        env=environment,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if completed_process.returncode != 0:
+        return {"recipe": recipe, "size": size, "error": f"Worker failed with exit code {completed_process.returncode}"}
+    return json.loads(completed_process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesis benchmark for the Multa CDK Constructs.")
+    parser.add_argument("--recipes", nargs="+", choices=sorted(RECIPES), default=sorted(RECIPES), help="Recipes to measure.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="Generated configuration sizes.")
+    parser.add_argument("--output", help="Path of the JSON file where the results are written.")
+    parser.add_argument("--worker", nargs=2, metavar=("RECIPE", "SIZE"), help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.worker is not None:
+        print(json.dumps(measure(arguments.worker[0], int(arguments.worker[1]))))
+        return
+
+    results = list()
+    for recipe in arguments.recipes:
+        for size in arguments.sizes:
+            result = run_worker(recipe, size)
+            results.append(result)
+            if result.get("error") is not None:
+                print(f"{recipe:<32} {size:>5}  {result['error']}", file=sys.stderr)
+                continue
+            phases = result["phases"]
+            print(
+                f"{recipe:<32} {size:>5}  validation {phases['validation']['seconds']:>7.3f}s  "
+                f"instantiation {phases['instantiation']['seconds']:>7.3f}s  synth {phases['synth']['seconds']:>7.3f}s  "
+                f"peak {phases['synth']['peak_rss_kb'] // 1024:>5}MB  {result['resources']:>5} resources  "
+                f"{result['template_bytes'] // 1024:>6}KB",
+                file=sys.stderr,
+            )
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Configuration validation benchmark, compares the schema library (Schema.validate) with the compiled validators used by
+validate_configuration on big generated configurations.
+
+Usage: python etc/benchmarks/validation.py [--sizes 10 100 500] [--runs 5] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from configurations import RECIPES  # noqa: E402
+from multacdkrecipies.recipies import utils  # noqa: E402
+
+
+def median_time(function, runs: int) -> float:
+    timings = list()
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Configuration validation benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="Generated configuration sizes.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per measure.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    arguments = parser.parse_args()
+
+    results = list()
+    for scenario, (_, schema_name, generator) in RECIPES.items():
+        configuration_schema = getattr(utils, schema_name)
+        validator = utils.compiled_schema(configuration_schema)
+        for size in arguments.sizes:
+            configuration = generator(size)
+            schema_seconds = median_time(lambda: configuration_schema.validate(configuration), arguments.runs)
+            compiled_seconds = median_time(lambda: validator(configuration), arguments.runs)
+            results.append(
+                {
+                    "scenario": scenario,
+                    "size": size,
+                    "schema_seconds": round(schema_seconds, 6),
+                    "compiled_seconds": round(compiled_seconds, 6),
+                    "speedup": round(schema_seconds / compiled_seconds, 1),
+                }
+            )
+
+    if arguments.json is True:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        print(
+            f"{result['scenario']:<32} {result['size']:>5}  schema {result['schema_seconds']:>9.4f}s  "
+            f"compiled {result['compiled_seconds']:>9.4f}s  x{result['speedup']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
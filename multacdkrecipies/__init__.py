@@ -1,3 +1,33 @@
-from multacdkrecipies.recipies import *
+from multacdkrecipies.recipies.scripts import *
+from multacdkrecipies.recipies.settings import *
+from multacdkrecipies.recipies.utils import *
 from multacdkrecipies.framework import *
-from multacdkrecipies.common import *
+from multacdkrecipies.common.framework_constructs import *
+from multacdkrecipies.common.instrumentation import *
+from multacdkrecipies.common.validations import *
+from multacdkrecipies import common, recipies
+
+# Multa CDK Constructs and base resources functions are not star imported, that would import every AWS CDK module
+# at once, instead they are resolved on first access by the lazy registries of each package.
+__all__ = (
+    [name for name in globals() if not name.startswith("_")]
+    + recipies.constructs.__all__
+    + common.resources_constructs.__all__
+)
+
+
+def __getattr__(name: str):
+    """
+    Resolves Multa CDK Constructs and base resources functions the first time they are accessed.
+    :param name: Name of the Multa CDK Construct or base resource function.
+    :return: Multa CDK Construct class or base resource function.
+    """
+    if name in recipies.constructs.__all__:
+        return getattr(recipies.constructs, name)
+    if name in common.resources_constructs.__all__:
+        return getattr(common.resources_constructs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
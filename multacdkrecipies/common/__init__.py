@@ -1,3 +1,22 @@
-from .resources_constructs import *
+from . import resources_constructs
 from .framework_constructs import *
+from .instrumentation import *
 from .validations import *
+
+__all__ = [name for name in globals() if not name.startswith("_")] + resources_constructs.__all__
+
+
+def __getattr__(name: str):
+    """
+    Delegates the access to base resources functions to the lazy registry in
+    'multacdkrecipies.common.resources_constructs'.
+    :param name: Name of the base resource function.
+    :return: Base resource function.
+    """
+    if name in resources_constructs.__all__:
+        return getattr(resources_constructs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,136 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# Opt-in instrumentation of the base resources functions and the Multa CDK Constructs initialization. It is enabled
+# with the MULTA_INSTRUMENTATION environment variable ('report' or 'chrome') or with 'enable_instrumentation', in both
+# cases before the constructs are accessed for the first time.
+INSTRUMENTATION_FORMATS = ("report", "chrome")
+
+_settings = {"enabled": False, "format": None, "output": None}
+_statistics = dict()
+_trace_events = list()
+_lock = threading.Lock()
+
+
+def enable_instrumentation(output_format: str = "report", output: str = None):
+    """
+    Enables the instrumentation, the results are emitted when the process exits.
+    :param output_format: 'report' for a table sorted by cumulative time or 'chrome' for a Chrome trace JSON file.
+    :param output: Path of the file where the results are written. By default the report is printed to stderr and the
+    Chrome trace is written to 'multa_trace.json'.
+    """
+    if output_format not in INSTRUMENTATION_FORMATS:
+        raise ValueError(f"Instrumentation format {output_format} not in {INSTRUMENTATION_FORMATS}")
+
+    if _settings["enabled"] is False:
+        atexit.register(emit_instrumentation)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _settings.update(enabled=True, format=output_format, output=output)
+
+
+def instrumentation_enabled() -> bool:
+    """
+    :return: True or False depending if the instrumentation is enabled or not.
+    """
+    return _settings["enabled"]
+
+
+def instrument(function, name: str = None, category: str = "resource"):
+    """
+    Wraps a function to record its call count, cumulative wall time and traced memory allocation delta.
+    :param function: Function to instrument.
+    :param name: Name used in the results, by default the function qualified name.
+    :param category: Category used in the results, 'resource' for base resources functions and 'recipe' for constructs.
+    :return: Instrumented function.
+    """
+    if getattr(function, "__instrumented__", False) is True:
+        return function
+    name = name or function.__qualname__
+
+    @functools.wraps(function)
+    def instrumented(*args, **kwargs):
+        memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            memory_delta = tracemalloc.get_traced_memory()[0] - memory_before
+            _record(name, category, start, elapsed, memory_delta)
+
+    instrumented.__instrumented__ = True
+    return instrumented
+
+
+def instrument_construct(construct_class):
+    """
+    Instruments the '__init__' method of a Multa CDK Construct class.
+    :param construct_class: Multa CDK Construct class.
+    :return: The same class, instrumented.
+    """
+    construct_class.__init__ = instrument(
+        construct_class.__init__, name=f"{construct_class.__name__}.__init__", category="recipe"
+    )
+    return construct_class
+
+
+def _record(name: str, category: str, start: float, elapsed: float, memory_delta: int):
+    with _lock:
+        statistics = _statistics.setdefault(name, {"category": category, "calls": 0, "seconds": 0.0, "memory_bytes": 0})
+        statistics["calls"] += 1
+        statistics["seconds"] += elapsed
+        statistics["memory_bytes"] += memory_delta
+        _trace_events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {"memory_delta_bytes": memory_delta},
+            }
+        )
+
+
+def instrumentation_report() -> list:
+    """
+    :return: List of the instrumented functions statistics sorted by cumulative wall time.
+    """
+    with _lock:
+        report = [dict(statistics, name=name) for name, statistics in _statistics.items()]
+    return sorted(report, key=lambda statistics: statistics["seconds"], reverse=True)
+
+
+def emit_instrumentation():
+    """
+    Emits the instrumentation results in the enabled format, registered to be executed when the process exits.
+    """
+    if _settings["format"] == "chrome":
+        with open(_settings["output"] or "multa_trace.json", "w") as trace_file:
+            json.dump({"traceEvents": list(_trace_events), "displayTimeUnit": "ms"}, trace_file)
+        return
+
+    lines = [f"{'name':<56} {'category':<9} {'calls':>7} {'seconds':>10} {'memory (KB)':>12}"]
+    for statistics in instrumentation_report():
+        lines.append(
+            f"{statistics['name']:<56} {statistics['category']:<9} {statistics['calls']:>7} "
+            f"{statistics['seconds']:>10.4f} {statistics['memory_bytes'] / 1024:>12.1f}"
+        )
+    if _settings["output"] is not None:
+        with open(_settings["output"], "w") as report_file:
+            report_file.write("\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines), file=sys.stderr)
+
+
+if os.environ.get("MULTA_INSTRUMENTATION") in INSTRUMENTATION_FORMATS:
+    enable_instrumentation(os.environ["MULTA_INSTRUMENTATION"], output=os.environ.get("MULTA_INSTRUMENTATION_OUTPUT"))
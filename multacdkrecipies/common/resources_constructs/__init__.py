@@ -1,30 +1,86 @@
-from .alarms import base_alarm
-from .bucket import base_bucket
-from .cognito_user_groups import base_cognito_user_groups
-from .cognito_user_identity_pool import base_cognito_user_identity_pool, base_cognito_user_identity_pool_attach_role
-from .cognito_user_pool import base_cognito_user_pool
-from .dynamo_table import base_dynamodb_table
-from .iot_analytics_channel import base_iot_analytics_channel
-from .iot_analytics_sql_dataset import base_iot_analytics_dataset
-from .iot_analytics_datastore import base_iot_analytics_datastore
-from .iot_analytics_pipeline import base_iot_analytics_pipeline
-from .iot_rule import base_iot_rule
-from .kinesis_firehose_delivery_stream import base_kinesis_firehose_delivery_stream, base_kinesis_firehose_s3_role
-from .kinesis_stream import base_kinesis_stream
-from .lambda_function import base_lambda_function
-from .lambda_layer import base_lambda_layer
-from .role import (
-    base_cognito_identity_pool_unauth_role,
-    base_cognito_identity_pool_auth_role,
-    base_federated_role,
-    base_service_role,
-    base_iot_analytics_role,
-    base_kinesis_role,
-    base_kinesis_firehose_role,
-    base_kinesis_firehose_s3_role,
-    base_lambda_role,
-    base_sns_role,
-    base_sqs_role,
-)
-from .queue import base_queue
-from .topic import base_topic
+import importlib
+
+from multacdkrecipies.common.instrumentation import instrument, instrumentation_enabled
+
+# Base resources functions registry, each function is imported (together with the AWS CDK modules it uses) only when
+# it is accessed for the first time, so an application only pays the import cost of the resources it really uses.
+# Modules of this package import the base resources functions of other modules from the package, not from their
+# module, so those calls are also instrumented when the instrumentation is enabled.
+RESOURCES_CONSTRUCTS_MODULES = {
+    "base_alarm": ".alarms",
+    "base_api_gateway_stage_options": ".api_gateway",
+    "api_gateway_cache_key_parameters": ".api_gateway",
+    "base_bucket": ".bucket",
+    "base_cognito_user_groups": ".cognito_user_groups",
+    "base_cognito_user_identity_pool": ".cognito_user_identity_pool",
+    "base_cognito_user_identity_pool_attach_role": ".cognito_user_identity_pool",
+    "base_cognito_user_pool": ".cognito_user_pool",
+    "base_dax_cluster": ".dax_cluster",
+    "base_dax_cluster_consumer": ".dax_cluster",
+    "base_dynamodb_table": ".dynamo_table",
+    "base_dynamodb_table_autoscaling": ".dynamo_table",
+    "base_dynamodb_event_source": ".event_source",
+    "base_kinesis_event_source": ".event_source",
+    "base_sqs_event_source": ".event_source",
+    "stream_event_source_options": ".event_source",
+    "base_iot_analytics_channel": ".iot_analytics_channel",
+    "base_iot_analytics_dataset": ".iot_analytics_sql_dataset",
+    "base_iot_analytics_datastore": ".iot_analytics_datastore",
+    "base_iot_analytics_pipeline": ".iot_analytics_pipeline",
+    "base_iot_rule": ".iot_rule",
+    "is_constant_iot_expression": ".iot_rule",
+    "base_kinesis_firehose_delivery_stream": ".kinesis_firehose_delivery_stream",
+    "base_kinesis_stream": ".kinesis_stream",
+    "base_kinesis_stream_autoscaling": ".kinesis_stream",
+    "base_lambda_function": ".lambda_function",
+    "base_lambda_function_alias": ".lambda_function",
+    "lambda_code_cache_info": ".lambda_function",
+    "base_lambda_layer": ".lambda_layer",
+    "lambda_layer_architecture": ".lambda_layer",
+    "base_nested_stack": ".nested_stack",
+    "NestedStackShards": ".nested_stack",
+    "base_cognito_identity_pool_unauth_role": ".role",
+    "base_cognito_identity_pool_auth_role": ".role",
+    "base_federated_role": ".role",
+    "base_service_role": ".role",
+    "base_shared_managed_policy": ".role",
+    "base_shared_role": ".role",
+    "base_iot_analytics_role": ".role",
+    "base_kinesis_role": ".role",
+    "base_kinesis_firehose_role": ".role",
+    "base_kinesis_firehose_s3_role": ".role",
+    "base_lambda_role": ".role",
+    "base_sns_role": ".role",
+    "base_sqs_role": ".role",
+    "base_queue": ".queue",
+    "base_dead_letter_queue": ".queue",
+    "queue_consumers_settings": ".queue",
+    "base_topic": ".topic",
+}
+
+__all__ = list(RESOURCES_CONSTRUCTS_MODULES)
+
+
+def __getattr__(name: str):
+    """
+    Imports the module of a base resource function the first time the function is accessed.
+    :param name: Name of the base resource function.
+    :return: Base resource function.
+    """
+    module_path = RESOURCES_CONSTRUCTS_MODULES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(module_path, package=__name__)
+    resource_function = getattr(module, name)
+    if instrumentation_enabled() and name.startswith("base_"):
+        # Replaced in its module too, so the calls between functions of the same module are also instrumented
+        resource_function = instrument(resource_function, name=name, category="resource")
+        setattr(module, name, resource_function)
+    globals()[name] = resource_function
+
+    return resource_function
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,104 @@
+from aws_cdk import core, aws_apigateway as api_gateway
+
+from multacdkrecipies.recipies.settings import (
+    APIGATEWAY_AUTHORIZER_IDENTITY_SOURCE,
+    APIGATEWAY_CACHE_CLUSTER_SIZES,
+    APIGATEWAY_CACHE_KEY_PARAMETER_SOURCES,
+    APIGATEWAY_CACHE_MAX_TTL,
+    DEFAULT_APIGATEWAY_CACHE_CLUSTER_SIZE,
+    DEFAULT_APIGATEWAY_CACHE_TTL,
+    DEFAULT_APIGATEWAY_CACHED_METHODS,
+)
+
+
+def base_api_gateway_stage_options(stage_configuration: dict, method_caches: dict = None):
+    """
+    Function that generates the options of the deployment stage of a Rest API, with its logging level, metrics and the
+    cache cluster used by the methods with caching.
+    :param stage_configuration: Consist of required 'metrics_enabled', 'logging_level' and optional 'cache_cluster', with required 'enabled' and optionals 'size' (GB) and 'encrypted'.
+    :param method_caches: Dictionary of resource paths and their 'cache' configuration, see 'api_gateway_method_cache_options'.
+    :return: API Gateway Stage Options.
+    """
+    logging_level = api_gateway.MethodLoggingLevel.ERROR
+    logging_level_configuration = stage_configuration["logging_level"]
+    for element in api_gateway.MethodLoggingLevel:
+        if logging_level_configuration in str(element):
+            logging_level = element
+
+    cache_cluster = stage_configuration.get("cache_cluster", dict())
+    cache_cluster_enabled = cache_cluster.get("enabled") is True
+    cache_cluster_size = cache_cluster.get("size", DEFAULT_APIGATEWAY_CACHE_CLUSTER_SIZE)
+    if cache_cluster_enabled is True and cache_cluster_size not in APIGATEWAY_CACHE_CLUSTER_SIZES:
+        print(f"Wrong API Gateway cache cluster size {cache_cluster_size}, use one of {APIGATEWAY_CACHE_CLUSTER_SIZES}")
+        raise RuntimeError
+
+    method_options = dict()
+    for resource_path, cache_configuration in (method_caches or dict()).items():
+        if cache_configuration.get("enabled", True) is False:
+            continue
+        if cache_cluster_enabled is False:
+            print(f"API Gateway resource {resource_path} caching needs the stage 'cache_cluster' enabled")
+            raise RuntimeError
+        method_options.update(
+            api_gateway_method_cache_options(resource_path, cache_configuration, cache_cluster.get("encrypted", False))
+        )
+
+    return api_gateway.StageOptions(
+        logging_level=logging_level,
+        metrics_enabled=stage_configuration["metrics_enabled"],
+        cache_cluster_enabled=cache_cluster_enabled or None,
+        cache_cluster_size=cache_cluster_size if cache_cluster_enabled is True else None,
+        method_options=method_options or None,
+    )
+
+
+def api_gateway_method_cache_options(resource_path: str, cache_configuration: dict, encrypted: bool = False) -> dict:
+    """
+    Function that generates the deployment options of the cached methods of an API Gateway resource.
+    :param resource_path: Path of the resource in the Rest API, for example '/devices/status'.
+    :param cache_configuration: Consist of optionals 'enabled', 'methods' (GET by default), 'ttl' (seconds), 'encrypted' and 'key_parameters'.
+    :param encrypted: Default encryption of the cached responses, from the stage cache cluster.
+    :return: Dictionary of method paths and their API Gateway Method Deployment Options.
+    """
+    cache_ttl = cache_configuration.get("ttl", DEFAULT_APIGATEWAY_CACHE_TTL)
+    if not 0 <= cache_ttl <= APIGATEWAY_CACHE_MAX_TTL:
+        print(f"API Gateway resource {resource_path} cache TTL must be between 0 and {APIGATEWAY_CACHE_MAX_TTL} seconds")
+        raise RuntimeError
+
+    method_options = dict()
+    for method in cache_configuration.get("methods", DEFAULT_APIGATEWAY_CACHED_METHODS):
+        method_options[f"{resource_path}/{method.upper()}"] = api_gateway.MethodDeploymentOptions(
+            caching_enabled=True,
+            cache_ttl=core.Duration.seconds(cache_ttl),
+            cache_data_encrypted=cache_configuration.get("encrypted", encrypted),
+        )
+    return method_options
+
+
+def api_gateway_cache_key_parameters(method: str, cache_configuration: dict = None, authorizer=None) -> dict:
+    """
+    Function that generates the request parameters of an API Gateway method and the cache key parameters of its
+    integration, so the responses are cached per value of the path, query string and header parameters. API Gateway
+    does not include the caller in the cache key, so the methods with an authorizer are also cached per identity source,
+    otherwise the response cached for one caller would be returned to the others.
+    :param method: HTTP method of the API Gateway method.
+    :param cache_configuration: Consist of optionals 'enabled', 'methods' and 'key_parameters', with optionals 'path', 'querystring' and 'header' lists.
+    :param authorizer: API Gateway Authorizer of the method, if any.
+    :return: Dictionary with the method 'request_parameters' and the integration 'cache_key_parameters'.
+    """
+    if cache_configuration is None or cache_configuration.get("enabled", True) is False:
+        return dict(request_parameters=None, cache_key_parameters=None)
+    cached_methods = cache_configuration.get("methods", DEFAULT_APIGATEWAY_CACHED_METHODS)
+    if method.upper() not in [name.upper() for name in cached_methods]:
+        return dict(request_parameters=None, cache_key_parameters=None)
+
+    cache_key_parameters = list()
+    for source in APIGATEWAY_CACHE_KEY_PARAMETER_SOURCES:
+        for parameter in cache_configuration.get("key_parameters", dict()).get(source, list()):
+            cache_key_parameters.append(f"method.request.{source}.{parameter}")
+    if authorizer is not None and APIGATEWAY_AUTHORIZER_IDENTITY_SOURCE not in cache_key_parameters:
+        cache_key_parameters.append(APIGATEWAY_AUTHORIZER_IDENTITY_SOURCE)
+
+    # Path parameters are always required, query string and header parameters are optional
+    request_parameters = {parameter: parameter.startswith("method.request.path.") for parameter in cache_key_parameters}
+    return dict(request_parameters=request_parameters or None, cache_key_parameters=cache_key_parameters or None)
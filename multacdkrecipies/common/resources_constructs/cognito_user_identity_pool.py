@@ -1,6 +1,6 @@
 from aws_cdk import core, aws_cognito as cognito
 
-from .role import base_cognito_identity_pool_auth_role, base_cognito_identity_pool_unauth_role
+from . import base_cognito_identity_pool_auth_role, base_cognito_identity_pool_unauth_role
 
 
 def base_cognito_user_identity_pool(construct, user_pool_client_id, user_pool_provider_name, **kwargs):
@@ -1,6 +1,6 @@
 from aws_cdk import core, aws_cognito as cognito
 
-from .lambda_function import base_lambda_function
+from . import base_lambda_function
 
 
 def base_cognito_user_pool(construct, **kwargs):
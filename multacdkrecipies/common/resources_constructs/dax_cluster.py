@@ -0,0 +1,147 @@
+import hashlib
+import re
+
+from aws_cdk import (
+    aws_dax as dax,
+    aws_iam as iam,
+    aws_lambda as lambda_,
+)
+
+from multacdkrecipies.recipies.settings import (
+    DAX_CLUSTER_NAME_MAX_LENGTH,
+    DAX_ENDPOINT_ENVIRONMENT_VARIABLE,
+    DAX_MAX_REPLICATION_FACTOR,
+    DEFAULT_DAX_ITEM_TTL,
+    DEFAULT_DAX_NODE_TYPE,
+    DEFAULT_DAX_QUERY_TTL,
+    DEFAULT_DAX_REPLICATION_FACTOR,
+)
+from . import base_service_role
+
+# Data plane actions of the DAX clients, reads are served from the cache and writes go through it to the table
+DAX_CONSUMER_ACTIONS = [
+    "dax:GetItem",
+    "dax:BatchGetItem",
+    "dax:Query",
+    "dax:Scan",
+    "dax:PutItem",
+    "dax:UpdateItem",
+    "dax:DeleteItem",
+    "dax:BatchWriteItem",
+    "dax:ConditionCheckItem",
+]
+
+
+def dax_cluster_name(construct, table_name: str) -> str:
+    """
+    Function that generates the name of a DAX Cluster. DAX names only allow 20 lowercase letters, digits and hyphens, so
+    longer names are truncated and suffixed with a hash of the full name to keep them unique.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param table_name: Name of the DynamoDB Table. Used for naming purposes.
+    :return: Name of the DAX Cluster.
+    """
+    cluster_name = re.sub("[^a-z0-9-]+", "-", f"{construct.prefix}-{table_name}-{construct.environment_}".lower())
+    if len(cluster_name) > DAX_CLUSTER_NAME_MAX_LENGTH:
+        name_hash = hashlib.sha1(cluster_name.encode()).hexdigest()[:5]
+        cluster_name = cluster_name[: DAX_CLUSTER_NAME_MAX_LENGTH - 6].rstrip("-") + "-" + name_hash
+    return cluster_name
+
+
+def base_dax_cluster(construct, table, table_name: str, **kwargs):
+    """
+    Function that generates a DynamoDB Accelerator (DAX) Cluster in front of a DynamoDB Table, with its Subnet Group,
+    Parameter Group with the items and queries time to live and an IAM Service Role to access the table.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param table: DynamoDB Table Construct.
+    :param table_name: Name of the DynamoDB Table. Used for naming purposes.
+    :param kwargs: Consist of required 'subnet_ids', 'security_group_ids' and optionals 'node_type', 'replication_factor', 'item_ttl', 'query_ttl' (seconds) and 'encryption'.
+    :return: DAX Cluster Construct.
+    """
+    cluster_name = dax_cluster_name(construct, table_name)
+    replication_factor = kwargs.get("replication_factor", DEFAULT_DAX_REPLICATION_FACTOR)
+    if not 1 <= replication_factor <= DAX_MAX_REPLICATION_FACTOR:
+        print(f"DAX Cluster {cluster_name} replication factor must be between 1 and {DAX_MAX_REPLICATION_FACTOR}")
+        raise RuntimeError
+    if replication_factor > len(kwargs["subnet_ids"]):
+        print(f"Warning: DAX Cluster {cluster_name} has more nodes than subnets, some nodes share an Availability Zone")
+
+    subnet_group = dax.CfnSubnetGroup(
+        construct,
+        id=cluster_name + "-subnets",
+        subnet_group_name=cluster_name,
+        subnet_ids=kwargs["subnet_ids"],
+        description=f"Subnets of the {table_name} DAX Cluster",
+    )
+    parameter_group = dax.CfnParameterGroup(
+        construct,
+        id=cluster_name + "-parameters",
+        parameter_group_name=cluster_name,
+        parameter_name_values={
+            "record-ttl-millis": str(kwargs.get("item_ttl", DEFAULT_DAX_ITEM_TTL) * 1000),
+            "query-ttl-millis": str(kwargs.get("query_ttl", DEFAULT_DAX_QUERY_TTL) * 1000),
+        },
+        description=f"Cache time to live of the {table_name} DAX Cluster",
+    )
+
+    role = base_service_role(
+        construct,
+        resource_name=table_name + "_dax",
+        principal_resource="dax",
+        actions=[
+            "dynamodb:DescribeTable",
+            "dynamodb:GetItem",
+            "dynamodb:BatchGetItem",
+            "dynamodb:Query",
+            "dynamodb:Scan",
+            "dynamodb:PutItem",
+            "dynamodb:UpdateItem",
+            "dynamodb:DeleteItem",
+            "dynamodb:BatchWriteItem",
+            "dynamodb:ConditionCheckItem",
+        ],
+        resources=[table.table_arn, table.table_arn + "/index/*"],
+    )
+
+    dax_cluster = dax.CfnCluster(
+        construct,
+        id=cluster_name,
+        cluster_name=cluster_name,
+        iam_role_arn=role.role_arn,
+        node_type=kwargs.get("node_type", DEFAULT_DAX_NODE_TYPE),
+        replication_factor=replication_factor,
+        subnet_group_name=subnet_group.ref,
+        parameter_group_name=parameter_group.ref,
+        security_group_ids=kwargs["security_group_ids"],
+        sse_specification=dax.CfnCluster.SSESpecificationProperty(sse_enabled=kwargs.get("encryption", True)),
+        description=f"DynamoDB Accelerator of {table_name}",
+    )
+    dax_cluster.node.add_dependency(role)
+
+    return dax_cluster
+
+
+def base_dax_cluster_consumer(lambda_function, dax_cluster, **kwargs):
+    """
+    Function that lets a Lambda Function use a DAX Cluster. The function runs in the cluster subnets, gets its discovery
+    endpoint in the DAX_ENDPOINT environment variable and the permissions to read and write through the cluster. In the
+    subnets the function reaches the internet and other AWS services only through a NAT Gateway or VPC Endpoints, and the
+    security groups must allow the DAX port (8111).
+    :param lambda_function: Lambda Function or Lambda Function Alias Construct.
+    :param dax_cluster: DAX Cluster Construct.
+    :param kwargs: Consist of the 'subnet_ids' and 'security_group_ids' of the DAX Cluster configuration.
+    :return: Lambda Function Construct.
+    """
+    function = lambda_function.version.lambda_ if isinstance(lambda_function, lambda_.Alias) else lambda_function
+    function.add_environment(DAX_ENDPOINT_ENVIRONMENT_VARIABLE, dax_cluster.attr_cluster_discovery_endpoint)
+    function.add_to_role_policy(iam.PolicyStatement(actions=DAX_CONSUMER_ACTIONS, resources=[dax_cluster.attr_arn]))
+
+    # DAX Clusters are only reachable from their VPC, the Function construct of this CDK version needs an IVpc to be placed
+    # in it, so the subnets and security groups are set directly
+    function.node.default_child.add_property_override(
+        "VpcConfig", {"SubnetIds": kwargs["subnet_ids"], "SecurityGroupIds": kwargs["security_group_ids"]}
+    )
+    function.role.add_managed_policy(
+        iam.ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole")
+    )
+
+    return function
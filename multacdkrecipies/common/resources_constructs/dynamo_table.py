@@ -1,51 +1,66 @@
-from aws_cdk import aws_dynamodb as dynamo
+from aws_cdk import (
+    aws_applicationautoscaling as appscaling,
+    aws_cloudwatch as cloudwatch,
+    aws_dynamodb as dynamo,
+)
+
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_DYNAMODB_AUTOSCALING_TARGET_UTILIZATION,
+    DEFAULT_DYNAMODB_INDEX_PROJECTION,
+    DEFAULT_DYNAMODB_READ_CAPACITY,
+    DEFAULT_DYNAMODB_STREAM_VIEW_TYPE,
+    DEFAULT_DYNAMODB_THROTTLE_ALARM,
+    DEFAULT_DYNAMODB_WRITE_CAPACITY,
+)
 
 
 DYNAMO_DB_STREAM_OPTIONS = ["NEW_IMAGE", "OLD_IMAGE", "NEW_AND_OLD_IMAGES", "KEYS_ONLY"]
+DYNAMO_DB_PROJECTION_OPTIONS = ["KEYS_ONLY", "INCLUDE", "ALL"]
+DYNAMO_DB_ATTRIBUTE_TYPES = {"string": "STRING", "number": "NUMBER", "integer": "NUMBER", "binary": "BINARY"}
 
 
 def base_dynamodb_table(construct, **kwargs):
     """
-    Function that generates a DynamoDB Table.
+    Function that generates a DynamoDB Table, with alarms on the read and write throttled requests of the table and of its
+    global secondary indexes.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'queue_name' and optionals 'queue_delivery_delay' and 'queue_visibility_timeout'.
+    :param kwargs: Consist of required 'table_name', 'partition_key' and optionals 'sort_key', 'stream', 'ttl_attribute', 'billing_mode', 'read_capacity', 'write_capacity', 'autoscaling', 'throttle_alarm', 'global_secondary_indexes' and 'local_secondary_indexes'.
     :return: DynamoDB Table Construct.
     """
     dynamodb_table_name = construct.prefix + "_" + kwargs["table_name"] + "_table_" + construct.environment_
-    dynamodb_table_partition_key = dynamo.Attribute(name=kwargs["partition_key"], type=dynamo.AttributeType.STRING)
+    dynamodb_table_partition_key = dynamodb_attribute(kwargs["partition_key"])
     sort_key = kwargs.get("sort_key")
-    if sort_key is None:
-        dynamodb_table_sort_key = None
-    else:
-        if sort_key.get("type") == "string":
-            sort_key_type = dynamo.AttributeType.STRING
-        elif sort_key.get("type") == "integer":
-            sort_key_type = dynamo.AttributeType.NUMBER
-        elif sort_key.get("type") == "binary":
-            sort_key_type = dynamo.AttributeType.BINARY
-        else:
-            sort_key_type = dynamo.AttributeType.STRING
-        dynamodb_table_sort_key = dynamo.Attribute(name=sort_key.get("name"), type=sort_key_type)
+    dynamodb_table_sort_key = dynamodb_attribute(sort_key) if sort_key is not None else None
 
     stream_info = kwargs.get("stream")
     if stream_info is None:
         dynamodb_table_streams = None
     else:
-        full_element_info = dynamo.StreamViewType.NEW_AND_OLD_IMAGES
-        dynamodb_table_streams = full_element_info if stream_info.get("enabled") is True else None
+        stream_view_type = stream_info.get("view_type", DEFAULT_DYNAMODB_STREAM_VIEW_TYPE).upper()
+        if stream_view_type not in DYNAMO_DB_STREAM_OPTIONS:
+            print(f"Wrong DynamoDB Stream view type {stream_info['view_type']} specified for {kwargs['table_name']}")
+            raise RuntimeError
+        stream_view_type = getattr(dynamo.StreamViewType, stream_view_type)
+        dynamodb_table_streams = stream_view_type if stream_info.get("enabled") is True else None
 
     dynamodb_table_ttl_attribute = kwargs.get("ttl_attribute")
 
     billing_mode = kwargs.get("billing_mode")
     if billing_mode == "provisioned":
         dynamodb_billing_mode = dynamo.BillingMode.PROVISIONED
-        dynamodb_read_capacity = kwargs.get("read_capacity", 5)
-        dynamodb_write_capacity = kwargs.get("write_capacity", 5)
+        dynamodb_read_capacity = kwargs.get("read_capacity", DEFAULT_DYNAMODB_READ_CAPACITY)
+        dynamodb_write_capacity = kwargs.get("write_capacity", DEFAULT_DYNAMODB_WRITE_CAPACITY)
     else:
         dynamodb_billing_mode = dynamo.BillingMode.PAY_PER_REQUEST
         dynamodb_read_capacity = None
         dynamodb_write_capacity = None
 
+    # Autoscaling adjusts the provisioned capacity, on-demand tables and indexes already scale with the requests
+    autoscaling_indexes = [kwargs] + kwargs.get("global_secondary_indexes", list())
+    if dynamodb_billing_mode != dynamo.BillingMode.PROVISIONED and any("autoscaling" in index for index in autoscaling_indexes):
+        print(f"DynamoDB Table {kwargs['table_name']} autoscaling needs the 'provisioned' billing mode")
+        raise RuntimeError
+
     dynamodb_table = dynamo.Table(
         construct,
         id=dynamodb_table_name,
@@ -59,33 +74,169 @@ def base_dynamodb_table(construct, **kwargs):
         time_to_live_attribute=dynamodb_table_ttl_attribute,
     )
 
+    if kwargs.get("autoscaling") is not None:
+        base_dynamodb_table_autoscaling(dynamodb_table, dynamodb_table_name, **kwargs["autoscaling"])
+
+    throttle_alarm = kwargs.get("throttle_alarm", DEFAULT_DYNAMODB_THROTTLE_ALARM)
+    dynamodb_throttle_alarms(construct, dynamodb_table, dynamodb_table_name, throttle_alarm)
+
     for global_index in kwargs.get("global_secondary_indexes", list()):
-        global_index["partition_key"] = dynamo.Attribute(name=global_index["partition_key"], type=dynamo.AttributeType.STRING)
-        if global_index.get("sort_key") is None:
-            global_index["sort_key"] = None
-        else:
-            if sort_key.get("type") == "string":
-                sort_key_type = dynamo.AttributeType.STRING
-            elif sort_key.get("type") == "integer":
-                sort_key_type = dynamo.AttributeType.NUMBER
-            elif sort_key.get("type") == "binary":
-                sort_key_type = dynamo.AttributeType.BINARY
-            else:
-                sort_key_type = dynamo.AttributeType.STRING
-            global_index["sort_key"] = dynamo.Attribute(name=sort_key.get("name"), type=sort_key_type)
-        dynamodb_table.add_global_secondary_index(**global_index)
-
-    for local_index in kwargs.get("local_secondary_indexes", list()):
-        sort_key = local_index.get("sort_key")
-        if sort_key.get("type") == "string":
-            sort_key_type = dynamo.AttributeType.STRING
-        elif sort_key.get("type") == "integer":
-            sort_key_type = dynamo.AttributeType.NUMBER
-        elif sort_key.get("type") == "binary":
-            sort_key_type = dynamo.AttributeType.BINARY
-        else:
-            sort_key_type = dynamo.AttributeType.STRING
-        local_index["sort_key"] = dynamo.Attribute(name=sort_key.get("name"), type=sort_key_type)
-        dynamodb_table.add_global_secondary_index(**local_index)
+        global_index_sort_key = global_index.get("sort_key")
+        dynamodb_table.add_global_secondary_index(
+            index_name=global_index["index_name"],
+            partition_key=dynamodb_attribute(global_index["partition_key"]),
+            sort_key=dynamodb_attribute(global_index_sort_key) if global_index_sort_key is not None else None,
+            read_capacity=global_index.get("read_capacity"),
+            write_capacity=global_index.get("write_capacity"),
+            **dynamodb_index_projection(kwargs["table_name"], **global_index),
+        )
+
+        if global_index.get("autoscaling") is not None:
+            base_dynamodb_table_autoscaling(
+                dynamodb_table, dynamodb_table_name, index_name=global_index["index_name"], **global_index["autoscaling"]
+            )
+        dynamodb_throttle_alarms(
+            construct, dynamodb_table, dynamodb_table_name, throttle_alarm, index_name=global_index["index_name"]
+        )
+
+    # Local secondary indexes share the partition key and the capacity of the table, only with an alternative sort key
+    local_indexes = kwargs.get("local_secondary_indexes", list())
+    if local_indexes and sort_key is None:
+        print(f"DynamoDB Table {kwargs['table_name']} needs a 'sort_key' to define local secondary indexes")
+        raise RuntimeError
+    for local_index in local_indexes:
+        dynamodb_table.add_local_secondary_index(
+            index_name=local_index["index_name"],
+            sort_key=dynamodb_attribute(local_index["sort_key"]),
+            **dynamodb_index_projection(kwargs["table_name"], **local_index),
+        )
 
     return dynamodb_table, bool(dynamodb_table_streams)
+
+
+def dynamodb_attribute(key):
+    """
+    Function that generates the DynamoDB Attribute of a table or index key.
+    :param key: Name of a string key, or dictionary with its 'name' and 'type' ('string', 'number', 'integer' or 'binary').
+    :return: DynamoDB Attribute.
+    """
+    if isinstance(key, str):
+        return dynamo.Attribute(name=key, type=dynamo.AttributeType.STRING)
+
+    key_type = key.get("type", "string").lower()
+    if key_type not in DYNAMO_DB_ATTRIBUTE_TYPES:
+        print(f"Wrong DynamoDB key type {key['type']} specified for {key['name']}, use one of {list(DYNAMO_DB_ATTRIBUTE_TYPES)}")
+        raise RuntimeError
+    return dynamo.Attribute(name=key["name"], type=getattr(dynamo.AttributeType, DYNAMO_DB_ATTRIBUTE_TYPES[key_type]))
+
+
+def dynamodb_index_projection(table_name: str, **kwargs) -> dict:
+    """
+    Function that validates the projection of a secondary index. Narrower projections than the default 'ALL' reduce the
+    storage and the write capacity consumed by the index on every write of the table.
+    :param table_name: Name of the DynamoDB Table. Used for error messages.
+    :param kwargs: Consist of required 'index_name' and optionals 'projection_type' and 'non_key_attributes' (only with 'INCLUDE').
+    :return: Dictionary with the index 'projection_type' and 'non_key_attributes' options.
+    """
+    projection_type = kwargs.get("projection_type", DEFAULT_DYNAMODB_INDEX_PROJECTION).upper()
+    if projection_type not in DYNAMO_DB_PROJECTION_OPTIONS:
+        print(f"Wrong projection type {kwargs['projection_type']} specified for index {kwargs['index_name']} of {table_name}")
+        raise RuntimeError
+    non_key_attributes = kwargs.get("non_key_attributes")
+    if (projection_type == "INCLUDE") != bool(non_key_attributes):
+        print(f"Index {kwargs['index_name']} of {table_name} needs 'non_key_attributes' only with the INCLUDE projection type")
+        raise RuntimeError
+
+    return dict(projection_type=getattr(dynamo.ProjectionType, projection_type), non_key_attributes=non_key_attributes)
+
+
+def base_dynamodb_table_autoscaling(dynamodb_table, table_name: str, index_name: str = None, **kwargs):
+    """
+    Function that generates the autoscaling of the provisioned read and write capacity of a DynamoDB Table or of one of its
+    global secondary indexes, tracking a target utilization of the consumed capacity and with optional scheduled scaling
+    actions that change the minimum and maximum capacity in known traffic windows.
+    :param dynamodb_table: DynamoDB Table Construct.
+    :param table_name: Name of the DynamoDB Table. Used for naming purposes.
+    :param index_name: Name of the global secondary index to scale, the table itself if it is not specified.
+    :param kwargs: Consist of optionals 'read' and 'write', each one with required 'min_capacity', 'max_capacity' and optionals 'target_utilization' (percent) and 'schedules'.
+    :return: Dictionary with the scalable read and write attributes.
+    """
+    resource_name = table_name if index_name is None else f"{table_name} index {index_name}"
+    scalable_attributes = dict()
+    for capacity in ("read", "write"):
+        capacity_autoscaling = kwargs.get(capacity)
+        if capacity_autoscaling is None:
+            continue
+
+        if not 1 <= capacity_autoscaling["min_capacity"] <= capacity_autoscaling["max_capacity"]:
+            print(f"DynamoDB Table {resource_name} {capacity} autoscaling needs 1 <= 'min_capacity' <= 'max_capacity'")
+            raise RuntimeError
+        for schedule in capacity_autoscaling.get("schedules", list()):
+            if schedule.get("min_capacity") is None and schedule.get("max_capacity") is None:
+                print(f"DynamoDB Table {resource_name} {capacity} schedule {schedule['name']} needs a min or max capacity")
+                raise RuntimeError
+        target_utilization = capacity_autoscaling.get("target_utilization", DEFAULT_DYNAMODB_AUTOSCALING_TARGET_UTILIZATION)
+        if not 10 <= target_utilization <= 90:
+            print(f"DynamoDB Table {resource_name} {capacity} autoscaling 'target_utilization' must be between 10 and 90")
+            raise RuntimeError
+
+        capacity_options = dict(
+            min_capacity=capacity_autoscaling["min_capacity"], max_capacity=capacity_autoscaling["max_capacity"]
+        )
+        if index_name is None and capacity == "read":
+            scalable_attribute = dynamodb_table.auto_scale_read_capacity(**capacity_options)
+        elif index_name is None:
+            scalable_attribute = dynamodb_table.auto_scale_write_capacity(**capacity_options)
+        elif capacity == "read":
+            scalable_attribute = dynamodb_table.auto_scale_global_secondary_index_read_capacity(index_name, **capacity_options)
+        else:
+            scalable_attribute = dynamodb_table.auto_scale_global_secondary_index_write_capacity(index_name, **capacity_options)
+
+        scalable_attribute.scale_on_utilization(target_utilization_percent=target_utilization)
+        for schedule in capacity_autoscaling.get("schedules", list()):
+            scalable_attribute.scale_on_schedule(
+                schedule["name"],
+                schedule=appscaling.Schedule.expression(f"cron({schedule['cron']})"),
+                min_capacity=schedule.get("min_capacity"),
+                max_capacity=schedule.get("max_capacity"),
+            )
+        scalable_attributes[capacity] = scalable_attribute
+
+    return scalable_attributes
+
+
+def dynamodb_throttle_alarms(construct, dynamodb_table, table_name: str, throttle_alarm: dict, index_name: str = None):
+    """
+    Function that generates the alarms on the 'ReadThrottleEvents' and 'WriteThrottleEvents' metrics of a DynamoDB Table or
+    of one of its global secondary indexes.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param dynamodb_table: DynamoDB Table Construct.
+    :param table_name: Name of the DynamoDB Table. Used for naming purposes.
+    :param throttle_alarm: Alarm configuration, consist of 'number', 'periods', 'points' and 'actions'.
+    :param index_name: Name of the global secondary index, the table itself if it is not specified.
+    :return: List of CloudWatch Alarm Constructs.
+    """
+    dimensions = {"TableName": dynamodb_table.table_name}
+    alarm_prefix = table_name
+    if index_name is not None:
+        dimensions["GlobalSecondaryIndexName"] = index_name
+        alarm_prefix = table_name + "_" + index_name
+
+    alarms = list()
+    for metric_name in ("ReadThrottleEvents", "WriteThrottleEvents"):
+        alarm_name = alarm_prefix + "_" + metric_name
+        alarm = cloudwatch.Alarm(
+            construct,
+            id=alarm_name,
+            alarm_name=alarm_name,
+            metric=cloudwatch.Metric(
+                namespace="AWS/DynamoDB", metric_name=metric_name, dimensions=dimensions, statistic="Sum"
+            ),
+            threshold=throttle_alarm["number"],
+            evaluation_periods=throttle_alarm["periods"],
+            datapoints_to_alarm=throttle_alarm["points"],
+            actions_enabled=throttle_alarm["actions"],
+        )
+        alarms.append(alarm)
+
+    return alarms
@@ -0,0 +1,200 @@
+from aws_cdk import (
+    core,
+    aws_iam as iam,
+    aws_kinesis as kinesis,
+    aws_lambda as lambda_,
+    aws_lambda_event_sources as event_sources,
+    aws_sns as sns,
+    aws_sqs as sqs,
+)
+
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_DYNAMODB_EVENT_SOURCE,
+    DEFAULT_SQS_DEAD_LETTER_QUEUE_RETENTION_PERIOD,
+    DYNAMODB_EVENT_SOURCE_MAX_BATCH_SIZE,
+    DEFAULT_SQS_EVENT_SOURCE_BATCH_SIZE,
+    SQS_EVENT_SOURCE_MAX_BATCH_SIZE,
+    SQS_EVENT_SOURCE_MAX_BATCHING_WINDOW,
+    STREAM_EVENT_SOURCE_MAX_BATCH_SIZE,
+    STREAM_EVENT_SOURCE_MAX_BATCHING_WINDOW,
+    STREAM_EVENT_SOURCE_MAX_PARALLELIZATION_FACTOR,
+    STREAM_EVENT_SOURCE_MAX_RECORD_AGE,
+    STREAM_EVENT_SOURCE_MIN_RECORD_AGE,
+    STREAM_EVENT_SOURCE_STARTING_POSITIONS,
+)
+from . import base_queue
+
+
+def base_sqs_event_source(lambda_function, queue, **kwargs):
+    """
+    Function that subscribes a Lambda Function to an SQS Queue with an Event Source Mapping, granting the function
+    permissions to consume the queue messages.
+    :param lambda_function: Lambda Function or Lambda Function Alias Construct.
+    :param queue: SQS Queue Construct.
+    :param kwargs: Consist of optionals 'batch_size', 'max_batching_window' (seconds), 'report_batch_item_failures', 'max_concurrency' and 'enabled'.
+    :return: Event Source Mapping Construct.
+    """
+    batch_size = kwargs.get("batch_size", DEFAULT_SQS_EVENT_SOURCE_BATCH_SIZE)
+    max_batching_window = kwargs.get("max_batching_window")
+    if not 1 <= batch_size <= SQS_EVENT_SOURCE_MAX_BATCH_SIZE:
+        print(f"SQS Event Source batch size must be between 1 and {SQS_EVENT_SOURCE_MAX_BATCH_SIZE}, got {batch_size}")
+        raise RuntimeError
+    if batch_size > 10 and not max_batching_window:
+        print(f"SQS Event Source batch size {batch_size} greater than 10 needs a 'max_batching_window'")
+        raise RuntimeError
+    if max_batching_window is not None and not 0 <= max_batching_window <= SQS_EVENT_SOURCE_MAX_BATCHING_WINDOW:
+        print(f"SQS Event Source batching window must be between 0 and {SQS_EVENT_SOURCE_MAX_BATCHING_WINDOW} seconds")
+        raise RuntimeError
+    if queue.fifo is True and (batch_size > 10 or max_batching_window):
+        print("SQS Event Source of a FIFO queue supports up to 10 messages per batch and no batching window")
+        raise RuntimeError
+    max_concurrency = kwargs.get("max_concurrency")
+    if max_concurrency is not None and not 2 <= max_concurrency <= 1000:
+        print(f"SQS Event Source maximum concurrency must be between 2 and 1000, got {max_concurrency}")
+        raise RuntimeError
+
+    # The SQS Event Source of this CDK version only supports the batch size, so the mapping is defined directly
+    event_source_mapping = lambda_function.add_event_source_mapping(
+        f"SqsEventSource:{core.Names.node_unique_id(queue.node)}",
+        event_source_arn=queue.queue_arn,
+        batch_size=batch_size,
+        max_batching_window=core.Duration.seconds(max_batching_window) if max_batching_window is not None else None,
+        enabled=kwargs.get("enabled", True),
+    )
+    queue.grant_consume_messages(lambda_function)
+
+    # Partial batch responses and maximum concurrency are not supported by the Event Source Mapping construct either
+    if kwargs.get("report_batch_item_failures") is True:
+        event_source_mapping.node.default_child.add_property_override("FunctionResponseTypes", ["ReportBatchItemFailures"])
+    if max_concurrency is not None:
+        event_source_mapping.node.default_child.add_property_override("ScalingConfig.MaximumConcurrency", max_concurrency)
+
+    return event_source_mapping
+
+
+def stream_event_source_options(max_batch_size: int = STREAM_EVENT_SOURCE_MAX_BATCH_SIZE, **kwargs) -> dict:
+    """
+    Function that validates the settings of a Kinesis or DynamoDB stream Event Source and converts them to the Event
+    Source Mapping options.
+    :param max_batch_size: Maximum batch size of the stream, by default the Kinesis one.
+    :param kwargs: Consist of required 'starting_position', 'batch_size' and optionals 'max_batching_window' (seconds), 'parallelization_factor', 'bisect_batch_on_error', 'max_record_age' (seconds, -1 for no limit), 'retry_attempts' and 'enabled'.
+    :return: Dictionary with the Event Source Mapping options.
+    """
+    starting_position = kwargs["starting_position"].upper()
+    if starting_position not in STREAM_EVENT_SOURCE_STARTING_POSITIONS:
+        print(f"Wrong stream Event Source starting position {kwargs['starting_position']} specified")
+        raise RuntimeError
+    if not 1 <= kwargs["batch_size"] <= max_batch_size:
+        print(f"Stream Event Source batch size must be between 1 and {max_batch_size}, got {kwargs['batch_size']}")
+        raise RuntimeError
+    max_batching_window = kwargs.get("max_batching_window")
+    if max_batching_window is not None and not 0 <= max_batching_window <= STREAM_EVENT_SOURCE_MAX_BATCHING_WINDOW:
+        print(f"Stream Event Source batching window must be between 0 and {STREAM_EVENT_SOURCE_MAX_BATCHING_WINDOW} seconds")
+        raise RuntimeError
+    parallelization_factor = kwargs.get("parallelization_factor")
+    if parallelization_factor is not None and not 1 <= parallelization_factor <= STREAM_EVENT_SOURCE_MAX_PARALLELIZATION_FACTOR:
+        print(f"Stream Event Source parallelization factor must be between 1 and {STREAM_EVENT_SOURCE_MAX_PARALLELIZATION_FACTOR}")
+        raise RuntimeError
+    max_record_age = kwargs.get("max_record_age")
+    if max_record_age is not None and max_record_age != -1 and not (
+        STREAM_EVENT_SOURCE_MIN_RECORD_AGE <= max_record_age <= STREAM_EVENT_SOURCE_MAX_RECORD_AGE
+    ):
+        print(
+            f"Stream Event Source maximum record age must be -1 or between {STREAM_EVENT_SOURCE_MIN_RECORD_AGE} and "
+            f"{STREAM_EVENT_SOURCE_MAX_RECORD_AGE} seconds, got {max_record_age}"
+        )
+        raise RuntimeError
+
+    return dict(
+        starting_position=getattr(lambda_.StartingPosition, starting_position),
+        batch_size=kwargs["batch_size"],
+        max_batching_window=core.Duration.seconds(max_batching_window) if max_batching_window is not None else None,
+        parallelization_factor=parallelization_factor,
+        bisect_batch_on_error=kwargs.get("bisect_batch_on_error"),
+        max_record_age=core.Duration.seconds(max_record_age) if max_record_age not in (None, -1) else None,
+        retry_attempts=kwargs.get("retry_attempts"),
+        enabled=kwargs.get("enabled", True),
+    )
+
+
+def base_kinesis_event_source(construct, resource_name: str, lambda_function, stream, **kwargs):
+    """
+    Function that subscribes a Lambda Function to a Kinesis Stream with an Event Source Mapping, granting the function
+    permissions to read the stream. With enhanced fan-out the function reads through its own registered Stream Consumer,
+    with a dedicated throughput of 2 MB/s per shard instead of sharing it with the other consumers of the stream.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param resource_name: Name of the Lambda Function. Used for naming purposes.
+    :param lambda_function: Lambda Function or Lambda Function Alias Construct.
+    :param stream: Kinesis Stream Construct.
+    :param kwargs: Consist of the 'stream_event_source_options' settings and optional 'enhanced_fan_out'.
+    :return: Event Source Mapping Construct.
+    """
+    event_source_options = stream_event_source_options(**kwargs)
+    event_source_arn = stream.stream_arn
+    if kwargs.get("enhanced_fan_out") is True:
+        consumer_name = construct.prefix + "_" + resource_name + "_consumer_" + construct.environment_
+        stream_consumer = kinesis.CfnStreamConsumer(
+            construct, id=consumer_name, consumer_name=consumer_name, stream_arn=stream.stream_arn
+        )
+        event_source_arn = stream_consumer.attr_consumer_arn
+        lambda_function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["kinesis:SubscribeToShard", "kinesis:DescribeStreamConsumer"],
+                resources=[stream_consumer.attr_consumer_arn],
+            )
+        )
+
+    event_source_mapping = lambda_function.add_event_source_mapping(
+        f"KinesisEventSource:{core.Names.node_unique_id(stream.node)}", event_source_arn=event_source_arn, **event_source_options
+    )
+    stream.grant_read(lambda_function)
+
+    return event_source_mapping
+
+
+def base_dynamodb_event_source(construct, resource_name: str, lambda_function, table, **kwargs):
+    """
+    Function that subscribes a Lambda Function to the Stream of a DynamoDB Table with an Event Source Mapping, granting
+    the function permissions to read the stream. The records of the batches that still fail after the retries are sent
+    to the on-failure destination, an existing SQS Queue or SNS Topic or a queue created for the function.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param resource_name: Name of the Lambda Function. Used for naming purposes.
+    :param lambda_function: Lambda Function or Lambda Function Alias Construct.
+    :param table: DynamoDB Table Construct, with the stream enabled.
+    :param kwargs: Consist of the 'stream_event_source_options' settings, with defaults for 'starting_position' and 'batch_size', and optional 'on_failure'.
+    :return: Event Source Mapping Construct.
+    """
+    event_source_options = stream_event_source_options(
+        max_batch_size=DYNAMODB_EVENT_SOURCE_MAX_BATCH_SIZE, **{**DEFAULT_DYNAMODB_EVENT_SOURCE, **kwargs}
+    )
+
+    on_failure = kwargs.get("on_failure", dict())
+    on_failure_destination = None
+    if on_failure.get("enabled") is True:
+        destination_arn = on_failure.get("destination_arn")
+        if destination_arn is None:
+            failures_queue = base_queue(
+                construct,
+                queue_name=resource_name + "_failures",
+                queue_retention_period=DEFAULT_SQS_DEAD_LETTER_QUEUE_RETENTION_PERIOD,
+            )
+            on_failure_destination = event_sources.SqsDlq(failures_queue)
+        elif destination_arn.startswith("arn:") and ":sqs:" in destination_arn:
+            failures_queue = sqs.Queue.from_queue_arn(construct, id=resource_name + "_failures", queue_arn=destination_arn)
+            on_failure_destination = event_sources.SqsDlq(failures_queue)
+        elif destination_arn.startswith("arn:") and ":sns:" in destination_arn:
+            failures_topic = sns.Topic.from_topic_arn(construct, id=resource_name + "_failures", topic_arn=destination_arn)
+            on_failure_destination = event_sources.SnsDlq(failures_topic)
+        else:
+            print(f"DynamoDB Event Source on-failure destination of {resource_name} must be an SQS Queue or SNS Topic ARN")
+            raise RuntimeError
+
+    event_source_mapping = lambda_function.add_event_source_mapping(
+        f"DynamoDBEventSource:{core.Names.node_unique_id(table.node)}",
+        event_source_arn=table.table_stream_arn,
+        on_failure=on_failure_destination,
+        **event_source_options,
+    )
+    table.grant_stream_read(lambda_function)
+
+    return event_source_mapping
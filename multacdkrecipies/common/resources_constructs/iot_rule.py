@@ -1,5 +1,10 @@
+import re
+
 from aws_cdk import aws_iot as iot
 
+# Substitution templates of AWS IoT Rules actions, e.g. '${clientid()}' or '${topic(2)}'
+IOT_SUBSTITUTION_TEMPLATE = re.compile(r"\$\{[^}]+\}")
+
 
 def base_iot_rule(construct, action_property, **kwargs):
     """
@@ -23,3 +28,17 @@ def base_iot_rule(construct, action_property, **kwargs):
     iot_rule = iot.CfnTopicRule(construct, id=rule_name, rule_name=rule_name, topic_rule_payload=rule_payload)
 
     return iot_rule
+
+
+def is_constant_iot_expression(expression: str) -> bool:
+    """
+    Function that checks if an IoT Rule action expression, like a partition key, evaluates to the same value for every
+    message. It is the case when it has no substitution templates or they only contain literals.
+    :param expression: Expression of an IoT Rule action parameter.
+    :return: True or False depending if the expression is constant or not.
+    """
+    for template in IOT_SUBSTITUTION_TEMPLATE.findall(expression):
+        if re.fullmatch(r"\$\{\s*('[^']*'|\"[^\"]*\"|[0-9.]+)\s*\}", template) is None:
+            return False
+
+    return True
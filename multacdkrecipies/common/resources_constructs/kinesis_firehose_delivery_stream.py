@@ -1,65 +1,240 @@
-from aws_cdk import aws_kinesisfirehose as fh_stream
-from .bucket import base_bucket
-from .role import base_kinesis_firehose_s3_role
+from aws_cdk import core, aws_kinesisfirehose as fh_stream
+
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_FIREHOSE_BUFFERING_INTERVAL,
+    DEFAULT_FIREHOSE_BUFFERING_SIZE,
+    DEFAULT_FIREHOSE_COMPRESSION_FORMAT,
+    DEFAULT_FIREHOSE_DYNAMIC_PARTITIONING_RETRY_DURATION,
+    DEFAULT_FIREHOSE_ERROR_OUTPUT_PREFIX,
+    DEFAULT_FIREHOSE_OUTPUT_COMPRESSION,
+    DEFAULT_FIREHOSE_OUTPUT_FORMAT,
+    FIREHOSE_COMPRESSION_FORMATS,
+    FIREHOSE_CONVERSION_MIN_BUFFERING_SIZE,
+    FIREHOSE_MAX_BUFFERING_INTERVAL,
+    FIREHOSE_MAX_BUFFERING_SIZE,
+    FIREHOSE_MIN_BUFFERING_INTERVAL,
+    FIREHOSE_OUTPUT_FORMATS_COMPRESSIONS,
+)
+from . import base_bucket, base_kinesis_firehose_s3_role
 
 
 def base_kinesis_firehose_delivery_stream(construct, **kwargs):
-    # TODO: ADD ROLES, BUCKETS, AND FIREHOSE MINIMUM SETTINGS
     """
-    Function that generates a Kinesis Firehose Delivery Stream.
+    Function that generates a Kinesis Firehose Delivery Stream, with its destinations S3 Buckets and IAM Roles.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'stream_name'.
-    :return: Kinesis Stream Construct.
+    :param kwargs: Consist of required 'stream_name' and 'destinations' ('extended_s3_destination_configuration' or 's3_destination_configuration').
+    :return: Kinesis Firehose Delivery Stream Construct.
     """
     stream_name = construct.prefix + "_" + kwargs["stream_name"] + "_" + "stream" + "_" + construct.environment_
-    destinations_config = firehose_destinations(kwargs["destinations"])
+    destinations_config = firehose_destinations(construct, kwargs["stream_name"], kwargs["destinations"])
     firehose_stream = fh_stream.CfnDeliveryStream(
         construct,
         id=stream_name,
         delivery_stream_name=stream_name,
-        elasticsearch_destination_configuration=destinations_config["elasticsearch_destination_configuration"],
+        delivery_stream_type="DirectPut",
         extended_s3_destination_configuration=destinations_config["extended_s3_destination_configuration"],
-        redshift_destination_configuration=destinations_config["redshift_destination_configuration"],
         s3_destination_configuration=destinations_config["s3_destination_configuration"],
-        splunk_destination_configuration=destinations_config["splunk_destination_configuration"],
     )
 
-    return firehose_stream.attr_arn
+    # Dynamic partitioning is not supported by the Delivery Stream construct of this CDK version
+    dynamic_partitioning = kwargs["destinations"].get("extended_s3_destination_configuration", dict()).get("dynamic_partitioning")
+    if dynamic_partitioning is not None and dynamic_partitioning.get("enabled") is True:
+        retry_duration = dynamic_partitioning.get("retry_duration", DEFAULT_FIREHOSE_DYNAMIC_PARTITIONING_RETRY_DURATION)
+        firehose_stream.add_property_override(
+            "ExtendedS3DestinationConfiguration.DynamicPartitioningConfiguration",
+            {"Enabled": True, "RetryOptions": {"DurationInSeconds": retry_duration}},
+        )
 
+    return firehose_stream
 
-def firehose_destinations(configuration):
-    destinations_config = dict(
-        elasticsearch_destination_configuration=None,
-        extended_s3_destination_configuration=None,
-        redshift_destination_configuration=None,
-        s3_destination_configuration=None,
-        splunk_destination_configuration=None,
-    )
-    if configuration.get("elasticsearch_destination_configuration") is not None:
-        pass
+
+def firehose_destinations(construct, stream_name: str, configuration: dict) -> dict:
+    """
+    Function that generates the S3 destinations configurations of a Kinesis Firehose Delivery Stream.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param stream_name: Name of the Delivery Stream. Used for naming purposes.
+    :param configuration: Destinations configuration, with optionals 'extended_s3_destination_configuration' and 's3_destination_configuration'.
+    :return: Dictionary with the Delivery Stream destinations configurations properties.
+    """
+    if len(configuration) != 1:
+        print(f"Firehose {stream_name} needs exactly one destination configuration")
+        raise RuntimeError
+
+    destinations_config = dict(extended_s3_destination_configuration=None, s3_destination_configuration=None)
     if configuration.get("extended_s3_destination_configuration") is not None:
-        bucket = base_bucket()
-        role = base_kinesis_firehose_s3_role()
+        extended_s3_data = configuration["extended_s3_destination_configuration"]
+        conversion_data = extended_s3_data.get("data_format_conversion")
+        dynamic_partitioning = extended_s3_data.get("dynamic_partitioning", dict())
+        dynamic_partitioning_enabled = dynamic_partitioning.get("enabled") is True
+
+        bucket = base_bucket(construct, **extended_s3_data["bucket"])
+        role = base_kinesis_firehose_s3_role(
+            construct,
+            resource_name=stream_name + "_s3",
+            principal_resource="firehose",
+            bucket=bucket,
+            glue_database_name=conversion_data["database_name"] if conversion_data is not None else None,
+            glue_table_name=conversion_data["table_name"] if conversion_data is not None else None,
+        )
+
+        # Converted records are compressed by the serializer, the S3 compression has to be disabled
+        compression_format = extended_s3_data.get("compression_format", DEFAULT_FIREHOSE_COMPRESSION_FORMAT)
+        if conversion_data is not None and compression_format != "UNCOMPRESSED":
+            print(f"Firehose {stream_name} converts the records format, compress them with 'data_format_conversion' instead")
+            raise RuntimeError
+
+        # Record format conversion and dynamic partitioning deliver larger files, so they need a larger buffer
+        minimum_buffering_size = 1
+        conversion_config = None
+        processing_config = None
+        if conversion_data is not None:
+            minimum_buffering_size = FIREHOSE_CONVERSION_MIN_BUFFERING_SIZE
+            conversion_config = firehose_data_format_conversion(construct, stream_name, role, **conversion_data)
+
+        prefix = extended_s3_data.get("prefix")
+        error_output_prefix = extended_s3_data.get("error_output_prefix")
+        if dynamic_partitioning_enabled is True:
+            minimum_buffering_size = FIREHOSE_CONVERSION_MIN_BUFFERING_SIZE
+            processing_config = firehose_partitioning_processing(**dynamic_partitioning)
+            if prefix is None:
+                prefix = "".join(f"{key}=!{{partitionKeyFromQuery:{key}}}/" for key in dynamic_partitioning["partition_keys"])
+            error_output_prefix = error_output_prefix or DEFAULT_FIREHOSE_ERROR_OUTPUT_PREFIX
+
         extended_s3_config = fh_stream.CfnDeliveryStream.ExtendedS3DestinationConfigurationProperty(
             bucket_arn=bucket.bucket_arn,
             role_arn=role.role_arn,
-            compression_format="",
-            buffering_hints="",
+            compression_format=firehose_compression_format(stream_name, compression_format),
+            buffering_hints=firehose_buffering_hints(
+                stream_name, minimum_size=minimum_buffering_size, **extended_s3_data.get("buffering_hints", dict())
+            ),
+            prefix=prefix,
+            error_output_prefix=error_output_prefix,
+            data_format_conversion_configuration=conversion_config,
+            processing_configuration=processing_config,
         )
         destinations_config["extended_s3_destination_configuration"] = extended_s3_config
-    if configuration.get("redshift_destination_configuration") is not None:
-        pass
+
     if configuration.get("s3_destination_configuration") is not None:
-        bucket = base_bucket()
-        role = base_kinesis_firehose_s3_role()
+        s3_data = configuration["s3_destination_configuration"]
+        bucket = base_bucket(construct, **s3_data["bucket"])
+        role = base_kinesis_firehose_s3_role(
+            construct, resource_name=stream_name + "_s3", principal_resource="firehose", bucket=bucket
+        )
         s3_config = fh_stream.CfnDeliveryStream.S3DestinationConfigurationProperty(
             bucket_arn=bucket.bucket_arn,
             role_arn=role.role_arn,
-            compression_format="",
-            buffering_hints="",
+            compression_format=firehose_compression_format(
+                stream_name, s3_data.get("compression_format", DEFAULT_FIREHOSE_COMPRESSION_FORMAT)
+            ),
+            buffering_hints=firehose_buffering_hints(stream_name, **s3_data.get("buffering_hints", dict())),
+            prefix=s3_data.get("prefix"),
+            error_output_prefix=s3_data.get("error_output_prefix"),
         )
         destinations_config["s3_destination_configuration"] = s3_config
-    if configuration.get("splunk_destination_configuration") is not None:
-        pass
 
     return destinations_config
+
+
+def firehose_compression_format(stream_name: str, compression_format: str) -> str:
+    """
+    Function that validates the compression format of a Kinesis Firehose S3 destination.
+    :param stream_name: Name of the Delivery Stream. Used for error messages.
+    :param compression_format: Compression format, one of FIREHOSE_COMPRESSION_FORMATS.
+    :return: Compression format.
+    """
+    if compression_format not in FIREHOSE_COMPRESSION_FORMATS:
+        print(f"Wrong compression format {compression_format} for Firehose {stream_name}, use one of {FIREHOSE_COMPRESSION_FORMATS}")
+        raise RuntimeError
+
+    return compression_format
+
+
+def firehose_buffering_hints(stream_name: str, minimum_size: int = 1, **kwargs):
+    """
+    Function that generates the buffering hints of a Kinesis Firehose S3 destination, Firehose delivers the records to
+    S3 when any of the size or interval is reached.
+    :param stream_name: Name of the Delivery Stream. Used for error messages.
+    :param minimum_size: Minimum buffering size in MB allowed by the destination.
+    :param kwargs: Consist of optionals 'size' (MB) and 'interval' (seconds).
+    :return: Buffering Hints property.
+    """
+    size = kwargs.get("size", max(minimum_size, DEFAULT_FIREHOSE_BUFFERING_SIZE))
+    interval = kwargs.get("interval", DEFAULT_FIREHOSE_BUFFERING_INTERVAL)
+    if not minimum_size <= size <= FIREHOSE_MAX_BUFFERING_SIZE:
+        print(f"Buffering size of Firehose {stream_name} must be between {minimum_size} and {FIREHOSE_MAX_BUFFERING_SIZE} MB")
+        raise RuntimeError
+    if not FIREHOSE_MIN_BUFFERING_INTERVAL <= interval <= FIREHOSE_MAX_BUFFERING_INTERVAL:
+        print(
+            f"Buffering interval of Firehose {stream_name} must be between {FIREHOSE_MIN_BUFFERING_INTERVAL} and "
+            f"{FIREHOSE_MAX_BUFFERING_INTERVAL} seconds"
+        )
+        raise RuntimeError
+
+    return fh_stream.CfnDeliveryStream.BufferingHintsProperty(interval_in_seconds=interval, size_in_m_bs=size)
+
+
+def firehose_data_format_conversion(construct, stream_name: str, role, **kwargs):
+    """
+    Function that generates the record format conversion of a Kinesis Firehose extended S3 destination, the JSON records
+    are converted to Parquet or ORC with the schema of an AWS Glue table.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param stream_name: Name of the Delivery Stream. Used for error messages.
+    :param role: IAM Role of the destination, with access to the Glue table.
+    :param kwargs: Consist of required 'database_name', 'table_name' and optionals 'table_version', 'output_format' and 'compression'.
+    :return: Data Format Conversion Configuration property.
+    """
+    output_format = kwargs.get("output_format", DEFAULT_FIREHOSE_OUTPUT_FORMAT).upper()
+    compression = kwargs.get("compression", DEFAULT_FIREHOSE_OUTPUT_COMPRESSION).upper()
+    if compression not in FIREHOSE_OUTPUT_FORMATS_COMPRESSIONS.get(output_format, tuple()):
+        print(f"Wrong output format {output_format} or compression {compression} for Firehose {stream_name}")
+        raise RuntimeError
+
+    if output_format == "PARQUET":
+        serializer = fh_stream.CfnDeliveryStream.SerializerProperty(
+            parquet_ser_de=fh_stream.CfnDeliveryStream.ParquetSerDeProperty(compression=compression)
+        )
+    else:
+        serializer = fh_stream.CfnDeliveryStream.SerializerProperty(
+            orc_ser_de=fh_stream.CfnDeliveryStream.OrcSerDeProperty(compression=compression)
+        )
+
+    stack_object = core.Stack.of(construct)
+    return fh_stream.CfnDeliveryStream.DataFormatConversionConfigurationProperty(
+        enabled=True,
+        input_format_configuration=fh_stream.CfnDeliveryStream.InputFormatConfigurationProperty(
+            deserializer=fh_stream.CfnDeliveryStream.DeserializerProperty(
+                open_x_json_ser_de=fh_stream.CfnDeliveryStream.OpenXJsonSerDeProperty()
+            )
+        ),
+        output_format_configuration=fh_stream.CfnDeliveryStream.OutputFormatConfigurationProperty(serializer=serializer),
+        schema_configuration=fh_stream.CfnDeliveryStream.SchemaConfigurationProperty(
+            catalog_id=stack_object.account,
+            database_name=kwargs["database_name"],
+            table_name=kwargs["table_name"],
+            region=stack_object.region,
+            role_arn=role.role_arn,
+            version_id=kwargs.get("table_version", "LATEST"),
+        ),
+    )
+
+
+def firehose_partitioning_processing(**kwargs):
+    """
+    Function that generates the processing configuration of a Kinesis Firehose extended S3 destination with dynamic
+    partitioning, the partition keys are extracted from the JSON records with JQ expressions.
+    :param kwargs: Consist of required 'partition_keys', a dictionary of partition key names and JQ expressions. For example {"device": ".device_id"}.
+    :return: Processing Configuration property.
+    """
+    partition_keys = ",".join(f"{key}:{expression}" for key, expression in kwargs["partition_keys"].items())
+    metadata_extraction_query = "{" + partition_keys + "}"
+    metadata_extraction = fh_stream.CfnDeliveryStream.ProcessorProperty(
+        type="MetadataExtraction",
+        parameters=[
+            fh_stream.CfnDeliveryStream.ProcessorParameterProperty(
+                parameter_name="MetadataExtractionQuery", parameter_value=metadata_extraction_query
+            ),
+            fh_stream.CfnDeliveryStream.ProcessorParameterProperty(parameter_name="JsonParsingEngine", parameter_value="JQ-1.6"),
+        ],
+    )
+
+    return fh_stream.CfnDeliveryStream.ProcessingConfigurationProperty(enabled=True, processors=[metadata_extraction])
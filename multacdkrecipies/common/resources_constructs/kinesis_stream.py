@@ -1,22 +1,211 @@
-from aws_cdk import aws_kinesis as stream
+from aws_cdk import (
+    aws_cloudwatch as cloudwatch,
+    aws_events as events,
+    aws_events_targets as targets,
+    aws_iam as iam,
+    aws_kinesis as stream,
+    aws_lambda as lambda_,
+)
 from aws_cdk.core import Duration
 
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_KINESIS_AUTOSCALING_PERIOD,
+    DEFAULT_KINESIS_AUTOSCALING_SCALE_IN_COOLDOWN,
+    DEFAULT_KINESIS_AUTOSCALING_SCALE_OUT_COOLDOWN,
+    DEFAULT_KINESIS_AUTOSCALING_TARGET_UTILIZATION,
+    DEFAULT_KINESIS_STREAM_CAPACITY_MODE,
+    DEFAULT_KINESIS_THROTTLING_ALARM,
+    KINESIS_STREAM_CAPACITY_MODES,
+)
+
+# Code of the shard scaler Lambda Function, it runs every period and resizes the stream towards the target utilization
+KINESIS_STREAM_SCALER_CODE = """
+import datetime
+import math
+import os
+
+import boto3
+from botocore.exceptions import ClientError
+
+kinesis = boto3.client("kinesis")
+cloudwatch = boto3.client("cloudwatch")
+LAST_SCALING_TAG = "multa-last-scaling"
+
+
+def lambda_handler(event, context):
+    stream_name = os.environ["STREAM_NAME"]
+    period = int(os.environ["PERIOD"])
+    summary = kinesis.describe_stream_summary(StreamName=stream_name)["StreamDescriptionSummary"]
+    if summary["StreamStatus"] != "ACTIVE":
+        return
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    queries = [
+        {
+            "Id": metric_name.lower(),
+            "MetricStat": {
+                "Metric": {
+                    "Namespace": "AWS/Kinesis",
+                    "MetricName": metric_name,
+                    "Dimensions": [{"Name": "StreamName", "Value": stream_name}],
+                },
+                "Period": period,
+                "Stat": "Sum",
+            },
+        }
+        for metric_name in ("IncomingBytes", "IncomingRecords")
+    ]
+    results = cloudwatch.get_metric_data(
+        MetricDataQueries=queries, StartTime=now - datetime.timedelta(seconds=3 * period), EndTime=now
+    )["MetricDataResults"]
+    values = {result["Id"]: max(result["Values"], default=0) for result in results}
+
+    shards = summary["OpenShardCount"]
+    utilization = max(values["incomingbytes"] / 1048576, values["incomingrecords"] / 1000) / period / shards
+    target_shards = math.ceil(shards * utilization / float(os.environ["TARGET_UTILIZATION"]))
+    target_shards = max(int(os.environ["MIN_SHARDS"]), min(int(os.environ["MAX_SHARDS"]), target_shards))
+    target_shards = max(math.ceil(shards / 2), min(shards * 2, target_shards))
+
+    tags = kinesis.list_tags_for_stream(StreamName=stream_name)["Tags"]
+    last_scaling = next((float(tag["Value"]) for tag in tags if tag["Key"] == LAST_SCALING_TAG), 0)
+    cooldown = int(os.environ["SCALE_OUT_COOLDOWN"] if target_shards > shards else os.environ["SCALE_IN_COOLDOWN"])
+    if target_shards == shards or now.timestamp() - last_scaling < cooldown:
+        return
+
+    print(f"Scaling {stream_name} from {shards} to {target_shards} shards, utilization {utilization:.2f}")
+    try:
+        kinesis.update_shard_count(StreamName=stream_name, TargetShardCount=target_shards, ScalingType="UNIFORM_SCALING")
+    except ClientError as error:
+        # Resizes are limited (about 10 per stream a day) and not allowed while the stream is updating, the next run retries
+        if error.response["Error"]["Code"] not in ("LimitExceededException", "ResourceInUseException"):
+            raise
+        print(f"Scaling {stream_name} skipped: {error.response['Error']['Code']} {error.response['Error']['Message']}")
+        return
+    kinesis.add_tags_to_stream(StreamName=stream_name, Tags={LAST_SCALING_TAG: str(now.timestamp())})
+"""
+
 
 def base_kinesis_stream(construct, **kwargs):
     """
-    Function that generates a Kinesis Data Stream.
+    Function that generates a Kinesis Data Stream, with an alarm on the write throttled records.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'stream_name'.
+    :param kwargs: Consist of required 'stream_name' and optionals 'shard_count' (required in provisioned mode), 'retention_period', 'capacity_mode', 'autoscaling' and 'throttling_alarm'.
     :return: Kinesis Stream Construct.
     """
+    capacity_mode = kwargs.get("capacity_mode", DEFAULT_KINESIS_STREAM_CAPACITY_MODE).upper()
+    if capacity_mode not in KINESIS_STREAM_CAPACITY_MODES:
+        print(f"Wrong Kinesis Stream capacity mode {kwargs['capacity_mode']} specified for {kwargs['stream_name']}")
+        raise RuntimeError
+
+    autoscaling = kwargs.get("autoscaling")
+    shard_count = kwargs.get("shard_count")
+    if shard_count is None and autoscaling is not None:
+        shard_count = autoscaling["min_shards"]
+    if capacity_mode == "PROVISIONED" and shard_count is None:
+        print(f"Kinesis Stream {kwargs['stream_name']} in provisioned mode needs a 'shard_count'")
+        raise RuntimeError
+    if capacity_mode == "ON_DEMAND" and autoscaling is not None:
+        print(f"Kinesis Stream {kwargs['stream_name']} in on-demand mode scales automatically, remove its 'autoscaling'")
+        raise RuntimeError
+    if autoscaling is not None and not autoscaling["min_shards"] <= shard_count <= autoscaling["max_shards"]:
+        print(f"Kinesis Stream {kwargs['stream_name']} 'shard_count' must be between its 'min_shards' and 'max_shards'")
+        raise RuntimeError
+
     stream_name = construct.prefix + "_" + kwargs["stream_name"] + "_" + "stream" + "_" + construct.environment_
     stream_retention_period = Duration.hours(kwargs["retention_period"]) if kwargs.get("retention_period") is not None else None
     kinesis_stream = stream.Stream(
         construct,
         id=stream_name,
         stream_name=stream_name,
-        shard_count=kwargs["shard_count"],
+        shard_count=shard_count,
         retention_period=stream_retention_period,
     )
 
+    # The capacity mode is not supported by the Stream construct of this CDK version
+    if capacity_mode == "ON_DEMAND":
+        kinesis_stream.node.default_child.add_property_override("StreamModeDetails.StreamMode", "ON_DEMAND")
+        kinesis_stream.node.default_child.add_property_deletion_override("ShardCount")
+
+    if autoscaling is not None:
+        base_kinesis_stream_autoscaling(construct, kinesis_stream, stream_name, **autoscaling)
+
+    throttling_alarm = kwargs.get("throttling_alarm", DEFAULT_KINESIS_THROTTLING_ALARM)
+    alarm_name = stream_name + "_WriteProvisionedThroughputExceeded"
+    cloudwatch.Alarm(
+        construct,
+        id=alarm_name,
+        alarm_name=alarm_name,
+        metric=cloudwatch.Metric(
+            namespace="AWS/Kinesis",
+            metric_name="WriteProvisionedThroughputExceeded",
+            dimensions={"StreamName": kinesis_stream.stream_name},
+            statistic="Sum",
+        ),
+        threshold=throttling_alarm["number"],
+        evaluation_periods=throttling_alarm["periods"],
+        datapoints_to_alarm=throttling_alarm["points"],
+        actions_enabled=throttling_alarm["actions"],
+    )
+
     return kinesis_stream
+
+
+def base_kinesis_stream_autoscaling(construct, kinesis_stream, stream_name: str, **kwargs):
+    """
+    Function that generates the shard autoscaling of a provisioned Kinesis Data Stream, a scheduled Lambda Function that
+    resizes the stream towards the target utilization of its 'IncomingBytes' and 'IncomingRecords' metrics, within the
+    minimum and maximum shards and respecting the scale out and scale in cooldowns.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param kinesis_stream: Kinesis Stream Construct.
+    :param stream_name: Name of the Kinesis Stream. Used for naming purposes.
+    :param kwargs: Consist of required 'min_shards', 'max_shards' and optionals 'target_utilization', 'scale_out_cooldown' and 'scale_in_cooldown' (seconds).
+    :return: Lambda Function Construct of the shard scaler.
+    """
+    if not 1 <= kwargs["min_shards"] <= kwargs["max_shards"]:
+        print(f"Kinesis Stream {stream_name} autoscaling needs 1 <= 'min_shards' <= 'max_shards'")
+        raise RuntimeError
+
+    scaler_name = stream_name + "_scaler"
+    _scaler_function = lambda_.Function(
+        construct,
+        id=scaler_name,
+        function_name=scaler_name,
+        code=lambda_.Code.from_inline(KINESIS_STREAM_SCALER_CODE),
+        handler="index.lambda_handler",
+        runtime=lambda_.Runtime.PYTHON_3_8,
+        description=f"Shard autoscaling of {stream_name}",
+        timeout=Duration.seconds(30),
+        environment={
+            "STREAM_NAME": kinesis_stream.stream_name,
+            "PERIOD": str(DEFAULT_KINESIS_AUTOSCALING_PERIOD),
+            "MIN_SHARDS": str(kwargs["min_shards"]),
+            "MAX_SHARDS": str(kwargs["max_shards"]),
+            "TARGET_UTILIZATION": str(kwargs.get("target_utilization", DEFAULT_KINESIS_AUTOSCALING_TARGET_UTILIZATION)),
+            "SCALE_OUT_COOLDOWN": str(kwargs.get("scale_out_cooldown", DEFAULT_KINESIS_AUTOSCALING_SCALE_OUT_COOLDOWN)),
+            "SCALE_IN_COOLDOWN": str(kwargs.get("scale_in_cooldown", DEFAULT_KINESIS_AUTOSCALING_SCALE_IN_COOLDOWN)),
+        },
+    )
+    _scaler_function.add_to_role_policy(
+        iam.PolicyStatement(
+            actions=[
+                "kinesis:DescribeStreamSummary",
+                "kinesis:UpdateShardCount",
+                "kinesis:ListTagsForStream",
+                "kinesis:AddTagsToStream",
+            ],
+            resources=[kinesis_stream.stream_arn],
+        )
+    )
+    _scaler_function.add_to_role_policy(iam.PolicyStatement(actions=["cloudwatch:GetMetricData"], resources=["*"]))
+
+    rule_name = scaler_name + "_rule"
+    _scaler_rule = events.Rule(
+        construct,
+        id=rule_name,
+        rule_name=rule_name,
+        description=f"Shard autoscaling schedule of {stream_name}",
+        schedule=events.Schedule.rate(Duration.seconds(DEFAULT_KINESIS_AUTOSCALING_PERIOD)),
+    )
+    _scaler_rule.add_target(targets.LambdaFunction(handler=_scaler_function))
+
+    return _scaler_function
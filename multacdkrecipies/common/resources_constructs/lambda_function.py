@@ -1,15 +1,109 @@
+import hashlib
+import os
 import traceback
+import weakref
 
 from aws_cdk import (
     core,
+    aws_applicationautoscaling as appscaling,
     aws_events as events,
     aws_events_targets as targets,
     aws_iam as iam,
     aws_lambda as lambda_,
 )
 
-from multacdkrecipies.recipies.settings import DEFAULT_LAMBDA_CODE_PATH, DEFAULT_LAMBDA_CODE_PATH_EXISTS
-from multacdkrecipies.recipies.utils import WrongRuntimePassed
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_IAM_SHARED_ROLES,
+    DEFAULT_LAMBDA_ARCHITECTURE,
+    DEFAULT_LAMBDA_CODE_PATH,
+    DEFAULT_LAMBDA_CODE_PATH_EXISTS,
+    LAMBDA_ARCHITECTURES,
+    LAMBDA_ARM64_UNSUPPORTED_RUNTIMES,
+)
+from multacdkrecipies.recipies.utils import WrongRuntimePassed, active_synth_cache
+from . import base_shared_managed_policy
+from .lambda_layer import lambda_layer_architecture
+
+# Lambda Code Assets shared by all the functions of a Stack that use the same code path, exclude list and content.
+# Assets can't be shared across Stacks, so the cache is split by Stack and released together with it.
+_LAMBDA_CODE_ASSETS_CACHE = weakref.WeakKeyDictionary()
+_LAMBDA_CODE_ASSETS_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def lambda_code_fingerprint(code_path: str) -> str:
+    """
+    Function that generates a fingerprint of a Lambda code path based on the relative path, size and modification time of
+    every file contained on it. It is a lot cheaper than the content hash calculated by CDK when staging the asset.
+    :param code_path: Path to a directory or file containing the Lambda Function code.
+    :return: Hexadecimal fingerprint of the code path.
+    """
+    fingerprint = hashlib.sha256()
+    if os.path.isfile(code_path):
+        file_stat = os.stat(code_path)
+        fingerprint.update(f"{file_stat.st_size}:{file_stat.st_mtime_ns}".encode())
+        return fingerprint.hexdigest()
+
+    for root, directories, files in os.walk(code_path):
+        directories.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue
+            relative_path = os.path.relpath(file_path, code_path)
+            fingerprint.update(f"{relative_path}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n".encode())
+
+    return fingerprint.hexdigest()
+
+
+def lambda_code_asset(construct, code_path: str, exclude: list = None):
+    """
+    Function that returns the Lambda Code Asset for a code path. Functions in the same Stack pointing to the same code
+    path with the same exclude list get the same Asset, so the directory is fingerprinted and staged only once.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param code_path: Path to a directory or file containing the Lambda Function code.
+    :param exclude: List of glob patterns excluded from the Asset.
+    :return: Lambda Asset Code.
+    """
+    resolved_code_path = os.path.realpath(code_path)
+    code_fingerprint = lambda_code_fingerprint(resolved_code_path)
+    cache_key = (
+        resolved_code_path,
+        tuple(sorted(set(exclude))) if exclude is not None else None,
+        code_fingerprint,
+    )
+
+    stack_code_assets = _LAMBDA_CODE_ASSETS_CACHE.setdefault(core.Stack.of(construct), dict())
+    code_asset = stack_code_assets.get(cache_key)
+    if code_asset is not None:
+        _LAMBDA_CODE_ASSETS_CACHE_STATS["hits"] += 1
+        return code_asset
+
+    _LAMBDA_CODE_ASSETS_CACHE_STATS["misses"] += 1
+    # With the synthesis cache the content hash of unchanged code paths is reused, instead of being calculated by CDK
+    synth_cache = active_synth_cache()
+    if synth_cache is not None:
+        code_asset = lambda_.Code.from_asset(
+            path=code_path,
+            exclude=exclude,
+            asset_hash=synth_cache.asset_hash(resolved_code_path, exclude=cache_key[1], code_fingerprint=code_fingerprint),
+            asset_hash_type=core.AssetHashType.CUSTOM,
+        )
+    else:
+        code_asset = lambda_.Code.from_asset(path=code_path, exclude=exclude)
+    stack_code_assets[cache_key] = code_asset
+
+    return code_asset
+
+
+def lambda_code_cache_info() -> dict:
+    """
+    Function that returns the usage statistics of the Lambda Code Assets cache.
+    :return: Dictionary with the cache 'hits', 'misses' and the number of cached 'assets'.
+    """
+    cached_assets = sum(len(stack_code_assets) for stack_code_assets in _LAMBDA_CODE_ASSETS_CACHE.values())
+    return dict(_LAMBDA_CODE_ASSETS_CACHE_STATS, assets=cached_assets)
 
 
 def base_lambda_function(construct, **kwargs):
@@ -18,8 +112,8 @@ def base_lambda_function(construct, **kwargs):
     the user or a preset path. The function gets all the allowed IAM actions and will have access to all resources for
     a matter of simplicity.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'lambda_name', 'handler', 'runtime', 'iam_actions' and optionals 'code_path', 'description', 'environment_vars', 'timeout', 'reserved_concurrent_executions'.
-    :return: Lambda Function Construct.
+    :param kwargs: Consist of required 'lambda_name', 'handler', 'runtime', 'iam_actions' and optionals 'code_path', 'description', 'environment_vars', 'timeout', 'memory_size', 'architecture', 'ephemeral_storage_size', 'reserved_concurrent_executions', 'provisioned_concurrency'.
+    :return: Lambda Function Construct, or its Alias Construct if provisioned concurrency is enabled.
     """
     try:
         function_runtime = getattr(lambda_.Runtime, kwargs["runtime"])
@@ -36,8 +130,20 @@ def base_lambda_function(construct, **kwargs):
         print(f"Code path for Lambda Function {kwargs['lambda_name']} is not valid!")
         raise RuntimeError
 
+    architecture = kwargs.get("architecture", DEFAULT_LAMBDA_ARCHITECTURE)
+    if architecture not in LAMBDA_ARCHITECTURES:
+        print(f"Wrong function architecture {architecture} specified for Lambda Function {kwargs['lambda_name']}")
+        raise RuntimeError
+    if architecture == "arm64" and kwargs["runtime"] in LAMBDA_ARM64_UNSUPPORTED_RUNTIMES:
+        print(f"Runtime {kwargs['runtime']} of Lambda Function {kwargs['lambda_name']} is not supported in arm64")
+        raise RuntimeError
+
     function_layers = list()
     for layer_arn in kwargs.get("layers", list()):
+        layer_architecture = lambda_layer_architecture(layer_arn)
+        if layer_architecture is not None and layer_architecture != architecture:
+            print(f"Lambda Function {kwargs['lambda_name']} is {architecture} but uses a Lambda Layer built for {layer_architecture}")
+            raise RuntimeError
         try:
             layer = lambda_.LayerVersion.from_layer_version_arn(
                 construct, id=kwargs["lambda_name"] + "_" + kwargs.get("identifier", "1"), layer_version_arn=layer_arn
@@ -54,10 +160,7 @@ def base_lambda_function(construct, **kwargs):
         construct,
         id=function_name,
         function_name=function_name,
-        code=lambda_.Code.from_asset(
-            path=code_path,
-            exclude=kwargs.get("exclude")
-        ),
+        code=lambda_code_asset(construct, code_path=code_path, exclude=kwargs.get("exclude")),
         handler=kwargs["handler"],
         runtime=function_runtime,
         layers=function_layers,
@@ -65,16 +168,38 @@ def base_lambda_function(construct, **kwargs):
         tracing=lambda_.Tracing.ACTIVE,
         environment=kwargs.get("environment_vars"),
         timeout=core.Duration.seconds(kwargs.get("timeout")),
+        memory_size=kwargs.get("memory_size"),
         reserved_concurrent_executions=kwargs.get("reserved_concurrent_executions"),
     )
 
-    # Defining Lambda Function IAM policies to access other services
+    # Architecture and ephemeral storage are not supported by the Lambda Function construct of this CDK version
+    if kwargs.get("architecture") is not None:
+        _lambda_function.node.default_child.add_property_override("Architectures", [architecture])
+    if kwargs.get("ephemeral_storage_size") is not None:
+        if not 512 <= kwargs["ephemeral_storage_size"] <= 10240:
+            print(f"Ephemeral storage size for Lambda Function {kwargs['lambda_name']} must be between 512 and 10240 MB")
+            raise RuntimeError
+        _lambda_function.node.default_child.add_property_override("EphemeralStorage.Size", kwargs["ephemeral_storage_size"])
+
+    # Defining Lambda Function IAM policies to access other services. If enabled, they are in a Managed Policy shared with
+    # the functions of the Stack with the same IAM actions. The Role is never shared, as the permissions granted to the
+    # function afterwards (event sources, resources grants...) are added to it
     construct.iam_policies = list()
     for iam_actions in kwargs["iam_actions"]:
         construct.iam_policies.append(iam_actions)
 
-    policy_statement = iam.PolicyStatement(actions=construct.iam_policies, resources=["*"])
-    _lambda_function.add_to_role_policy(statement=policy_statement)
+    if kwargs.get("shared_role", DEFAULT_IAM_SHARED_ROLES) is True:
+        _lambda_function.role.add_managed_policy(
+            base_shared_managed_policy(construct, actions=construct.iam_policies, resources=["*"])
+        )
+    else:
+        policy_statement = iam.PolicyStatement(actions=construct.iam_policies, resources=["*"])
+        _lambda_function.add_to_role_policy(statement=policy_statement)
+
+    # Provisioned concurrency keeps the containers initialized, so the keep warm rule is only used without it
+    provisioned_concurrency = kwargs.get("provisioned_concurrency", dict())
+    if provisioned_concurrency.get("enabled") is True:
+        return base_lambda_function_alias(construct, _lambda_function, function_name, **provisioned_concurrency)
 
     if kwargs.get("keep_warm") is not None and kwargs.get("keep_warm", {}).get("enabled") is True:
         keep_warm_settings = kwargs.get("keep_warm")
@@ -93,3 +218,44 @@ def base_lambda_function(construct, **kwargs):
         _cloudwatch_event.add_target(targets.LambdaFunction(handler=_lambda_function))
 
     return _lambda_function
+
+
+def base_lambda_function_alias(construct, lambda_function, function_name: str, **kwargs):
+    """
+    Function that generates a Lambda Function Alias with provisioned concurrency, pointing to the current version of the
+    function. Optionally the provisioned concurrency scales with Application Auto Scaling, tracking the
+    'ProvisionedConcurrencyUtilization' metric and with scheduled scaling windows.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param lambda_function: Lambda Function Construct.
+    :param function_name: Name of the Lambda Function. Used for naming purposes.
+    :param kwargs: Consist of required 'concurrent_executions' and optionals 'alias_name', 'autoscaling'.
+    :return: Lambda Function Alias Construct, that can be used as the Lambda Function by event sources and integrations.
+    """
+    alias_name = kwargs.get("alias_name", "live")
+    _lambda_alias = lambda_.Alias(
+        construct,
+        id=f"{function_name}_{alias_name}",
+        alias_name=alias_name,
+        version=lambda_function.current_version,
+        provisioned_concurrent_executions=kwargs["concurrent_executions"],
+    )
+
+    autoscaling = kwargs.get("autoscaling")
+    if autoscaling is not None:
+        scalable_target = _lambda_alias.add_auto_scaling(
+            min_capacity=autoscaling.get("min_capacity", kwargs["concurrent_executions"]),
+            max_capacity=autoscaling["max_capacity"],
+        )
+        scalable_target.scale_on_utilization(utilization_target=autoscaling.get("utilization_target", 0.7))
+        for schedule in autoscaling.get("schedules", list()):
+            if schedule.get("min_capacity") is None and schedule.get("max_capacity") is None:
+                print(f"Lambda Function {function_name} schedule {schedule['name']} needs 'min_capacity' or 'max_capacity'")
+                raise RuntimeError
+            scalable_target.scale_on_schedule(
+                f"{function_name}_{schedule['name']}",
+                schedule=appscaling.Schedule.expression(f"cron({schedule['cron']})"),
+                min_capacity=schedule.get("min_capacity"),
+                max_capacity=schedule.get("max_capacity"),
+            )
+
+    return _lambda_alias
@@ -2,16 +2,34 @@ import traceback
 
 from aws_cdk import aws_lambda as lambda_
 
-from multacdkrecipies.recipies.settings import DEFAULT_LAMBDA_LAYER_CODE_PATH, DEFAULT_LAMBDA_LAYER_CODE_PATH_EXISTS
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_LAMBDA_ARCHITECTURE,
+    DEFAULT_LAMBDA_LAYER_CODE_PATH,
+    DEFAULT_LAMBDA_LAYER_CODE_PATH_EXISTS,
+    LAMBDA_ARCHITECTURES,
+    LAMBDA_ARM64_UNSUPPORTED_RUNTIMES,
+)
 from multacdkrecipies.recipies.utils import WrongRuntimePassed
 
+# Architecture of the Lambda Layers defined in the App by their ARN, used to check the functions that use them.
+_LAMBDA_LAYER_ARCHITECTURES = dict()
+
+
+def lambda_layer_architecture(layer_arn: str):
+    """
+    Function that returns the architecture of a Lambda Layer defined with 'base_lambda_layer'.
+    :param layer_arn: ARN of the Lambda Layer Version.
+    :return: Lambda architecture of the Lambda Layer, None if the Lambda Layer is not defined in the App.
+    """
+    return _LAMBDA_LAYER_ARCHITECTURES.get(layer_arn)
+
 
 def base_lambda_layer(construct, **kwargs):
     """
     Function that generates a Lambda Layer. Using the parameter 'layer_code_path' it gets the code from a path set for
     the user or a preset path.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'layer_name', 'layer_runtimes', and optionals 'layer_code_path', 'description', 'license'.
+    :param kwargs: Consist of required 'layer_name', 'layer_runtimes', and optionals 'layer_code_path', 'description', 'license', 'architecture'.
     :return: Lambda Layer Construct.
     """
     layer_runtimes = list()
@@ -32,6 +50,15 @@ def base_lambda_layer(construct, **kwargs):
         print(f"Code path for Lambda Function {kwargs['layer_name']} is not valid!")
         raise RuntimeError
 
+    architecture = kwargs.get("architecture", DEFAULT_LAMBDA_ARCHITECTURE)
+    if architecture not in LAMBDA_ARCHITECTURES:
+        print(f"Wrong architecture {architecture} specified for Lambda Layer {kwargs['layer_name']}")
+        raise RuntimeError
+    for runtime in kwargs["layer_runtimes"]:
+        if architecture == "arm64" and runtime in LAMBDA_ARM64_UNSUPPORTED_RUNTIMES:
+            print(f"Runtime {runtime} of Lambda Layer {kwargs['layer_name']} is not supported in arm64")
+            raise RuntimeError
+
     # Defining Lambda Layer
     _lambda_layer = lambda_.LayerVersion(
         construct,
@@ -43,4 +70,9 @@ def base_lambda_layer(construct, **kwargs):
         license=kwargs.get("license"),
     )
 
+    # Architectures are not supported by the Lambda Layer construct of this CDK version
+    if kwargs.get("architecture") is not None:
+        _lambda_layer.node.default_child.add_property_override("CompatibleArchitectures", [architecture])
+    _LAMBDA_LAYER_ARCHITECTURES[_lambda_layer.layer_version_arn] = architecture
+
     return _lambda_layer
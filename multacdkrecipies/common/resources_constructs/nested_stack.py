@@ -0,0 +1,110 @@
+from aws_cdk import core
+
+from multacdkrecipies.recipies.settings import DEFAULT_NESTED_STACK_RESOURCES_BUDGET
+
+
+class MultaNestedStack(core.NestedStack):
+    """
+    AWS CDK Nested Stack that keeps the naming attributes of the construct that defines it, so it can be used as the
+    construct of the base resources functions.
+    """
+
+    def __init__(self, scope: core.Construct, id: str, *, prefix: str, environment: str, **kwargs):
+        """
+        :param scope: Custom construct that defines the Nested Stack.
+        :param id: ID of the Nested Stack, used by CDK.
+        :param prefix: Prefix of the construct, used for naming purposes.
+        :param environment: Environment of the construct, used for naming purposes.
+        :param kwargs: Other parameters that could be used by the Nested Stack.
+        """
+        super().__init__(scope, id, **kwargs)
+        self.prefix = prefix
+        self.environment_ = environment
+
+
+def base_nested_stack(construct, shard_name: str):
+    """
+    Function that generates a Nested Stack to be used as shard of a custom construct resources.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param shard_name: Name of the shard, used for naming purposes.
+    :return: Nested Stack Construct.
+    """
+    nested_stack = MultaNestedStack(
+        construct,
+        id=construct.prefix + "_" + shard_name + "_" + construct.environment_,
+        prefix=construct.prefix,
+        environment=construct.environment_,
+    )
+
+    return nested_stack
+
+
+class NestedStackShards:
+    """
+    Distributes the resources defined by a custom construct across Nested Stacks, opening a new one each time the
+    resources of the current one would exceed the budget. CloudFormation deploys the Nested Stacks in parallel and CDK
+    wires the references between them and the parent Stack as parameters and outputs.
+    """
+
+    def __init__(self, construct, enabled: bool = False, resources_budget: int = DEFAULT_NESTED_STACK_RESOURCES_BUDGET):
+        """
+        :param construct: Custom construct that defines the resources. From the external construct is usually 'self'.
+        :param enabled: If the resources are distributed across Nested Stacks or defined in the custom construct.
+        :param resources_budget: Maximum number of CloudFormation resources of each Nested Stack.
+        """
+        self._construct = construct
+        self._enabled = enabled
+        self._resources_budget = resources_budget
+        self._shards = list()
+        self._shard_resources = 0
+        self._unit_resources = 1
+
+    @classmethod
+    def from_configuration(cls, construct, configuration: dict = None):
+        """
+        :param construct: Custom construct that defines the resources. From the external construct is usually 'self'.
+        :param configuration: Sharding configuration of the construct. In this case NESTED_STACK_SHARDING_SCHEMA.
+        :return: NestedStackShards of the custom construct.
+        """
+        configuration = configuration or dict()
+        return cls(
+            construct,
+            enabled=configuration.get("enabled", False),
+            resources_budget=configuration.get("resources_budget", DEFAULT_NESTED_STACK_RESOURCES_BUDGET),
+        )
+
+    def add(self, define, **kwargs):
+        """
+        Defines a group of resources in the current shard, or in the custom construct if sharding is not enabled.
+        :param define: Function that receives the construct to use as first parameter, like the base resources functions.
+        :param kwargs: Parameters passed to the function.
+        :return: Result of the function.
+        """
+        if self._enabled is False:
+            return define(self._construct, **kwargs)
+
+        if not self._shards or self._shard_resources + self._unit_resources > self._resources_budget:
+            self._shards.append(base_nested_stack(self._construct, shard_name=f"shard_{len(self._shards)}"))
+            self._shard_resources = 0
+
+        # Only the constructs added by the function are inspected to count its CloudFormation resources, some of them
+        # are not typed in Python (e.g. IAM policies) so the check is done by CDK
+        shard = self._shards[-1]
+        defined_children = len(shard.node.children)
+        result = define(shard, **kwargs)
+        unit_resources = sum(
+            core.CfnResource.is_cfn_resource(element)
+            for child in shard.node.children[defined_children:]
+            for element in child.node.find_all()
+        )
+        self._shard_resources += unit_resources
+        self._unit_resources = max(self._unit_resources, unit_resources)
+
+        return result
+
+    @property
+    def shards(self):
+        """
+        :return: Nested Stacks List.
+        """
+        return self._shards
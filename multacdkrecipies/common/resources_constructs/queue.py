@@ -1,22 +1,94 @@
-from aws_cdk import aws_sqs as sqs
+from aws_cdk import core, aws_sqs as sqs
 
+from multacdkrecipies.recipies.settings import (
+    DEFAULT_SQS_DEAD_LETTER_QUEUE_RETENTION_PERIOD,
+    DEFAULT_SQS_LAMBDA_TIMEOUT,
+    DEFAULT_SQS_RECEIVE_WAIT_TIME,
+    SQS_MAX_RECEIVE_COUNT,
+    SQS_VISIBILITY_TIMEOUT_FACTOR,
+)
 
-def base_queue(construct, **kwargs):
+
+def base_queue(construct, dead_letter_queue=None, **kwargs):
     """
     Function that generates an SQS Queue.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
-    :param kwargs: Consist of required 'queue_name' and optionals 'queue_delivery_delay' and 'queue_visibility_timeout'.
+    :param dead_letter_queue: Dead Letter Queue that receives the messages not processed after the maximum receives, see 'base_dead_letter_queue'.
+    :param kwargs: Consist of required 'queue_name' and optionals 'queue_delivery_delay', 'queue_message_visibility', 'queue_receive_wait_time' and 'queue_retention_period', in seconds, and 'fifo'.
     :return: SQS Queue Construct.
     """
+    fifo = kwargs.get("fifo", dict())
+    fifo_enabled = fifo.get("enabled") is True
     queue_name = construct.prefix + "_" + kwargs["queue_name"] + "_queue_" + construct.environment_
+    if fifo_enabled is True:
+        queue_name = queue_name + ".fifo"
     queue_delivery_delay = kwargs.get("queue_delivery_delay")
-    queue_visibility_timeout = kwargs.get("queue_visibility_timeout")
+    queue_visibility_timeout = kwargs.get("queue_message_visibility", kwargs.get("queue_visibility_timeout"))
+    queue_receive_wait_time = kwargs.get("queue_receive_wait_time", DEFAULT_SQS_RECEIVE_WAIT_TIME)
+    queue_retention_period = kwargs.get("queue_retention_period")
     queue = sqs.Queue(
         construct,
         id=queue_name,
         queue_name=queue_name,
-        delivery_delay=queue_delivery_delay,
-        visibility_timeout=queue_visibility_timeout,
+        delivery_delay=core.Duration.seconds(queue_delivery_delay) if queue_delivery_delay is not None else None,
+        visibility_timeout=core.Duration.seconds(queue_visibility_timeout) if queue_visibility_timeout is not None else None,
+        receive_message_wait_time=core.Duration.seconds(queue_receive_wait_time),
+        retention_period=core.Duration.seconds(queue_retention_period) if queue_retention_period is not None else None,
+        dead_letter_queue=dead_letter_queue,
+        fifo=fifo_enabled or None,
+        content_based_deduplication=fifo.get("content_based_deduplication") if fifo_enabled is True else None,
     )
 
+    # High throughput FIFO applies the throughput limit and the deduplication per message group instead of per queue,
+    # it is not supported by the Queue construct of this CDK version
+    if fifo_enabled is True and fifo.get("high_throughput") is True:
+        queue.node.default_child.add_property_override("DeduplicationScope", "messageGroup")
+        queue.node.default_child.add_property_override("FifoThroughputLimit", "perMessageGroupId")
+
     return queue
+
+
+def base_dead_letter_queue(construct, **kwargs):
+    """
+    Function that generates the Dead Letter Queue of an SQS Queue, with its redrive settings.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param kwargs: Consist of required 'queue_name' (name of the source queue), 'max_receive_count' and optionals 'retention_period', in seconds, and 'fifo' (FIFO settings of the source queue).
+    :return: SQS Dead Letter Queue definition, its 'queue' attribute is the SQS Queue Construct.
+    """
+    if not 1 <= kwargs["max_receive_count"] <= SQS_MAX_RECEIVE_COUNT:
+        print(f"Dead Letter Queue max receive count must be between 1 and {SQS_MAX_RECEIVE_COUNT} for {kwargs['queue_name']}")
+        raise RuntimeError
+
+    # The enqueue timestamp of a message is kept when it is moved, so the retention should be longer than the source one
+    # The Dead Letter Queue of a FIFO queue must be a FIFO queue too
+    fifo_enabled = kwargs.get("fifo", dict()).get("enabled") is True
+    queue_name = construct.prefix + "_" + kwargs["queue_name"] + "_dlq_" + construct.environment_
+    if fifo_enabled is True:
+        queue_name = queue_name + ".fifo"
+    queue = sqs.Queue(
+        construct,
+        id=queue_name,
+        queue_name=queue_name,
+        retention_period=core.Duration.seconds(kwargs.get("retention_period", DEFAULT_SQS_DEAD_LETTER_QUEUE_RETENTION_PERIOD)),
+        fifo=fifo_enabled or None,
+    )
+
+    return sqs.DeadLetterQueue(queue=queue, max_receive_count=kwargs["max_receive_count"])
+
+
+def queue_consumers_settings(lambda_handlers: list) -> dict:
+    """
+    Function that derives the visibility timeout of an SQS Queue from the Lambda Functions consuming it. The visibility
+    timeout is 6 times the largest timeout plus the largest batching window, so a message is not processed again while
+    it is being handled.
+    :param lambda_handlers: Lambda Functions configurations, with optional 'timeout' and 'event_source' settings.
+    :return: Dictionary with the 'queue_message_visibility' in seconds.
+    """
+    timeouts = [lambda_handler.get("timeout", DEFAULT_SQS_LAMBDA_TIMEOUT) for lambda_handler in lambda_handlers]
+    batching_windows = [
+        lambda_handler.get("event_source", dict()).get("max_batching_window", 0) for lambda_handler in lambda_handlers
+    ]
+    if not timeouts:
+        return dict()
+
+    return {"queue_message_visibility": SQS_VISIBILITY_TIMEOUT_FACTOR * max(timeouts) + max(batching_windows)}
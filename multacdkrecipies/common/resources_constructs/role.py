@@ -1,9 +1,88 @@
+import hashlib
+import json
 import traceback
+import weakref
 
 from aws_cdk import aws_iam as iam, core
 
+from multacdkrecipies.recipies.settings import DEFAULT_IAM_SHARED_ROLES
 
-def base_service_role(construct, resource_name: str, principal_resource: str, actions: list, resources: list):
+# Shared IAM Managed Policies and Roles by Stack and key, see 'iam_resource_key'. Released together with the Stack.
+_IAM_SHARED_RESOURCES = weakref.WeakKeyDictionary()
+
+
+def iam_resource_key(construct, *elements) -> str:
+    """
+    Function that generates the key of a shared IAM resource. Tokens (like the ARNs of resources defined in the Stack)
+    are resolved first, so the same resource always generates the same key.
+    :param construct: Custom construct that will use the shared IAM resource.
+    :param elements: Elements that identify the IAM resource, like its principal, actions and resources.
+    :return: Hexadecimal hash of the elements.
+    """
+    resolved_elements = core.Stack.of(construct).resolve(list(elements))
+    return hashlib.sha256(json.dumps(resolved_elements, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def base_shared_managed_policy(construct, actions: list, resources: list):
+    """
+    Function that generates an IAM Managed Policy shared by all the Roles of the Stack with the same actions and resources.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param actions: Action list containing AWS IAM defined actions. For example 'sns:Publish'
+    :param resources: List of resources ARNs defined by AWS.
+    :return: IAM Managed Policy.
+    """
+    stack = core.Stack.of(construct)
+    policy_key = iam_resource_key(construct, "policy", sorted(set(actions)), resources)
+    shared_resources = _IAM_SHARED_RESOURCES.setdefault(stack, dict())
+
+    policy = shared_resources.get(policy_key)
+    if policy is None:
+        policy = iam.ManagedPolicy(
+            stack,
+            id=f"shared_policy_{policy_key}",
+            statements=[iam.PolicyStatement(actions=sorted(set(actions)), resources=resources)],
+        )
+        shared_resources[policy_key] = policy
+
+    return policy
+
+
+def base_shared_role(construct, principal_resource: str, actions: list, resources: list, aws_managed_policies: list = None):
+    """
+    Function that generates an IAM Service Role shared by all the resources of the Stack with the same principal,
+    actions and resources. Only for resources that are not granted other permissions afterwards, as every resource using
+    the Role would get them.
+    :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
+    :param principal_resource: Resource used to define a Service Principal. Has to match an AWS Resource. For example, 'iot' -> 'iot.amazonaws.com'.
+    :param actions: Action list containing AWS IAM defined actions. For example 'sns:Publish'
+    :param resources: List of resources ARNs defined by AWS.
+    :param aws_managed_policies: Names of AWS Managed Policies attached to the Role. For example 'service-role/AWSLambdaBasicExecutionRole'.
+    :return: IAM Service Role with the shared IAM Managed Policy attached.
+    """
+    stack = core.Stack.of(construct)
+    aws_managed_policies = sorted(aws_managed_policies or list())
+    role_key = iam_resource_key(construct, "role", principal_resource, sorted(set(actions)), resources, aws_managed_policies)
+    shared_resources = _IAM_SHARED_RESOURCES.setdefault(stack, dict())
+
+    role = shared_resources.get(role_key)
+    if role is None:
+        managed_policies = [base_shared_managed_policy(construct, actions=actions, resources=resources)]
+        for policy_name in aws_managed_policies:
+            managed_policies.append(iam.ManagedPolicy.from_aws_managed_policy_name(managed_policy_name=policy_name))
+        role = iam.Role(
+            stack,
+            id=f"shared_role_{principal_resource}_{role_key}",
+            assumed_by=iam.ServicePrincipal(service=f"{principal_resource}.amazonaws.com"),
+            managed_policies=managed_policies,
+        )
+        shared_resources[role_key] = role
+
+    return role
+
+
+def base_service_role(
+    construct, resource_name: str, principal_resource: str, actions: list, resources: list, shared: bool = None
+):
     """
     Function that generates an IAM Service Role with a Policy.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
@@ -11,8 +90,12 @@ def base_service_role(construct, resource_name: str, principal_resource: str, ac
     :param principal_resource: Resource used to define a Service Principal. Has to match an AWS Resource. For example, 'iot' -> 'iot.amazonaws.com'.
     :param actions: Action list containing AWS IAM defined actions. For example 'sns:Publish'
     :param resources: List of resources ARNs defined by AWS.
+    :param shared: Reuse the IAM Managed Policy of the Stack with the same actions and resources. By default DEFAULT_IAM_SHARED_ROLES.
     :return: IAM Service Role with an IAM Policy attached.
     """
+    if shared is None:
+        shared = DEFAULT_IAM_SHARED_ROLES
+
     try:
         # Defining IAM Role
         # Defining Service Principal
@@ -23,10 +106,14 @@ def base_service_role(construct, resource_name: str, principal_resource: str, ac
         # Defining IAM Role
         role = iam.Role(construct, id=iam_role_name, role_name=iam_role_name, assumed_by=principal)
 
-        # Defining Policy Statement, Policy and Attaching to Role
-        policy_statements = iam.PolicyStatement(actions=actions, resources=resources)
-        policy = iam.Policy(construct, id=iam_policy_name, policy_name=iam_policy_name, statements=[policy_statements])
-        policy.attach_to_role(role=role)
+        # Defining Policy Statement, Policy and Attaching to Role. The Role is not shared even if the Policy is, as the
+        # permissions granted to the Role afterwards would be shared too
+        if shared is True:
+            role.add_managed_policy(base_shared_managed_policy(construct, actions=actions, resources=resources))
+        else:
+            policy_statements = iam.PolicyStatement(actions=actions, resources=resources)
+            policy = iam.Policy(construct, id=iam_policy_name, policy_name=iam_policy_name, statements=[policy_statements])
+            policy.attach_to_role(role=role)
 
     except Exception:
         print(traceback.format_exc())
@@ -165,7 +252,7 @@ def base_kinesis_firehose_role(construct, resource_name: str, principal_resource
     :return: IAM Role with an IAM Policy attached.
     """
     try:
-        actions = ["firehose:PutRecord"]
+        actions = ["firehose:PutRecord", "firehose:PutRecordBatch"]
         resources = [construct._kinesis_firehose_stream.attr_arn]
         role = base_service_role(construct, resource_name, principal_resource, actions=actions, resources=resources)
     except Exception:
@@ -176,17 +263,36 @@ def base_kinesis_firehose_role(construct, resource_name: str, principal_resource
 
 def base_kinesis_firehose_s3_role(construct, resource_name: str, principal_resource: str, **kwargs):
     """
-    Function that generates an IAM Role with a Policy for Kinesis Stream Put Record.
+    Function that generates an IAM Role with a Policy for Kinesis Delivery Stream S3 delivery.
     :param construct: Custom construct that will use this function. From the external construct is usually 'self'.
     :param resource_name: Name of the resource. Used for naming purposes.
-    :param principal_resource: Resource used to define a Service Principal. Has to match an AWS Resource. For example, 'iot' -> 'iot.amazonaws.com'.
-    :param kwargs: Other parameters that could be used by the construct.
+    :param principal_resource: Resource used to define a Service Principal. Has to match an AWS Resource. For example, 'firehose' -> 'firehose.amazonaws.com'.
+    :param kwargs: Consist of required 'bucket' (S3 Bucket Construct) and optionals 'glue_database_name' and 'glue_table_name', the Glue table used to convert the records format.
     :return: IAM Role with an IAM Policy attached.
     """
     try:
-        actions = ["firehose:PutRecord"]
-        resources = [construct._kinesis_firehose_stream.attr_arn]
+        actions = [
+            "s3:AbortMultipartUpload",
+            "s3:GetBucketLocation",
+            "s3:GetObject",
+            "s3:ListBucket",
+            "s3:ListBucketMultipartUploads",
+            "s3:PutObject",
+        ]
+        resources = [kwargs["bucket"].bucket_arn, kwargs["bucket"].arn_for_objects("*")]
         role = base_service_role(construct, resource_name, principal_resource, actions=actions, resources=resources)
+
+        if kwargs.get("glue_table_name") is not None:
+            stack_object = core.Stack.of(construct)
+            glue_resources = [
+                stack_object.format_arn(service="glue", resource="catalog"),
+                stack_object.format_arn(service="glue", resource="database", resource_name=kwargs["glue_database_name"]),
+                stack_object.format_arn(
+                    service="glue", resource="table", resource_name=f"{kwargs['glue_database_name']}/{kwargs['glue_table_name']}"
+                ),
+            ]
+            glue_actions = ["glue:GetTable", "glue:GetTableVersion", "glue:GetTableVersions"]
+            role.add_to_policy(iam.PolicyStatement(actions=glue_actions, resources=glue_resources))
     except Exception:
         print(traceback.format_exc())
     else:
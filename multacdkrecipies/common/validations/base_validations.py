@@ -1,4 +1,4 @@
-from schema import Schema, And, Use, Optional
+from schema import Schema, And, Use, Optional, Or
 
 LAMBDA_BASE_SCHEMA = Schema(
     {
@@ -9,10 +9,14 @@ LAMBDA_BASE_SCHEMA = Schema(
         "handler": And(Use(str)),
         Optional("layers"): [And(Use(str))],
         Optional("timeout"): And(Use(int)),
+        Optional("memory_size"): And(Use(int)),
+        Optional("architecture"): And(Use(str)),
+        Optional("ephemeral_storage_size"): And(Use(int)),
         Optional("exclude"): [And(Use(str))],
         Optional("reserved_concurrent_executions"): And(Use(int)),
         Optional("environment_vars"): {And(Use(str)): And(Use(str))},
         "iam_actions": [And(Use(str))],
+        Optional("shared_role"): And(Use(bool)),
         Optional("alarms"): [
             {
                 "name": And(Use(str)),
@@ -23,6 +27,119 @@ LAMBDA_BASE_SCHEMA = Schema(
             }
         ],
         Optional("keep_warm"): {"enabled": And(Use(bool)), Optional("rate"): And(Use(str))},
+        Optional("provisioned_concurrency"): {
+            "enabled": And(Use(bool)),
+            "concurrent_executions": And(Use(int)),
+            Optional("alias_name"): And(Use(str)),
+            Optional("autoscaling"): {
+                "max_capacity": And(Use(int)),
+                Optional("min_capacity"): And(Use(int)),
+                Optional("utilization_target"): And(Use(float)),
+                Optional("schedules"): [
+                    {
+                        "name": And(Use(str)),
+                        "cron": And(Use(str)),
+                        Optional("min_capacity"): And(Use(int)),
+                        Optional("max_capacity"): And(Use(int)),
+                    }
+                ],
+            },
+        },
+    }
+)
+
+SQS_EVENT_SOURCE_SCHEMA = Schema(
+    {
+        Optional("batch_size"): And(Use(int)),
+        Optional("max_batching_window"): And(Use(int)),
+        Optional("report_batch_item_failures"): And(Use(bool)),
+        Optional("max_concurrency"): And(Use(int)),
+        Optional("enabled"): And(Use(bool)),
+    }
+)
+
+SQS_DEAD_LETTER_QUEUE_SCHEMA = Schema(
+    {
+        "enabled": And(Use(bool)),
+        "max_receive_count": And(Use(int)),
+        Optional("retention_period"): And(Use(int)),
+        Optional("alarms"): [
+            {
+                "name": And(Use(str)),
+                "number": And(Use(int)),
+                "periods": And(Use(int)),
+                "points": And(Use(int)),
+                "actions": And(Use(bool)),
+            }
+        ],
+    }
+)
+
+SQS_FIFO_SCHEMA = Schema(
+    {
+        "enabled": And(Use(bool)),
+        Optional("content_based_deduplication"): And(Use(bool)),
+        Optional("high_throughput"): And(Use(bool)),
+    }
+)
+
+SQS_LAMBDA_HANDLER_SCHEMA = Schema({**LAMBDA_BASE_SCHEMA.schema, Optional("event_source"): SQS_EVENT_SOURCE_SCHEMA})
+
+KINESIS_STREAM_SCHEMA = Schema(
+    {
+        "stream_name": And(Use(str)),
+        Optional("shard_count"): And(Use(int)),
+        Optional("retention_period"): And(Use(int)),
+        Optional("capacity_mode"): And(Use(str)),
+        Optional("autoscaling"): {
+            "min_shards": And(Use(int)),
+            "max_shards": And(Use(int)),
+            Optional("target_utilization"): And(Use(float)),
+            Optional("scale_out_cooldown"): And(Use(int)),
+            Optional("scale_in_cooldown"): And(Use(int)),
+        },
+        Optional("throttling_alarm"): {
+            "number": And(Use(int)),
+            "periods": And(Use(int)),
+            "points": And(Use(int)),
+            "actions": And(Use(bool)),
+        },
+    }
+)
+
+STREAM_EVENT_SOURCE_SCHEMA = Schema(
+    {
+        "starting_position": And(Use(str)),
+        "batch_size": And(Use(int)),
+        Optional("max_batching_window"): And(Use(int)),
+        Optional("parallelization_factor"): And(Use(int)),
+        Optional("bisect_batch_on_error"): And(Use(bool)),
+        Optional("max_record_age"): And(Use(int)),
+        Optional("retry_attempts"): And(Use(int)),
+        Optional("enabled"): And(Use(bool)),
+    }
+)
+
+KINESIS_EVENT_SOURCE_SCHEMA = Schema({**STREAM_EVENT_SOURCE_SCHEMA.schema, Optional("enhanced_fan_out"): And(Use(bool))})
+
+DYNAMODB_EVENT_SOURCE_SCHEMA = Schema(
+    {
+        Optional("starting_position"): And(Use(str)),
+        Optional("batch_size"): And(Use(int)),
+        Optional("max_batching_window"): And(Use(int)),
+        Optional("parallelization_factor"): And(Use(int)),
+        Optional("bisect_batch_on_error"): And(Use(bool)),
+        Optional("max_record_age"): And(Use(int)),
+        Optional("retry_attempts"): And(Use(int)),
+        Optional("enabled"): And(Use(bool)),
+        Optional("on_failure"): {"enabled": And(Use(bool)), Optional("destination_arn"): And(Use(str))},
+    }
+)
+
+NESTED_STACK_SHARDING_SCHEMA = Schema(
+    {
+        "enabled": And(Use(bool)),
+        Optional("resources_budget"): And(Use(int)),
     }
 )
 
@@ -37,40 +154,93 @@ AUTHORIZER_LAMBDA_BASE_SCHEMA = Schema(
     }
 )
 
+DYNAMODB_CAPACITY_AUTOSCALING_SCHEMA = Schema(
+    {
+        "min_capacity": And(Use(int)),
+        "max_capacity": And(Use(int)),
+        Optional("target_utilization"): And(Use(float)),
+        Optional("schedules"): [
+            {
+                "name": And(Use(str)),
+                "cron": And(Use(str)),
+                Optional("min_capacity"): And(Use(int)),
+                Optional("max_capacity"): And(Use(int)),
+            }
+        ],
+    }
+)
+
+DYNAMODB_AUTOSCALING_SCHEMA = Schema(
+    {
+        Optional("read"): DYNAMODB_CAPACITY_AUTOSCALING_SCHEMA,
+        Optional("write"): DYNAMODB_CAPACITY_AUTOSCALING_SCHEMA,
+    }
+)
+
+DYNAMODB_DAX_SCHEMA = Schema(
+    {
+        "enabled": And(Use(bool)),
+        "subnet_ids": [And(Use(str))],
+        "security_group_ids": [And(Use(str))],
+        Optional("node_type"): And(Use(str)),
+        Optional("replication_factor"): And(Use(int)),
+        Optional("item_ttl"): And(Use(int)),
+        Optional("query_ttl"): And(Use(int)),
+        Optional("encryption"): And(Use(bool)),
+        Optional("consumers"): [And(Use(str))],
+    }
+)
+
+# Table and index keys, a name for string keys or its name and type ('string', 'number', 'integer' or 'binary')
+DYNAMODB_KEY_SCHEMA = Or(
+    {
+        "name": And(Use(str)),
+        Optional("type"): And(Use(str)),
+    },
+    str,
+)
+
 DYNAMODB_TABLE_SCHEMA = Schema(
     {
         "table_name": And(Use(str)),
-        "partition_key": And(Use(str)),
-        Optional("sort_key"): {
-            "name": And(Use(str)),
-            "type": And(Use(str)),
+        "partition_key": DYNAMODB_KEY_SCHEMA,
+        Optional("sort_key"): DYNAMODB_KEY_SCHEMA,
+        Optional("stream"): {
+            "enabled": And(Use(bool)),
+            Optional("view_type"): And(Use(str)),
+            Optional("function"): LAMBDA_BASE_SCHEMA,
+            Optional("event_source"): DYNAMODB_EVENT_SOURCE_SCHEMA,
         },
-        Optional("stream"): {"enabled": And(Use(bool)), Optional("function"): LAMBDA_BASE_SCHEMA},
         Optional("ttl_attribute"): And(Use(str)),
+        Optional("dax"): DYNAMODB_DAX_SCHEMA,
         Optional("billing_mode"): And(Use(str)),
-        Optional("read_capacity"): And(Use(str)),
-        Optional("write_capacity"): And(Use(str)),
+        Optional("read_capacity"): And(Use(int)),
+        Optional("write_capacity"): And(Use(int)),
+        Optional("autoscaling"): DYNAMODB_AUTOSCALING_SCHEMA,
+        Optional("throttle_alarm"): {
+            "number": And(Use(int)),
+            "periods": And(Use(int)),
+            "points": And(Use(int)),
+            "actions": And(Use(bool)),
+        },
         Optional("global_secondary_indexes"): [
             {
                 "index_name": And(Use(str)),
-                "partition_key": And(Use(str)),
-                Optional("sort_key"): {
-                    "name": And(Use(str)),
-                    "type": And(Use(str)),
-                },
-                Optional("read_capacity"): And(Use(str)),
-                Optional("write_capacity"): And(Use(str)),
+                "partition_key": DYNAMODB_KEY_SCHEMA,
+                Optional("sort_key"): DYNAMODB_KEY_SCHEMA,
+                Optional("projection_type"): And(Use(str)),
+                Optional("non_key_attributes"): [And(Use(str))],
+                Optional("read_capacity"): And(Use(int)),
+                Optional("write_capacity"): And(Use(int)),
+                Optional("autoscaling"): DYNAMODB_AUTOSCALING_SCHEMA,
             }
         ],
         Optional("local_secondary_indexes"): [
             {
                 "index_name": And(Use(str)),
-                "sort_key": {
-                    "name": And(Use(str)),
-                    "type": And(Use(str)),
-                },
-                Optional("read_capacity"): And(Use(str)),
-                Optional("write_capacity"): And(Use(str)),
+                "sort_key": DYNAMODB_KEY_SCHEMA,
+                Optional("projection_type"): And(Use(str)),
+                Optional("non_key_attributes"): [And(Use(str))],
             }
         ],
     }
@@ -1,4 +1,21 @@
-from .constructs import *
 from .scripts import *
 from .settings import *
 from .utils import *
+from . import constructs
+
+__all__ = [name for name in globals() if not name.startswith("_")] + constructs.__all__
+
+
+def __getattr__(name: str):
+    """
+    Delegates the access to Multa CDK Constructs to the lazy registry in 'multacdkrecipies.recipies.constructs'.
+    :param name: Name of the Multa CDK Construct.
+    :return: Multa CDK Construct class.
+    """
+    if name in constructs.__all__:
+        return getattr(constructs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
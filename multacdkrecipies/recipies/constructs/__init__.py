@@ -1,28 +1,62 @@
-from .api_gateway_async_web_service import AwsApiGatewayLambdaPipesAsync
-from .api_gateway_fan_out_web_service import AwsApiGatewayLambdaFanOutBE
-from .api_gateway_robust_web_service import AwsApiGatewayLambdaPipes
-from .cloudwatch_rule_lambda_pipe import AwsCloudwatchLambdaPipes
-from .iot_analytics_data_workflow import AwsIotAnalyticsDataWorkflow
-from .iot_analytics_fan_in import AwsIotAnalyticsFanIn
-from .iot_analytics_fan_out import AwsIotAnalyticsFanOut
-from .iot_analytics_sagemaker_notebook import AwsIoTAnalyticsSageMakerNotebook
-from .iot_analytics_simple_pipeline import AwsIotAnalyticsSimplePipeline
-from .iot_policy import AwsIotPolicy
-from .iot_rule_kinesis_firehose_pipes import AwsIotRulesKinesisFirehosePipes
-from .iot_rule_kinesis_stream_pipes import AwsIotRulesKinesisPipes
-from .iot_rule_lambda_pipes import AwsIotRulesLambdaPipes
-from .iot_rule_sns_pipes import AwsIotRulesSnsPipes
-from .iot_rule_sqs_pipes import AwsIotRulesSqsPipes
-from .lambda_functions_cluster import AwsLambdaFunctionsCluster
-from .lambda_layer_python_virtualenv import AwsLambdaLayerVenv
-from .pipeline_serverless import PipelineServerless
-from .s3_buckets_cluster import AwsS3BucketsCluster
-
-# from .s3_singlepageapp_simple_pipeline import AwsS3SinglePageAppHostingPipeline
-from .s3_lambda_pipe import AwsS3LambdaPipes
-from .s3_singlepageapp_simple_pipeline_hosting import AwsS3SinglePageAppHostingPipeline
-from .sns_lambdas_pipe import AwsSnsPipes
-from .sqs_lambdas_pipe import AwsSqsPipes
-from .ssm_parameter import AwsSsmString
-from .user_pool_groups import AwsUserPoolCognitoGroups
-from .user_serverless_backend import AwsUserServerlessBackend
+import importlib
+
+from multacdkrecipies.common.instrumentation import instrument_construct, instrumentation_enabled
+from multacdkrecipies.recipies.utils.synth_cache import active_synth_cache, cache_construct
+
+# Multa CDK Constructs registry, each construct is imported (together with the AWS CDK modules it uses) only when it is
+# accessed for the first time, so an application only pays the import cost of the constructs it really uses.
+RECIPIES_MODULES = {
+    "AwsApiGatewayLambdaPipesAsync": ".api_gateway_async_web_service",
+    "AwsApiGatewayLambdaFanOutBE": ".api_gateway_fan_out_web_service",
+    "AwsApiGatewayLambdaPipes": ".api_gateway_robust_web_service",
+    "AwsCloudwatchLambdaPipes": ".cloudwatch_rule_lambda_pipe",
+    "AwsIotAnalyticsDataWorkflow": ".iot_analytics_data_workflow",
+    "AwsIotAnalyticsFanIn": ".iot_analytics_fan_in",
+    "AwsIotAnalyticsFanOut": ".iot_analytics_fan_out",
+    "AwsIoTAnalyticsSageMakerNotebook": ".iot_analytics_sagemaker_notebook",
+    "AwsIotAnalyticsSimplePipeline": ".iot_analytics_simple_pipeline",
+    "AwsIotPolicy": ".iot_policy",
+    "AwsIotRulesKinesisFirehosePipes": ".iot_rule_kinesis_firehose_pipes",
+    "AwsIotRulesKinesisPipes": ".iot_rule_kinesis_stream_pipes",
+    "AwsIotRulesLambdaPipes": ".iot_rule_lambda_pipes",
+    "AwsIotRulesSnsPipes": ".iot_rule_sns_pipes",
+    "AwsIotRulesSqsPipes": ".iot_rule_sqs_pipes",
+    "AwsLambdaFunctionsCluster": ".lambda_functions_cluster",
+    "AwsLambdaLayerVenv": ".lambda_layer_python_virtualenv",
+    "PipelineServerless": ".pipeline_serverless",
+    "AwsS3BucketsCluster": ".s3_buckets_cluster",
+    # "AwsS3SinglePageAppHostingPipeline": ".s3_singlepageapp_simple_pipeline",
+    "AwsS3LambdaPipes": ".s3_lambda_pipe",
+    "AwsS3SinglePageAppHostingPipeline": ".s3_singlepageapp_simple_pipeline_hosting",
+    "AwsSnsPipes": ".sns_lambdas_pipe",
+    "AwsSqsPipes": ".sqs_lambdas_pipe",
+    "AwsSsmString": ".ssm_parameter",
+    "AwsUserPoolCognitoGroups": ".user_pool_groups",
+    "AwsUserServerlessBackend": ".user_serverless_backend",
+}
+
+__all__ = list(RECIPIES_MODULES)
+
+
+def __getattr__(name: str):
+    """
+    Imports the module of a Multa CDK Construct the first time the construct is accessed.
+    :param name: Name of the Multa CDK Construct.
+    :return: Multa CDK Construct class.
+    """
+    module_path = RECIPIES_MODULES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    recipe = getattr(importlib.import_module(module_path, package=__name__), name)
+    if active_synth_cache() is not None:
+        recipe = cache_construct(recipe)
+    if instrumentation_enabled():
+        recipe = instrument_construct(recipe)
+    globals()[name] = recipe
+
+    return recipe
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,7 +4,13 @@ from aws_cdk import (
     aws_certificatemanager as cert_manager,
     aws_lambda as lambda_,
 )
-from multacdkrecipies.common import base_bucket, base_alarm, base_lambda_function
+from multacdkrecipies.common import (
+    api_gateway_cache_key_parameters,
+    base_alarm,
+    base_api_gateway_stage_options,
+    base_bucket,
+    base_lambda_function,
+)
 from multacdkrecipies.recipies.utils import APIGATEWAY_FAN_OUT_WEB_SERVICE_SCHEMA, validate_configuration
 
 
@@ -107,19 +113,19 @@ class AwsApiGatewayLambdaFanOutBE(core.Construct):
                 status_code=default_cors_configuration["options_status_code"],
             )
 
-        # Defining STAGE Options
+        # Defining STAGE Options, the resource with caching uses the stage cache cluster
+        method_caches = dict()
+        resource_cache = api_configuration["resource"].get("cache")
+        if resource_cache is not None:
+            method_caches["/" + api_configuration["resource"]["resource_name"]] = resource_cache
+
         default_stage_options = None
         default_stage_configuration = api_configuration["settings"].get("default_stage_options")
         if default_stage_configuration is not None:
-            logging_level = api_gateway.MethodLoggingLevel.ERROR
-            logging_level_configuration = default_stage_configuration["logging_level"]
-            for element in api_gateway.MethodLoggingLevel:
-                if logging_level_configuration in str(element):
-                    logging_level = element
-            default_stage_options = api_gateway.StageOptions(
-                logging_level=logging_level,
-                metrics_enabled=default_stage_configuration["metrics_enabled"],
-            )
+            default_stage_options = base_api_gateway_stage_options(default_stage_configuration, method_caches=method_caches)
+        elif method_caches:
+            print("API Gateway resource caching needs the 'default_stage_options' with a 'cache_cluster'")
+            raise RuntimeError
 
         # Defining Rest API Gateway with Lambda Integration
         self._lambda_rest_api = api_gateway.LambdaRestApi(
@@ -156,14 +162,23 @@ class AwsApiGatewayLambdaFanOutBE(core.Construct):
         # Defining Resource Trees for API Gateway with Custom Integrations
         resource = api_configuration["resource"]
         resource_base = self._lambda_rest_api.root.add_resource(path_part=resource["resource_name"])
+        resource_base_handler = None
         if resource.get("handler") is not None:
             resource_base_handler = base_lambda_function(self, **resource["handler"])
-            resource_integration = api_gateway.LambdaIntegration(handler=resource_base_handler)
-        else:
-            resource_integration = None
 
-        for method in resource.get("methods", list):
-            resource_base.add_method(http_method=method, integration=resource_integration, authorizer=gateway_authorizer)
+        for method in resource.get("methods", list()):
+            cache_key_options = api_gateway_cache_key_parameters(method, resource.get("cache"), authorizer=gateway_authorizer)
+            resource_integration = None
+            if resource_base_handler is not None:
+                resource_integration = api_gateway.LambdaIntegration(
+                    handler=resource_base_handler, cache_key_parameters=cache_key_options["cache_key_parameters"]
+                )
+            resource_base.add_method(
+                http_method=method,
+                integration=resource_integration,
+                authorizer=gateway_authorizer,
+                request_parameters=cache_key_options["request_parameters"],
+            )
 
         # Define FAN-Out Lambda functions
         self._lambda_functions = list()
@@ -6,7 +6,13 @@ from aws_cdk import (
     aws_lambda as lambda_,
 )
 
-from multacdkrecipies.common import base_bucket, base_lambda_function
+from multacdkrecipies.common import (
+    NestedStackShards,
+    api_gateway_cache_key_parameters,
+    base_api_gateway_stage_options,
+    base_bucket,
+    base_lambda_function,
+)
 from multacdkrecipies.recipies.utils import APIGATEWAY_ROBUST_WEB_SERVICE_SCHEMA, validate_configuration
 
 
@@ -117,19 +123,27 @@ class AwsApiGatewayLambdaPipes(core.Construct):
                 status_code=default_cors_configuration["options_status_code"],
             )
 
-        # Defining STAGE Options
+        # Defining STAGE Options, the resources with caching use the stage cache cluster
+        method_caches = dict()
+        for resource_tree in api_configuration.get("resource_trees", list()):
+            resource_path = "/" + resource_tree["resource_name"]
+            method_caches[resource_path] = resource_tree.get("cache")
+            resource_child = resource_tree.get("child")
+            if resource_child is not None:
+                resource_child_path = resource_path + "/" + resource_child["resource_name"]
+                method_caches[resource_child_path] = resource_child.get("cache")
+                for resource_grandchild in resource_child.get("childs", list()):
+                    resource_grandchild_path = resource_child_path + "/" + resource_grandchild["resource_name"]
+                    method_caches[resource_grandchild_path] = resource_grandchild.get("cache")
+        method_caches = {resource_path: cache for resource_path, cache in method_caches.items() if cache is not None}
+
         default_stage_options = None
         default_stage_configuration = api_configuration["settings"].get("default_stage_options")
         if default_stage_configuration is not None:
-            logging_level = api_gateway.MethodLoggingLevel.ERROR
-            logging_level_configuration = default_stage_configuration["logging_level"]
-            for element in api_gateway.MethodLoggingLevel:
-                if logging_level_configuration in str(element):
-                    logging_level = element
-            default_stage_options = api_gateway.StageOptions(
-                logging_level=logging_level,
-                metrics_enabled=default_stage_configuration["metrics_enabled"],
-            )
+            default_stage_options = base_api_gateway_stage_options(default_stage_configuration, method_caches=method_caches)
+        elif method_caches:
+            print("API Gateway resources caching needs the 'default_stage_options' with a 'cache_cluster'")
+            raise RuntimeError
 
         # Defining Rest API Gateway with Lambda Integration
         self._lambda_rest_api = api_gateway.LambdaRestApi(
@@ -163,29 +177,21 @@ class AwsApiGatewayLambdaPipes(core.Construct):
         for method in root_methods:
             self._lambda_rest_api.root.add_method(http_method=method, authorizer=self._gateway_authorizer)
 
-        # Defining Resource Trees for API Gateway with Custom Integrations
+        # Defining Resource Trees for API Gateway with Custom Integrations, the Lambda handlers and their permissions
+        # are defined across Nested Stacks if sharding is enabled
+        self._shards = NestedStackShards.from_configuration(self, self._configuration.get("sharding"))
         resource_trees = api_configuration["resource_trees"]
         for resource_tree in resource_trees:
             resource_base = self._lambda_rest_api.root.add_resource(path_part=resource_tree["resource_name"])
-            resource_base_handler = base_lambda_function(self, **resource_tree["handler"])
-            for method in resource_tree["methods"]:
-                resource_base.add_method(
-                    http_method=method,
-                    integration=api_gateway.LambdaIntegration(handler=resource_base_handler),
-                    authorizer=self._gateway_authorizer,
-                )
+            self._shards.add(self.set_resource_handler, resource=resource_base, resource_definition=resource_tree)
             # resource_base.add_cors_preflight(allow_methods=resource_tree["methods"], allow_origins=["*"])
 
             resource_base_child_definition = resource_tree.get("child")
             if resource_base_child_definition is not None:
                 resource_base_child = resource_base.add_resource(path_part=resource_base_child_definition["resource_name"])
-                resource_base_child_handler = base_lambda_function(self, **resource_base_child_definition["handler"])
-                for method in resource_base_child_definition["methods"]:
-                    resource_base_child.add_method(
-                        http_method=method,
-                        integration=api_gateway.LambdaIntegration(handler=resource_base_child_handler),
-                        authorizer=self._gateway_authorizer,
-                    )
+                self._shards.add(
+                    self.set_resource_handler, resource=resource_base_child, resource_definition=resource_base_child_definition
+                )
                 # resource_base_child.add_cors_preflight(
                 #     allow_methods=resource_base_child_definition["methods"], allow_origins=["*"]
                 # )
@@ -195,17 +201,39 @@ class AwsApiGatewayLambdaPipes(core.Construct):
                     resource_base_grandchild = resource_base_child.add_resource(
                         path_part=resource_base_grandchild_tree["resource_name"]
                     )
-                    resource_base_grandchild_handler = base_lambda_function(self, **resource_base_grandchild_tree["handler"])
-                    for method in resource_base_grandchild_tree["methods"]:
-                        resource_base_grandchild.add_method(
-                            http_method=method,
-                            integration=api_gateway.LambdaIntegration(handler=resource_base_grandchild_handler),
-                            authorizer=self._gateway_authorizer,
-                        )
+                    self._shards.add(
+                        self.set_resource_handler,
+                        resource=resource_base_grandchild,
+                        resource_definition=resource_base_grandchild_tree,
+                    )
                     # resource_base_grandchild.add_cors_preflight(
                     #     allow_methods=resource_base_grandchild_tree["methods"], allow_origins=["*"]
                     # )
 
+    def set_resource_handler(self, construct, resource, resource_definition: dict):
+        """
+        Defines the Lambda handler of an API Gateway resource and integrates it with the resource methods.
+        :param construct: Construct where the Lambda handler is defined, 'self' or one of its Nested Stacks.
+        :param resource: API Gateway resource.
+        :param resource_definition: Configuration of the resource tree element.
+        :return: Lambda handler function.
+        """
+        resource_handler = base_lambda_function(construct, **resource_definition["handler"])
+        for method in resource_definition["methods"]:
+            cache_key_options = api_gateway_cache_key_parameters(
+                method, resource_definition.get("cache"), authorizer=self._gateway_authorizer
+            )
+            resource.add_method(
+                http_method=method,
+                integration=api_gateway.LambdaIntegration(
+                    handler=resource_handler, cache_key_parameters=cache_key_options["cache_key_parameters"]
+                ),
+                authorizer=self._gateway_authorizer,
+                request_parameters=cache_key_options["request_parameters"],
+            )
+
+        return resource_handler
+
     def set_authorizer(self):
         # Define API Gateway Authorizer
         gateway_authorizer = None
@@ -324,3 +352,10 @@ class AwsApiGatewayLambdaPipes(core.Construct):
         :return: Construct API Gateway Default Handler Function.
         """
         return self._handler_function
+
+    @property
+    def nested_stacks(self):
+        """
+        :return: Construct Nested Stacks List, empty if sharding is not enabled.
+        """
+        return self._shards.shards
@@ -3,14 +3,15 @@ from copy import deepcopy
 from aws_cdk import (
     core,
     aws_iot as iot,
-    aws_lambda_event_sources as event_src,
 )
 from multacdkrecipies.common import (
     base_alarm,
     base_iot_rule,
+    base_kinesis_event_source,
     base_lambda_function,
     base_kinesis_role,
     base_kinesis_stream,
+    is_constant_iot_expression,
 )
 from multacdkrecipies.recipies.utils import IOT_KINESIS_CONFIG_SCHEMA, validate_configuration
 
@@ -55,14 +56,27 @@ class AwsIotRulesKinesisPipes(core.Construct):
             self._lambda_functions.append(_lambda_function)
 
             # Defining Function Subscription
-            event_source = event_src.KinesisEventSource(stream=self._kinesis_stream, **setting["event_settings"])
-            _lambda_function.add_event_source(event_source)
-
-        # Defining Topic Rule properties
-        action = iot.CfnTopicRule.KinesisActionProperty(stream_name=self._kinesis_stream.stream_name, role_arn=role.role_arn)
+            base_kinesis_event_source(
+                self,
+                resource_name=setting["lambda_handler"]["lambda_name"],
+                lambda_function=_lambda_function,
+                stream=self._kinesis_stream,
+                **setting["event_settings"],
+            )
+
+        # Defining Topic Rule properties, without partition key IoT uses a random one so the device records lose their order
+        rule_data = self._configuration["iot_rule"]
+        partition_key = rule_data.get("partition_key")
+        if partition_key is not None and is_constant_iot_expression(partition_key) is True:
+            print(
+                f"Warning: partition key {partition_key} of IoT Rule {rule_data['rule_name']} is constant, all the records "
+                f"will be sent to the same shard of the Kinesis Stream"
+            )
+        action = iot.CfnTopicRule.KinesisActionProperty(
+            stream_name=self._kinesis_stream.stream_name, role_arn=role.role_arn, partition_key=partition_key
+        )
         action_property = iot.CfnTopicRule.ActionProperty(kinesis=action)
 
-        rule_data = self._configuration["iot_rule"]
         self._iot_rule = base_iot_rule(self, action_property=action_property, **rule_data)
 
     def set_alarms(self):
@@ -3,9 +3,18 @@ from copy import deepcopy
 from aws_cdk import (
     core,
     aws_iot as iot,
-    aws_lambda_event_sources as lambda_sources,
 )
-from multacdkrecipies.common import base_alarm, base_iot_rule, base_lambda_function, base_queue, base_sqs_role
+from multacdkrecipies.common import (
+    base_alarm,
+    base_dead_letter_queue,
+    base_iot_rule,
+    base_lambda_function,
+    base_queue,
+    base_sqs_event_source,
+    base_sqs_role,
+    queue_consumers_settings,
+)
+from multacdkrecipies.recipies.settings import DEFAULT_SQS_DEAD_LETTER_QUEUE_ALARM
 from multacdkrecipies.recipies.utils import IOT_SQS_CONFIG_SCHEMA, validate_configuration
 
 
@@ -34,9 +43,14 @@ class AwsIotRulesSqsPipes(core.Construct):
         # Validating that the payload passed is correct
         validate_configuration(configuration_schema=IOT_SQS_CONFIG_SCHEMA, configuration_received=self._configuration)
 
-        # Defining SQS Queue
-        queue_data = deepcopy(self._configuration["queue"])
-        self._sqs_queue = base_queue(construct=self, **queue_data)
+        # Defining SQS Queue, its visibility timeout is derived from the Lambda Functions if it is not set
+        queue_data = queue_consumers_settings(self._configuration["lambda_handlers"])
+        queue_data.update(deepcopy(self._configuration["queue"]))
+        dead_letter_queue_data = queue_data.pop("dead_letter_queue", dict())
+        self._dead_letter_queue = None
+        if dead_letter_queue_data.get("enabled") is True:
+            self._dead_letter_queue = base_dead_letter_queue(self, queue_name=queue_data["queue_name"], **dead_letter_queue_data)
+        self._sqs_queue = base_queue(construct=self, dead_letter_queue=self._dead_letter_queue, **queue_data)
 
         # Defining IAM Role
         role = base_sqs_role(self, resource_name=queue_data["queue_name"], principal_resource="iot")
@@ -48,7 +62,7 @@ class AwsIotRulesSqsPipes(core.Construct):
             _lambda_function = base_lambda_function(self, **lambda_function)
             self._lambda_functions.append(_lambda_function)
 
-            _lambda_function.add_event_source(lambda_sources.SqsEventSource(queue=self._sqs_queue, batch_size=10))
+            base_sqs_event_source(_lambda_function, self._sqs_queue, **lambda_function.get("event_source", dict()))
 
         # Defining Topic Rule properties
         action = iot.CfnTopicRule.SqsActionProperty(queue_url=self._sqs_queue.queue_url, role_arn=role.role_arn)
@@ -74,6 +88,19 @@ class AwsIotRulesSqsPipes(core.Construct):
                     )
                 )
 
+        if self._dead_letter_queue is not None:
+            dead_letter_queue_alarms = list()
+            dead_letter_queue_data = self._configuration["queue"]["dead_letter_queue"]
+            for alarm_definition in dead_letter_queue_data.get("alarms", [DEFAULT_SQS_DEAD_LETTER_QUEUE_ALARM]):
+                dead_letter_queue_alarms.append(
+                    base_alarm(
+                        self,
+                        resource_name=self._configuration["queue"]["queue_name"] + "_dlq",
+                        base_resource=self._dead_letter_queue.queue,
+                        **alarm_definition,
+                    )
+                )
+
         for lambda_function_data, lambda_function_definition in zip(
             self._configuration["lambda_handlers"], self._lambda_functions
         ):
@@ -103,6 +130,13 @@ class AwsIotRulesSqsPipes(core.Construct):
         """
         return self._sqs_queue
 
+    @property
+    def dead_letter_queue(self):
+        """
+        :return: Construct SQS Dead Letter Queue, None if it is not enabled.
+        """
+        return self._dead_letter_queue.queue if self._dead_letter_queue is not None else None
+
     @property
     def lambda_functions(self):
         """
@@ -1,5 +1,5 @@
 from aws_cdk import core
-from multacdkrecipies.common import base_alarm, base_lambda_function
+from multacdkrecipies.common import NestedStackShards, base_alarm, base_lambda_function
 from multacdkrecipies.recipies.utils import LAMBDA_FUNCTIONS_CLUSTER_SCHEMA, validate_configuration
 
 
@@ -23,10 +23,11 @@ class AwsLambdaFunctionsCluster(core.Construct):
         # Validating that the payload passed is correct
         validate_configuration(configuration_schema=LAMBDA_FUNCTIONS_CLUSTER_SCHEMA, configuration_received=self._configuration)
 
-        # Define FAN-Out Lambda functions
+        # Define FAN-Out Lambda functions, across Nested Stacks if sharding is enabled
+        self._shards = NestedStackShards.from_configuration(self, self._configuration.get("sharding"))
         self._lambda_functions = list()
         for lambda_function in self._configuration["functions"]:
-            _lambda = base_lambda_function(self, **lambda_function)
+            _lambda = self._shards.add(base_lambda_function, **lambda_function)
             self._lambda_functions.append(_lambda)
 
     def set_alarms(self):
@@ -55,3 +56,10 @@ class AwsLambdaFunctionsCluster(core.Construct):
         :return: Construct Lambda Functions List.
         """
         return self._lambda_functions
+
+    @property
+    def nested_stacks(self):
+        """
+        :return: Construct Nested Stacks List, empty if sharding is not enabled.
+        """
+        return self._shards.shards
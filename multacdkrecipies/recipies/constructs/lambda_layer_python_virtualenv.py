@@ -1,5 +1,4 @@
 import os
-import subprocess
 
 from aws_cdk import core
 from multacdkrecipies.common import base_lambda_layer
@@ -10,7 +9,17 @@ from multacdkrecipies.recipies.settings.lambda_layer_settings import (
     DEFAULT_LAMBDA_LAYER_REQUIREMENTS_PATH_EXISTS,
     DEFAULT_LAMBDA_LAYER_CODE_INSTALL_PATH,
 )
-from multacdkrecipies.recipies.utils import LAMBDA_LAYER_SCHEMA, validate_configuration
+from multacdkrecipies.recipies.settings.lambda_settings import DEFAULT_LAMBDA_ARCHITECTURE, LAMBDA_ARCHITECTURES
+from multacdkrecipies.recipies.utils import (
+    LAMBDA_LAYER_SCHEMA,
+    LambdaLayerBuildScheduler,
+    LayerBuildRequest,
+    is_layer_build_cached,
+    layer_build_command,
+    layer_build_image,
+    layer_build_key,
+    validate_configuration,
+)
 
 
 class AwsLambdaLayerVenv(core.Construct):
@@ -54,27 +63,56 @@ class AwsLambdaLayerVenv(core.Construct):
                 print(f"Lambda Python requirements path for Lambda Layer {self._configuration['layer_name']} is not valid!")
                 raise RuntimeError
 
-        subprocess_command = [
-            "docker",
-            "run",
-            "--rm",
-            "-v",
-            f"{os.environ.get('PWD')}:/foo",
-            "-w",
-            "/foo",
-            "lambci/lambda:build-python3.7",
-            "pip",
-            "install",
-            "-r",
-            requirements_path,
-            "-t",
-            layer_directory_path,
-        ]
-        if self._configuration.get("dependencies", False) is False:
-            subprocess_command.append("--no-dependencies")
-        subprocess.call(subprocess_command)
+        if os.path.isfile(requirements_path) is False:
+            print(f"Lambda Python requirements path for Lambda Layer {self._configuration['layer_name']} is not valid!")
+            raise RuntimeError
+
+        # Requirements with native code only work in functions of the architecture they were built for
+        architecture = self._configuration.get("architecture", DEFAULT_LAMBDA_ARCHITECTURE)
+        if architecture not in LAMBDA_ARCHITECTURES:
+            print(f"Wrong architecture {architecture} specified for Lambda Layer {self._configuration['layer_name']}")
+            raise RuntimeError
 
+        # Installing requirements only if they changed since the last build of the Lambda Layer directory
         self._configuration["layer_code_path"] = layer_code_path
+        self._lambda_layer = None
+        self._build_scheduler = None
+        dependencies = self._configuration.get("dependencies", False)
+        build_image = layer_build_image(
+            self._configuration["layer_name"], runtimes=self._configuration["layer_runtimes"], architecture=architecture
+        )
+        build_key = layer_build_key(
+            requirements_path, runtimes=self._configuration["layer_runtimes"], dependencies=dependencies, image=build_image
+        )
+        if self._configuration.get("build_cache", True) is True and is_layer_build_cached(layer_directory_path, build_key):
+            print(f"Lambda Layer {self._configuration['layer_name']} requirements unchanged, reusing {layer_directory_path}")
+            self._set_lambda_layer()
+        else:
+            # Builds are deferred to the active LambdaLayerBuildScheduler, if there is one, to run them concurrently
+            self._build_scheduler = LambdaLayerBuildScheduler.active() or LambdaLayerBuildScheduler(max_workers=1)
+            self._build_scheduler.schedule(
+                LayerBuildRequest(
+                    layer_name=self._configuration["layer_name"],
+                    build_command=layer_build_command(
+                        requirements_path,
+                        layer_directory_path=layer_directory_path,
+                        dependencies=dependencies,
+                        image=build_image,
+                        architecture=self._configuration.get("architecture"),
+                    ),
+                    layer_directory_path=layer_directory_path,
+                    build_key=build_key,
+                    on_built=self._set_lambda_layer,
+                )
+            )
+            if LambdaLayerBuildScheduler.active() is None:
+                self._build_scheduler.run()
+
+    def _set_lambda_layer(self):
+        """
+        Defines the Lambda Layer once its requirements are installed.
+        :return: None
+        """
         self._lambda_layer = base_lambda_layer(self, **self._configuration)
 
     @property
@@ -89,4 +127,6 @@ class AwsLambdaLayerVenv(core.Construct):
         """
         :return: Construct Lambda Layer.
         """
+        if self._lambda_layer is None and self._build_scheduler is not None:
+            self._build_scheduler.run()
         return self._lambda_layer
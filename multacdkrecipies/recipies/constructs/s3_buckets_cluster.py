@@ -1,7 +1,7 @@
 from aws_cdk import (
     core,
 )
-from multacdkrecipies.common import base_bucket
+from multacdkrecipies.common import NestedStackShards, base_bucket
 from multacdkrecipies.recipies.utils import S3_BUCKETS_CLUSTER_SCHEMA, validate_configuration
 
 
@@ -25,10 +25,11 @@ class AwsS3BucketsCluster(core.Construct):
         # Validating that the payload passed is correct
         validate_configuration(configuration_schema=S3_BUCKETS_CLUSTER_SCHEMA, configuration_received=self._configuration)
 
-        # Define S3 Buckets Cluster
+        # Define S3 Buckets Cluster, across Nested Stacks if sharding is enabled
+        self._shards = NestedStackShards.from_configuration(self, self._configuration.get("sharding"))
         self._s3_buckets = list()
         for bucket in self._configuration["buckets"]:
-            _bucket = base_bucket(self, **bucket)
+            _bucket = self._shards.add(base_bucket, **bucket)
             self._s3_buckets.append(_bucket)
 
     @property
@@ -37,3 +38,10 @@ class AwsS3BucketsCluster(core.Construct):
         :return: Construct S3 Buckets List.
         """
         return self._s3_buckets
+
+    @property
+    def nested_stacks(self):
+        """
+        :return: Construct Nested Stacks List, empty if sharding is not enabled.
+        """
+        return self._shards.shards
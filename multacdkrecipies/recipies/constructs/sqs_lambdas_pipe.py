@@ -1,10 +1,15 @@
 from copy import deepcopy
 
-from aws_cdk import (
-    core,
-    aws_lambda_event_sources as lambda_sources,
+from aws_cdk import core
+from multacdkrecipies.common import (
+    base_alarm,
+    base_dead_letter_queue,
+    base_lambda_function,
+    base_queue,
+    base_sqs_event_source,
+    queue_consumers_settings,
 )
-from multacdkrecipies.common import base_alarm, base_lambda_function, base_queue
+from multacdkrecipies.recipies.settings import DEFAULT_SQS_DEAD_LETTER_QUEUE_ALARM
 from multacdkrecipies.recipies.utils import SQS_CONFIG_SCHEMA, validate_configuration
 
 
@@ -32,9 +37,16 @@ class AwsSqsPipes(core.Construct):
         # Validating that the payload passed is correct
         validate_configuration(configuration_schema=SQS_CONFIG_SCHEMA, configuration_received=self._configuration)
 
-        # Defining SQS Queue
-        queue_data = deepcopy(self._configuration["queue"])
-        self._sqs_queue = base_queue(construct=self, **queue_data)
+        # Defining SQS Queue, its visibility timeout is derived from the Lambda Functions if it is not set
+        queue_data = queue_consumers_settings(self._configuration["lambda_handlers"])
+        queue_data.update(deepcopy(self._configuration["queue"]))
+        dead_letter_queue_data = queue_data.pop("dead_letter_queue", dict())
+        self._dead_letter_queue = None
+        if dead_letter_queue_data.get("enabled") is True:
+            self._dead_letter_queue = base_dead_letter_queue(
+                self, queue_name=queue_data["queue_name"], fifo=queue_data.get("fifo", dict()), **dead_letter_queue_data
+            )
+        self._sqs_queue = base_queue(construct=self, dead_letter_queue=self._dead_letter_queue, **queue_data)
 
         # Validating Lambda Function Runtime
         functions_data = self._configuration["lambda_handlers"]
@@ -43,7 +55,7 @@ class AwsSqsPipes(core.Construct):
             _lambda_function = base_lambda_function(self, **lambda_function)
             self._lambda_functions.append(_lambda_function)
 
-            _lambda_function.add_event_source(lambda_sources.SqsEventSource(queue=self._sqs_queue, batch_size=10))
+            base_sqs_event_source(_lambda_function, self._sqs_queue, **lambda_function.get("event_source", dict()))
 
     def set_alarms(self):
         """
@@ -62,6 +74,19 @@ class AwsSqsPipes(core.Construct):
                     )
                 )
 
+        if self._dead_letter_queue is not None:
+            dead_letter_queue_alarms = list()
+            dead_letter_queue_data = self._configuration["queue"]["dead_letter_queue"]
+            for alarm_definition in dead_letter_queue_data.get("alarms", [DEFAULT_SQS_DEAD_LETTER_QUEUE_ALARM]):
+                dead_letter_queue_alarms.append(
+                    base_alarm(
+                        self,
+                        resource_name=self._configuration["queue"]["queue_name"] + "_dlq",
+                        base_resource=self._dead_letter_queue.queue,
+                        **alarm_definition,
+                    )
+                )
+
         for lambda_function_data, lambda_function_definition in zip(
             self._configuration["lambda_handlers"], self._lambda_functions
         ):
@@ -91,6 +116,13 @@ class AwsSqsPipes(core.Construct):
         """
         return self._sqs_queue
 
+    @property
+    def dead_letter_queue(self):
+        """
+        :return: Construct SQS Dead Letter Queue, None if it is not enabled.
+        """
+        return self._dead_letter_queue.queue if self._dead_letter_queue is not None else None
+
     @property
     def lambda_functions(self) -> list:
         """
@@ -1,16 +1,21 @@
+from copy import deepcopy
+
 from aws_cdk import (
     core,
     aws_lambda as lambda_,
-    aws_lambda_event_sources as event_sources,
 )
 from multacdkrecipies.common import (
     base_bucket,
     base_cognito_user_pool,
     base_cognito_user_identity_pool,
+    base_dax_cluster,
+    base_dax_cluster_consumer,
+    base_dynamodb_event_source,
     base_dynamodb_table,
     base_lambda_function,
 )
 
+from multacdkrecipies.recipies.settings import DAX_CONSUMERS
 from multacdkrecipies.recipies.utils import USER_SERVERLESS_BACKEND_SCHEMA, validate_configuration
 
 
@@ -53,20 +58,39 @@ class AwsUserServerlessBackend(core.Construct):
 
         # Define DynamoDB Tables
         self._dynamodb_tables_lambda_functions = list()
-        for table in self._configuration.get("dynamo_tables", []):
-            table, stream = base_dynamodb_table(self, **table)
+        for table_data in self._configuration.get("dynamo_tables", []):
+            table, stream = base_dynamodb_table(self, **deepcopy(table_data))
+
+            # Define DAX Cluster, the Lambda Functions of the table listed in its 'consumers' read and write through it
+            dax_data = table_data.get("dax", dict())
+            dax_cluster = None
+            if dax_data.get("enabled") is True:
+                dax_cluster = base_dax_cluster(self, table=table, table_name=table_data["table_name"], **dax_data)
+            dax_consumers = dax_data.get("consumers", list()) if dax_cluster is not None else list()
+            for consumer in dax_consumers:
+                if consumer not in DAX_CONSUMERS:
+                    print(f"Wrong DAX consumer {consumer} for DynamoDB Table {table_data['table_name']}, use {DAX_CONSUMERS}")
+                    raise RuntimeError
+
             stream_lambda = None
-            if stream is True and table["stream"].get("function") is not None:
-                stream_lambda = base_lambda_function(self, **table["stream"]["function"])
+            stream_data = table_data.get("stream", dict())
+            if stream is True and stream_data.get("function") is not None:
+                stream_lambda = base_lambda_function(self, **stream_data["function"])
 
                 # Add DynamoDB Stream Trigger to Lambda Function
-                stream_lambda.add_event_source(
-                    source=event_sources.DynamoEventSource(
-                        table=table, starting_position=lambda_.StartingPosition.TRIM_HORIZON, batch_size=1
-                    )
+                base_dynamodb_event_source(
+                    self,
+                    resource_name=stream_data["function"]["lambda_name"],
+                    lambda_function=stream_lambda,
+                    table=table,
+                    **stream_data.get("event_source", dict()),
                 )
+                if "stream" in dax_consumers:
+                    base_dax_cluster_consumer(stream_lambda, dax_cluster, **dax_data)
 
-            self._dynamodb_tables_lambda_functions.append({"table": table, "stream_lambda": stream_lambda})
+            self._dynamodb_tables_lambda_functions.append(
+                {"table": table, "stream_lambda": stream_lambda, "dax_cluster": dax_cluster}
+            )
 
         # Define S3 Buckets Cluster
         if isinstance(self._configuration.get("buckets"), list):
@@ -101,7 +125,7 @@ class AwsUserServerlessBackend(core.Construct):
     @property
     def dynamodb_tables_lambda_functions(self):
         """
-        :return: List of dictionaries containing construct DynamoDB Tables and Stream Lambda functions.
+        :return: List of dictionaries containing construct DynamoDB Tables, Stream Lambda functions and DAX Clusters.
         """
         return self._dynamodb_tables_lambda_functions
 
@@ -1,3 +1,12 @@
+from .apigateway_settings import *
+from .dax_settings import *
+from .dynamodb_settings import *
+from .firehose_settings import *
+from .iam_settings import *
 from .iot_analytics_settings import *
+from .kinesis_settings import *
 from .lambda_settings import *
 from .lambda_layer_settings import *
+from .nested_stack_settings import *
+from .sqs_settings import *
+from .synth_cache_settings import *
@@ -0,0 +1,14 @@
+# Sizes (GB) of the API Gateway stage cache cluster, billed per hour while the cluster is enabled
+APIGATEWAY_CACHE_CLUSTER_SIZES = ("0.5", "1.6", "6.1", "13.5", "28.4", "58.2", "118", "237")
+DEFAULT_APIGATEWAY_CACHE_CLUSTER_SIZE = "0.5"
+
+# Time to live, in seconds, of the cached method responses. API Gateway allows up to one hour
+DEFAULT_APIGATEWAY_CACHE_TTL = 300
+APIGATEWAY_CACHE_MAX_TTL = 3600
+
+# Methods cached by default on a resource with caching, other methods keep invoking the integration
+DEFAULT_APIGATEWAY_CACHED_METHODS = ("GET",)
+APIGATEWAY_CACHE_KEY_PARAMETER_SOURCES = ("path", "querystring", "header")
+
+# Identity source of the Token and Cognito authorizers, added to the cache key of the authorized methods
+APIGATEWAY_AUTHORIZER_IDENTITY_SOURCE = "method.request.header.Authorization"
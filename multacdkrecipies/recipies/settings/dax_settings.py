@@ -0,0 +1,16 @@
+# DynamoDB Accelerator clusters, a node per Availability Zone. The names allow up to 20 lowercase letters, digits and hyphens
+DEFAULT_DAX_NODE_TYPE = "dax.t3.small"
+DEFAULT_DAX_REPLICATION_FACTOR = 3
+DAX_MAX_REPLICATION_FACTOR = 10
+DAX_CLUSTER_NAME_MAX_LENGTH = 20
+
+# Time to live, in seconds, of the items (GetItem and BatchGetItem) and of the queries (Query and Scan) cached by DAX
+DEFAULT_DAX_ITEM_TTL = 300
+DEFAULT_DAX_QUERY_TTL = 300
+
+# Environment variable with the cluster discovery endpoint, set in the Lambda Functions that use the table
+DAX_ENDPOINT_ENVIRONMENT_VARIABLE = "DAX_ENDPOINT"
+
+# Functions of the table that can be wired to the cluster with the 'consumers' of its configuration. Consumers are moved
+# to the cluster subnets, so they only reach the internet and other AWS services through a NAT Gateway or VPC Endpoints
+DAX_CONSUMERS = ("stream",)
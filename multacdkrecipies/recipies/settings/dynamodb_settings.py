@@ -0,0 +1,17 @@
+# Provisioned capacity of the tables and global secondary indexes when it is not configured
+DEFAULT_DYNAMODB_READ_CAPACITY = 5
+DEFAULT_DYNAMODB_WRITE_CAPACITY = 5
+
+# Attributes projected into the secondary indexes when it is not configured, every index write copies them
+DEFAULT_DYNAMODB_INDEX_PROJECTION = "ALL"
+
+# Target tracking of the consumed capacity, Application Auto Scaling accepts a target between 10 and 90 percent
+DEFAULT_DYNAMODB_AUTOSCALING_TARGET_UTILIZATION = 70
+
+# Alarm on the read and write throttled requests, created for every table and global secondary index
+DEFAULT_DYNAMODB_THROTTLE_ALARM = {"number": 1, "periods": 1, "points": 1, "actions": True}
+
+# DynamoDB Stream record contents and consumers, batches of 100 records (up to 1000) are read from the oldest record of each shard
+DEFAULT_DYNAMODB_STREAM_VIEW_TYPE = "NEW_AND_OLD_IMAGES"
+DYNAMODB_EVENT_SOURCE_MAX_BATCH_SIZE = 1000
+DEFAULT_DYNAMODB_EVENT_SOURCE = {"starting_position": "TRIM_HORIZON", "batch_size": 100}
@@ -0,0 +1,26 @@
+# Kinesis Firehose S3 destinations compression formats, converted records are compressed by their serializer instead
+FIREHOSE_COMPRESSION_FORMATS = ("UNCOMPRESSED", "GZIP", "ZIP", "Snappy", "HADOOP_SNAPPY")
+DEFAULT_FIREHOSE_COMPRESSION_FORMAT = "UNCOMPRESSED"
+
+# Firehose buffers up to 128 MB or 900 seconds before delivering, record format conversion and dynamic partitioning
+# need a buffer of at least 64 MB
+DEFAULT_FIREHOSE_BUFFERING_SIZE = 5
+DEFAULT_FIREHOSE_BUFFERING_INTERVAL = 300
+FIREHOSE_MAX_BUFFERING_SIZE = 128
+FIREHOSE_MIN_BUFFERING_INTERVAL = 60
+FIREHOSE_MAX_BUFFERING_INTERVAL = 900
+FIREHOSE_CONVERSION_MIN_BUFFERING_SIZE = 64
+
+# Record format conversion output formats and the compression codecs of their serializers
+FIREHOSE_OUTPUT_FORMATS_COMPRESSIONS = {
+    "PARQUET": ("UNCOMPRESSED", "GZIP", "SNAPPY"),
+    "ORC": ("NONE", "ZLIB", "SNAPPY"),
+}
+DEFAULT_FIREHOSE_OUTPUT_FORMAT = "PARQUET"
+DEFAULT_FIREHOSE_OUTPUT_COMPRESSION = "SNAPPY"
+
+DEFAULT_FIREHOSE_ERROR_OUTPUT_PREFIX = "errors/!{firehose:error-output-type}/!{timestamp:yyyy/MM/dd}/"
+DEFAULT_FIREHOSE_DYNAMIC_PARTITIONING_RETRY_DURATION = 300
+
+# Record separators allowed by the AWS IoT Rules Firehose action
+FIREHOSE_IOT_SEPARATORS = ("\n", "\t", "\r\n", ",")
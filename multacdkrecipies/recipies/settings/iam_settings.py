@@ -0,0 +1,4 @@
+import os
+
+# Reuse IAM Managed Policies with the same actions and resources across the roles of the constructs of a Stack
+DEFAULT_IAM_SHARED_ROLES = os.environ.get("MULTA_IAM_SHARED_ROLES", "false").lower() == "true"
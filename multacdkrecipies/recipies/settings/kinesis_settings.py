@@ -0,0 +1,21 @@
+# Lambda reads Kinesis and DynamoDB streams from the oldest record or the latest, per shard up to 10 batches concurrently
+STREAM_EVENT_SOURCE_STARTING_POSITIONS = ("TRIM_HORIZON", "LATEST")
+STREAM_EVENT_SOURCE_MAX_BATCH_SIZE = 10000
+STREAM_EVENT_SOURCE_MAX_BATCHING_WINDOW = 300
+STREAM_EVENT_SOURCE_MAX_PARALLELIZATION_FACTOR = 10
+STREAM_EVENT_SOURCE_MIN_RECORD_AGE = 60
+STREAM_EVENT_SOURCE_MAX_RECORD_AGE = 604800
+
+# Kinesis Data Streams capacity modes, on-demand streams scale their shards automatically
+KINESIS_STREAM_CAPACITY_MODES = ("PROVISIONED", "ON_DEMAND")
+DEFAULT_KINESIS_STREAM_CAPACITY_MODE = "PROVISIONED"
+
+# Shard autoscaling of provisioned streams, the utilization is the highest of the incoming bytes (1 MB/s per shard) and
+# incoming records (1000 records/s per shard) limits. UpdateShardCount can at most double or halve the shards per call.
+DEFAULT_KINESIS_AUTOSCALING_TARGET_UTILIZATION = 0.7
+DEFAULT_KINESIS_AUTOSCALING_SCALE_OUT_COOLDOWN = 300
+DEFAULT_KINESIS_AUTOSCALING_SCALE_IN_COOLDOWN = 3600
+DEFAULT_KINESIS_AUTOSCALING_PERIOD = 60
+
+# Alarm on the records rejected by the stream, created for every stream
+DEFAULT_KINESIS_THROTTLING_ALARM = {"number": 1, "periods": 1, "points": 1, "actions": True}
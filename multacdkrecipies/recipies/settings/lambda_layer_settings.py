@@ -18,3 +18,12 @@ if os.path.isfile(DEFAULT_LAMBDA_LAYER_REQUIREMENTS_PATH) is True:
     DEFAULT_LAMBDA_LAYER_REQUIREMENTS_PATH_EXISTS = True
 else:
     DEFAULT_LAMBDA_LAYER_REQUIREMENTS_PATH_EXISTS = False
+
+DEFAULT_LAMBDA_LAYER_BUILD_IMAGE = "lambci/lambda:build-python3.7"
+# Build images by Lambda architecture, formatted with the name of the Lambda Layer runtime (e.g. python3.8). arm64 Lambda
+# Layers are built in an arm64 container (emulated on x86_64 hosts)
+DEFAULT_LAMBDA_LAYER_BUILD_IMAGES = {
+    "x86_64": "lambci/lambda:build-{runtime}",
+    "arm64": "public.ecr.aws/sam/build-{runtime}:latest-arm64",
+}
+DEFAULT_LAMBDA_LAYER_BUILD_CACHE_PATH = os.environ.get("MULTA_LAMBDA_LAYER_BUILD_CACHE_PATH", "./etc/layer_cache/")
@@ -6,3 +6,24 @@ if os.path.isdir(DEFAULT_LAMBDA_CODE_PATH) is True:
     DEFAULT_LAMBDA_CODE_PATH_EXISTS = True
 else:
     DEFAULT_LAMBDA_CODE_PATH_EXISTS = False
+
+LAMBDA_ARCHITECTURES = ("x86_64", "arm64")
+DEFAULT_LAMBDA_ARCHITECTURE = "x86_64"
+# Runtimes of this CDK version that AWS Lambda does not support in the arm64 architecture
+LAMBDA_ARM64_UNSUPPORTED_RUNTIMES = (
+    "DOTNET_CORE_1",
+    "DOTNET_CORE_2",
+    "DOTNET_CORE_2_1",
+    "GO_1_X",
+    "JAVA_8",
+    "NODEJS",
+    "NODEJS_4_3",
+    "NODEJS_6_10",
+    "NODEJS_8_10",
+    "NODEJS_10_X",
+    "PROVIDED",
+    "PYTHON_2_7",
+    "PYTHON_3_6",
+    "PYTHON_3_7",
+    "RUBY_2_5",
+)
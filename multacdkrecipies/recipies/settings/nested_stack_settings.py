@@ -0,0 +1,3 @@
+# CloudFormation limits a template to 500 resources, the default budget keeps room for the resources CDK adds to each
+# nested stack (assets parameters, cross-stack references outputs, etc.)
+DEFAULT_NESTED_STACK_RESOURCES_BUDGET = 400
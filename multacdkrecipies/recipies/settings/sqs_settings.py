@@ -0,0 +1,24 @@
+# Lambda polls up to 10 messages per batch from SQS, larger batches (up to 10000) need a batching window
+DEFAULT_SQS_EVENT_SOURCE_BATCH_SIZE = 10
+SQS_EVENT_SOURCE_MAX_BATCH_SIZE = 10000
+SQS_EVENT_SOURCE_MAX_BATCHING_WINDOW = 300
+
+# AWS recommends a queue visibility timeout of at least 6 times the timeout of the functions consuming it, so messages
+# are not visible again while Lambda retries throttled invocations. Lambda default timeout is 3 seconds.
+SQS_VISIBILITY_TIMEOUT_FACTOR = 6
+DEFAULT_SQS_LAMBDA_TIMEOUT = 3
+
+# Maximum long polling wait time of SQS, reduces the empty receives of consumers that don't set their own wait time
+DEFAULT_SQS_RECEIVE_WAIT_TIME = 20
+
+# Dead letter queues keep the failed messages for the SQS maximum retention period, so they can be inspected and
+# redriven. The alarm fires as soon as a message lands in the dead letter queue if no other alarms are configured.
+DEFAULT_SQS_DEAD_LETTER_QUEUE_RETENTION_PERIOD = 1209600
+SQS_MAX_RECEIVE_COUNT = 1000
+DEFAULT_SQS_DEAD_LETTER_QUEUE_ALARM = {
+    "name": "ApproximateNumberOfMessagesVisible",
+    "number": 1,
+    "periods": 1,
+    "points": 1,
+    "actions": True,
+}
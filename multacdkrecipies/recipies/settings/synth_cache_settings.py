@@ -0,0 +1,4 @@
+import os
+
+DEFAULT_SYNTH_CACHE_ENABLED = os.environ.get("MULTA_SYNTH_CACHE", "false").lower() == "true"
+DEFAULT_SYNTH_CACHE_PATH = os.environ.get("MULTA_SYNTH_CACHE_PATH", "./etc/synth_cache/")
@@ -1,2 +1,4 @@
 from .common_functions import *
+from .lambda_layer_builds import *
+from .synth_cache import *
 from .validations import *
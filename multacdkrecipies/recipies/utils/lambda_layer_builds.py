@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+from multacdkrecipies.recipies.settings.lambda_layer_settings import (
+    DEFAULT_LAMBDA_LAYER_BUILD_CACHE_PATH,
+    DEFAULT_LAMBDA_LAYER_BUILD_IMAGE,
+    DEFAULT_LAMBDA_LAYER_BUILD_IMAGES,
+)
+from multacdkrecipies.recipies.settings.lambda_settings import DEFAULT_LAMBDA_ARCHITECTURE, LAMBDA_ARM64_UNSUPPORTED_RUNTIMES
+
+__all__ = [
+    "LambdaLayerBuildScheduler",
+    "LayerBuildRequest",
+    "is_layer_build_cached",
+    "layer_build_command",
+    "layer_build_image",
+    "layer_build_key",
+    "layer_build_manifest_path",
+    "save_layer_build",
+]
+
+
+def layer_build_image(layer_name: str, runtimes: list, architecture: str = DEFAULT_LAMBDA_ARCHITECTURE) -> str:
+    """
+    Selects the Docker image that installs the Lambda Layer requirements. Wheels with native code are built for a Python
+    version, so the image is the one of the first Lambda Layer runtime.
+    :param layer_name: Name of the Lambda Layer, used in the error messages.
+    :param runtimes: Lambda Layer compatible runtimes, e.g. ['PYTHON_3_8'].
+    :param architecture: Lambda architecture of the Lambda Layer, 'x86_64' or 'arm64'.
+    :return: Docker image of DEFAULT_LAMBDA_LAYER_BUILD_IMAGES for the runtime and architecture.
+    """
+    # Imported here so importing the package does not load the AWS CDK modules
+    from aws_cdk import aws_lambda as lambda_
+
+    runtime = getattr(lambda_.Runtime, runtimes[0], None) if runtimes else None
+    if runtime is None or runtime.family != lambda_.RuntimeFamily.PYTHON:
+        print(f"Lambda Layer {layer_name} requirements need a Python runtime, got {runtimes}")
+        raise RuntimeError
+    if architecture == "arm64" and runtimes[0] in LAMBDA_ARM64_UNSUPPORTED_RUNTIMES:
+        print(f"Runtime {runtimes[0]} of Lambda Layer {layer_name} is not supported in arm64")
+        raise RuntimeError
+
+    return DEFAULT_LAMBDA_LAYER_BUILD_IMAGES[architecture].format(runtime=runtime.name)
+
+
+def layer_build_key(requirements_path: str, runtimes: list, dependencies: bool, image: str = DEFAULT_LAMBDA_LAYER_BUILD_IMAGE):
+    """
+    Generates the key that identifies a Lambda Layer build.
+    :param requirements_path: Path to the Python requirements file installed in the Lambda Layer.
+    :param runtimes: Lambda Layer compatible runtimes.
+    :param dependencies: If the requirements dependencies are installed or not.
+    :param image: Docker image used to install the requirements.
+    :return: Hexadecimal hash of the requirements file content, runtimes, dependencies flag and build image.
+    """
+    build_key = hashlib.sha256()
+    with open(requirements_path, "rb") as requirements_file:
+        build_key.update(requirements_file.read())
+    build_key.update(json.dumps([sorted(runtimes), bool(dependencies), image]).encode())
+
+    return build_key.hexdigest()
+
+
+def layer_build_manifest_path(layer_directory_path: str) -> str:
+    """
+    :param layer_directory_path: Path where the Lambda Layer requirements are installed.
+    :return: Path to the build manifest of the Lambda Layer directory in the build cache.
+    """
+    directory_hash = hashlib.sha256(os.path.realpath(layer_directory_path).encode()).hexdigest()
+    return os.path.join(DEFAULT_LAMBDA_LAYER_BUILD_CACHE_PATH, f"{directory_hash}.json")
+
+
+def is_layer_build_cached(layer_directory_path: str, build_key: str) -> bool:
+    """
+    Validates if the Lambda Layer directory already contains a build with the same key.
+    :param layer_directory_path: Path where the Lambda Layer requirements are installed.
+    :param build_key: Key of the Lambda Layer build, see 'layer_build_key'.
+    :return: True or False depending if the installed requirements can be reused or not.
+    """
+    if os.path.isdir(layer_directory_path) is False or not os.listdir(layer_directory_path):
+        return False
+
+    try:
+        with open(layer_build_manifest_path(layer_directory_path)) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        return False
+
+    return manifest.get("build_key") == build_key
+
+
+def save_layer_build(layer_directory_path: str, build_key: str):
+    """
+    Saves the key of a successful Lambda Layer build in the build cache.
+    :param layer_directory_path: Path where the Lambda Layer requirements are installed.
+    :param build_key: Key of the Lambda Layer build, see 'layer_build_key'.
+    """
+    os.makedirs(DEFAULT_LAMBDA_LAYER_BUILD_CACHE_PATH, exist_ok=True)
+    with open(layer_build_manifest_path(layer_directory_path), "w") as manifest_file:
+        json.dump({"build_key": build_key, "layer_directory_path": layer_directory_path}, manifest_file)
+
+
+def layer_build_command(
+    requirements_path: str,
+    layer_directory_path: str,
+    dependencies: bool,
+    image: str = DEFAULT_LAMBDA_LAYER_BUILD_IMAGE,
+    architecture: str = None,
+) -> list:
+    """
+    Generates the Docker command that installs the Lambda Layer requirements. The pip cache of the build cache is mounted
+    in the container so wheels are downloaded and built only once between builds.
+    :param requirements_path: Path to the Python requirements file installed in the Lambda Layer.
+    :param layer_directory_path: Path where the Lambda Layer requirements are installed.
+    :param dependencies: If the requirements dependencies are installed or not.
+    :param image: Docker image used to install the requirements.
+    :param architecture: Lambda architecture of the Lambda Layer, 'x86_64' or 'arm64'. Sets the container platform.
+    :return: Docker command as a list of arguments.
+    """
+    pip_cache_path = os.path.abspath(os.path.join(DEFAULT_LAMBDA_LAYER_BUILD_CACHE_PATH, "pip", architecture or ""))
+    os.makedirs(pip_cache_path, exist_ok=True)
+
+    build_command = [
+        "docker",
+        "run",
+        "--rm",
+    ]
+    if architecture is not None:
+        build_command.extend(["--platform", "linux/arm64" if architecture == "arm64" else "linux/amd64"])
+    build_command += [
+        "-v",
+        f"{os.environ.get('PWD')}:/foo",
+        "-v",
+        f"{pip_cache_path}:/pip-cache",
+        "-w",
+        "/foo",
+        image,
+        "pip",
+        "install",
+        "--cache-dir",
+        "/pip-cache",
+        "-r",
+        requirements_path,
+        "-t",
+        layer_directory_path,
+    ]
+    if dependencies is False:
+        build_command.append("--no-dependencies")
+
+    return build_command
+
+
+LayerBuildRequest = namedtuple(
+    "LayerBuildRequest", ["layer_name", "build_command", "layer_directory_path", "build_key", "on_built"]
+)
+
+
+class LambdaLayerBuildScheduler:
+    """
+    Collects the Lambda Layer builds requested by AwsLambdaLayerVenv constructs and runs them concurrently in a bounded
+    worker pool, so the total build time is close to the slowest Lambda Layer instead of the sum of all of them. When a
+    build fails the pending builds are cancelled, the running ones are terminated and the error is raised. Builds into
+    the same Lambda Layer directory run only once and need the same build key.
+
+    Builds are collected while the scheduler is active (used as a context manager) and executed when the context exits
+    or when the Lambda Layer of a scheduled construct is accessed, whatever happens first. The Lambda Layers are
+    created in the order they were scheduled once every build succeeded, so the assets are staged after the builds.
+    """
+
+    _active = list()
+
+    def __init__(self, max_workers: int = None):
+        """
+        :param max_workers: Maximum number of concurrent builds. Defaults to the number of CPUs, up to 4.
+        """
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._pending = list()
+        self._processes = dict()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._build_times = dict()
+        self._directory_locks = dict()
+        self._built = set()
+
+    def __enter__(self):
+        LambdaLayerBuildScheduler._active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        LambdaLayerBuildScheduler._active.remove(self)
+        if exc_type is None:
+            self.run()
+
+    @classmethod
+    def active(cls):
+        """
+        :return: Scheduler of the innermost active context or None.
+        """
+        return cls._active[-1] if cls._active else None
+
+    def schedule(self, request: LayerBuildRequest):
+        """
+        Adds a Lambda Layer build to the scheduler. Builds with different requirements into the same directory are
+        rejected, as the last one would overwrite the Lambda Layer of the others.
+        :param request: Lambda Layer build request.
+        """
+        layer_directory_path = os.path.realpath(request.layer_directory_path)
+        for pending_request in self._pending:
+            if (
+                os.path.realpath(pending_request.layer_directory_path) == layer_directory_path
+                and pending_request.build_key != request.build_key
+            ):
+                print(
+                    f"Lambda Layers {pending_request.layer_name} and {request.layer_name} install different requirements "
+                    f"in the same directory {request.layer_directory_path}, set their 'paths'"
+                )
+                raise RuntimeError
+        self._pending.append(request)
+
+    def run(self):
+        """
+        Executes the pending Lambda Layer builds and then the 'on_built' callbacks of every request.
+        """
+        pending, self._pending = self._pending, list()
+        if not pending:
+            return
+
+        self._cancelled.clear()
+        for request in pending:
+            self._directory_locks.setdefault(os.path.realpath(request.layer_directory_path), threading.Lock())
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [executor.submit(self._build, request) for request in pending]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            errors = [future.exception() for future in done if future.exception() is not None]
+            if errors:
+                self._cancelled.set()
+                for future in not_done:
+                    future.cancel()
+                with self._lock:
+                    for process in self._processes.values():
+                        process.terminate()
+                raise errors[0]
+
+        print(f"Lambda Layers built in {time.perf_counter() - start:.2f}s ({len(pending)} builds, {self._max_workers} workers)")
+        for request in pending:
+            request.on_built()
+
+    def _build(self, request: LayerBuildRequest):
+        """
+        Installs the requirements of a Lambda Layer, executed by the worker pool. pip and the build cache manifest can't be
+        shared by concurrent builds, so it waits for the builds into the same directory.
+        :param request: Lambda Layer build request.
+        """
+        layer_directory_path = os.path.realpath(request.layer_directory_path)
+        with self._directory_locks[layer_directory_path]:
+            if (layer_directory_path, request.build_key) in self._built:
+                print(f"Lambda Layer {request.layer_name} requirements already installed in {request.layer_directory_path}")
+                return
+            self._install(request)
+
+    def _install(self, request: LayerBuildRequest):
+        """
+        Runs the build command of a Lambda Layer.
+        :param request: Lambda Layer build request.
+        """
+        if self._cancelled.is_set():
+            return
+
+        start = time.perf_counter()
+        with self._lock:
+            # The scheduler may have been cancelled while waiting for the lock, its processes are already terminated
+            if self._cancelled.is_set():
+                return
+            process = subprocess.Popen(request.build_command)
+            self._processes[request.layer_name] = process
+        return_code = process.wait()
+        with self._lock:
+            self._processes.pop(request.layer_name, None)
+
+        if return_code != 0:
+            print(f"Installation of requirements for Lambda Layer {request.layer_name} failed!")
+            raise RuntimeError(f"Lambda Layer {request.layer_name} build failed with exit code {return_code}")
+
+        save_layer_build(request.layer_directory_path, request.build_key)
+        self._built.add((os.path.realpath(request.layer_directory_path), request.build_key))
+        self._build_times[request.layer_name] = time.perf_counter() - start
+        print(f"Lambda Layer {request.layer_name} built in {self._build_times[request.layer_name]:.2f}s")
+
+    @property
+    def build_times(self) -> dict:
+        """
+        :return: Build time in seconds of every Lambda Layer built by the scheduler.
+        """
+        return dict(self._build_times)
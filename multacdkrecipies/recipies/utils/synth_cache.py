@@ -0,0 +1,321 @@
+import atexit
+import fnmatch
+import functools
+import glob
+import hashlib
+import json
+import os
+import threading
+
+from multacdkrecipies.recipies.settings.synth_cache_settings import DEFAULT_SYNTH_CACHE_ENABLED, DEFAULT_SYNTH_CACHE_PATH
+
+__all__ = [
+    "SynthCache",
+    "active_synth_cache",
+    "cache_construct",
+    "enable_synth_cache",
+    "is_construct_unchanged",
+    "print_synth_cache_summary",
+    "schemas_fingerprint",
+]
+
+_synth_cache_state = threading.local()
+_synth_cache = None
+
+
+class SynthCache:
+    """
+    On disk cache of the Multa CDK Constructs of an App between synthesis. Each construct gets a fingerprint of its
+    prefix, environment, configuration, the code paths it references and the schemas of the library; constructs with the
+    same fingerprint as in the previous synthesis skip the configuration validation, and Lambda code paths that did not
+    change reuse their asset hash instead of reading every file again. After the synthesis the resources of each construct are saved as a
+    fragment, so the constructs that really changed can be reported.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_SYNTH_CACHE_PATH):
+        """
+        :param cache_path: Directory of the cache manifest and the synthesized fragments.
+        """
+        self._cache_path = cache_path
+        try:
+            with open(self.manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            manifest = dict()
+
+        self._previous_constructs = manifest.get("constructs", dict())
+        self._previous_assets = manifest.get("assets", dict())
+        self._constructs = dict()
+        self._assets = dict()
+        self._outdirs = set()
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        """
+        :return: Path to the cache manifest.
+        """
+        return os.path.join(self._cache_path, "manifest.json")
+
+    def fragment_path(self, construct_path: str) -> str:
+        """
+        :param construct_path: Path of the construct in the CDK App.
+        :return: Path to the synthesized fragment of the construct.
+        """
+        path_hash = hashlib.sha256(construct_path.encode()).hexdigest()
+        return os.path.join(self._cache_path, "fragments", f"{path_hash}.json")
+
+    @staticmethod
+    def construct_fingerprint(prefix: str, environment: str, configuration) -> str:
+        """
+        Generates the fingerprint of a construct, the code paths of the configuration are fingerprinted by content. The
+        schemas fingerprint is included, so the configurations are validated again when an upgrade changes the schemas.
+        :param prefix: Prefix of the construct.
+        :param environment: Environment of the construct.
+        :param configuration: Configuration of the construct.
+        :return: Hexadecimal fingerprint of the construct.
+        """
+        from multacdkrecipies.common.resources_constructs.lambda_function import lambda_code_fingerprint
+
+        fingerprint = hashlib.sha256(schemas_fingerprint().encode())
+        fingerprint.update(json.dumps([prefix, environment, configuration], sort_keys=True, default=repr).encode())
+        for code_path in sorted(set(_configuration_code_paths(configuration))):
+            if os.path.exists(code_path):
+                fingerprint.update(f"{code_path}:{lambda_code_fingerprint(code_path)}".encode())
+
+        return fingerprint.hexdigest()
+
+    def is_unchanged(self, construct_path: str, fingerprint: str) -> bool:
+        """
+        :param construct_path: Path of the construct in the CDK App.
+        :param fingerprint: Fingerprint of the construct, see 'construct_fingerprint'.
+        :return: True or False depending if the construct was synthesized with the same fingerprint before or not.
+        """
+        previous = self._previous_constructs.get(construct_path)
+        return previous is not None and previous["fingerprint"] == fingerprint
+
+    def record(self, construct_path: str, fingerprint: str, outdir: str = None):
+        """
+        Records a construct defined successfully.
+        :param construct_path: Path of the construct in the CDK App.
+        :param fingerprint: Fingerprint of the construct, see 'construct_fingerprint'.
+        :param outdir: Directory where the CDK App is synthesized.
+        """
+        with self._lock:
+            self._constructs[construct_path] = {"fingerprint": fingerprint}
+            if outdir is not None:
+                self._outdirs.add(outdir)
+
+    def asset_hash(self, code_path: str, exclude: list, code_fingerprint: str) -> str:
+        """
+        Returns the content hash of a code path, reading its files only if its fingerprint changed.
+        :param code_path: Path to a directory or file containing the Lambda Function code.
+        :param exclude: List of glob patterns excluded from the Asset.
+        :param code_fingerprint: Fingerprint of the code path, see 'lambda_code_fingerprint'.
+        :return: Hexadecimal content hash of the code path.
+        """
+        asset_key = hashlib.sha256(json.dumps([code_path, exclude, code_fingerprint]).encode()).hexdigest()
+        with self._lock:
+            content_hash = self._assets.get(asset_key) or self._previous_assets.get(asset_key)
+            if content_hash is None:
+                content_hash = _content_hash(code_path, exclude)
+            self._assets[asset_key] = content_hash
+
+        return content_hash
+
+    def save(self) -> dict:
+        """
+        Saves the fingerprints, asset hashes and synthesized fragments of the constructs defined in this synthesis.
+        Fragments are extracted from the templates using the 'aws:cdk:path' metadata, added by the CDK CLI.
+        :return: Changes of the constructs compared with the previous synthesis, see 'changes'.
+        """
+        resources_by_construct = dict()
+        construct_paths = sorted(self._constructs, key=len, reverse=True)
+        for outdir in self._outdirs:
+            for template_path in glob.glob(os.path.join(outdir, "*.template.json")):
+                with open(template_path) as template_file:
+                    template = json.load(template_file)
+                for logical_id, resource in template.get("Resources", dict()).items():
+                    resource_path = resource.get("Metadata", dict()).get("aws:cdk:path", "")
+                    for construct_path in construct_paths:
+                        if resource_path.startswith(construct_path + "/"):
+                            resources_by_construct.setdefault(construct_path, dict())[logical_id] = resource
+                            break
+
+        os.makedirs(os.path.join(self._cache_path, "fragments"), exist_ok=True)
+        for construct_path, resources in resources_by_construct.items():
+            fragment = json.dumps(resources, sort_keys=True)
+            self._constructs[construct_path]["fragment"] = hashlib.sha256(fragment.encode()).hexdigest()
+            with open(self.fragment_path(construct_path), "w") as fragment_file:
+                fragment_file.write(fragment)
+
+        changes = self.changes()
+        with open(self.manifest_path, "w") as manifest_file:
+            json.dump({"constructs": self._constructs, "assets": self._assets}, manifest_file, indent=2, sort_keys=True)
+
+        return changes
+
+    def changes(self) -> dict:
+        """
+        :return: Dictionary with the 'added', 'changed', 'unchanged' and 'removed' construct paths. A construct changed
+        if its fingerprint or its synthesized fragment is different from the previous synthesis.
+        """
+        changes = {"added": list(), "changed": list(), "unchanged": list(), "removed": list()}
+        for construct_path, construct in sorted(self._constructs.items()):
+            previous = self._previous_constructs.get(construct_path)
+            if previous is None:
+                changes["added"].append(construct_path)
+            elif previous["fingerprint"] != construct["fingerprint"]:
+                changes["changed"].append(construct_path)
+            elif previous.get("fragment") != construct.get("fragment"):
+                changes["changed"].append(construct_path)
+            else:
+                changes["unchanged"].append(construct_path)
+        changes["removed"] = sorted(set(self._previous_constructs) - set(self._constructs))
+
+        return changes
+
+
+@functools.lru_cache(maxsize=None)
+def schemas_fingerprint() -> str:
+    """
+    :return: Hexadecimal hash of the source of the modules that define the Multa CDK Constructs schemas.
+    """
+    from multacdkrecipies.common.validations import base_validations
+    from multacdkrecipies.recipies.utils.validations import validations
+
+    fingerprint = hashlib.sha256()
+    for module in (base_validations, validations):
+        with open(module.__file__, "rb") as module_file:
+            fingerprint.update(module_file.read())
+
+    return fingerprint.hexdigest()
+
+
+def _configuration_code_paths(configuration):
+    if isinstance(configuration, dict):
+        for key, value in configuration.items():
+            if isinstance(key, str) and key.endswith("code_path") and isinstance(value, str):
+                yield value
+            else:
+                yield from _configuration_code_paths(value)
+    elif isinstance(configuration, list):
+        for element in configuration:
+            yield from _configuration_code_paths(element)
+
+
+def _is_excluded(relative_path: str, exclude: list) -> bool:
+    # Same semantics as the Asset exclude globs: patterns without a slash match the base name, the last match wins and
+    # patterns starting with '!' include the path again
+    excluded = False
+    for pattern in exclude or list():
+        negated = pattern.startswith("!")
+        pattern = pattern[1:] if negated else pattern
+        target = relative_path if "/" in pattern else os.path.basename(relative_path)
+        if fnmatch.fnmatch(target, pattern):
+            excluded = not negated
+
+    return excluded
+
+
+def _content_hash(code_path: str, exclude: list) -> str:
+    content_hash = hashlib.sha256(json.dumps(exclude).encode())
+    if os.path.isfile(code_path):
+        with open(code_path, "rb") as code_file:
+            content_hash.update(code_file.read())
+        return content_hash.hexdigest()
+
+    for root, directories, files in os.walk(code_path):
+        directories[:] = sorted(
+            directory
+            for directory in directories
+            if not _is_excluded(os.path.relpath(os.path.join(root, directory), code_path), exclude)
+        )
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            if _is_excluded(os.path.relpath(file_path, code_path), exclude):
+                continue
+            content_hash.update(os.path.relpath(file_path, code_path).encode() + b"\0")
+            with open(file_path, "rb") as code_file:
+                content_hash.update(code_file.read())
+
+    return content_hash.hexdigest()
+
+
+def enable_synth_cache(cache_path: str = DEFAULT_SYNTH_CACHE_PATH) -> SynthCache:
+    """
+    Enables the synthesis cache, it has to be called before the Multa CDK Constructs are accessed for the first time.
+    The cache is saved and the changed constructs summary is printed when the process exits.
+    :param cache_path: Directory of the cache manifest and the synthesized fragments.
+    :return: Active SynthCache.
+    """
+    global _synth_cache
+    if _synth_cache is None:
+        atexit.register(print_synth_cache_summary)
+    _synth_cache = SynthCache(cache_path)
+
+    return _synth_cache
+
+
+def active_synth_cache():
+    """
+    :return: Active SynthCache, None if the synthesis cache is not enabled.
+    """
+    return _synth_cache
+
+
+def is_construct_unchanged() -> bool:
+    """
+    :return: True or False depending if the Multa CDK Construct being defined is unchanged since the previous synthesis.
+    """
+    return getattr(_synth_cache_state, "unchanged", False)
+
+
+def cache_construct(construct_class):
+    """
+    Fingerprints the Multa CDK Construct class instances following the 'prefix', 'environment' and 'configuration'
+    constructor pattern, recording them in the active SynthCache.
+    :param construct_class: Multa CDK Construct class.
+    :return: The same class.
+    """
+    construct_init = construct_class.__init__
+
+    @functools.wraps(construct_init)
+    def cached_init(self, scope, id, *args, **kwargs):
+        if _synth_cache is None or "configuration" not in kwargs:
+            return construct_init(self, scope, id, *args, **kwargs)
+
+        from aws_cdk import core
+
+        construct_path = f"{scope.node.path}/{id}" if scope.node.path else id
+        fingerprint = _synth_cache.construct_fingerprint(kwargs.get("prefix"), kwargs.get("environment"), kwargs["configuration"])
+        _synth_cache_state.unchanged = _synth_cache.is_unchanged(construct_path, fingerprint)
+        try:
+            construct_init(self, scope, id, *args, **kwargs)
+        finally:
+            _synth_cache_state.unchanged = False
+        _synth_cache.record(construct_path, fingerprint, outdir=core.Stage.of(self).outdir)
+
+    construct_class.__init__ = cached_init
+    return construct_class
+
+
+def print_synth_cache_summary():
+    """
+    Saves the active SynthCache and prints the changed constructs summary.
+    """
+    if _synth_cache is None:
+        return
+
+    changes = _synth_cache.save()
+    print(
+        f"Multa synthesis cache: {len(changes['changed'])} changed, {len(changes['added'])} added, "
+        f"{len(changes['unchanged'])} unchanged, {len(changes['removed'])} removed constructs"
+    )
+    for status in ("changed", "added", "removed"):
+        for construct_path in changes[status]:
+            print(f"  {status:<8} {construct_path}")
+
+
+if DEFAULT_SYNTH_CACHE_ENABLED is True:
+    enable_synth_cache()
@@ -1,2 +1,3 @@
+from .schema_compiler import *
 from .validations import *
 from .exceptions import *
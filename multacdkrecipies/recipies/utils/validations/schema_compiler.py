@@ -0,0 +1,195 @@
+from schema import Schema, And, Optional, SchemaError, Use
+
+# Compiled validators by Schema object, the Multa Recipes Schemas are module constants so they are compiled only once.
+_COMPILED_SCHEMAS = dict()
+
+
+class ConfigurationPathError(SchemaError):
+    """
+    Designed to be raised by compiled validators, keeps the path to the configuration element that is not valid.
+    """
+
+    def __init__(self, reason: str, path: list = None):
+        self.reason = reason
+        self.path = path if path is not None else list()
+        SchemaError.__init__(self, reason)
+
+    def __str__(self):
+        path = "".join(f"[{element!r}]" for element in reversed(self.path))
+        return f"configuration{path}: {self.reason}"
+
+
+def compiled_schema(configuration_schema):
+    """
+    Returns the compiled validator of a Schema, compiling it on the first call.
+    :param configuration_schema: Base Multa Recipe Schema in the project.
+    :return: Function that receives a configuration and raises ConfigurationPathError if it is not valid.
+    """
+    cached = _COMPILED_SCHEMAS.get(id(configuration_schema))
+    if cached is None or cached[0] is not configuration_schema:
+        cached = (configuration_schema, compile_schema(configuration_schema))
+        _COMPILED_SCHEMAS[id(configuration_schema)] = cached
+
+    return cached[1]
+
+
+def compile_schema(schema_definition):
+    """
+    Compiles a Schema definition into a tree of specialized validators with the same accept and reject semantics of
+    Schema.validate. The structures used by the Multa Recipes Schemas (dictionaries with literal and Optional keys,
+    lists, And, Use, types and literals) are compiled, any other element is delegated to the schema library.
+    :param schema_definition: Schema object or any element that can be part of a Schema.
+    :return: Function that receives a value and raises ConfigurationPathError if it is not valid.
+    """
+    if type(schema_definition) is Schema:
+        if schema_definition.ignore_extra_keys or schema_definition._error is not None or schema_definition.name:
+            return _delegated_validator(schema_definition)
+        return compile_schema(schema_definition.schema)
+    if type(schema_definition) is dict:
+        return _compile_dict(schema_definition)
+    if type(schema_definition) is list:
+        return _compile_list(schema_definition)
+    if type(schema_definition) is And:
+        if (
+            len(schema_definition.args) != 1
+            or schema_definition._error is not None
+            or schema_definition._ignore_extra_keys
+            or schema_definition._schema is not Schema
+        ):
+            return _delegated_validator(schema_definition)
+        return compile_schema(schema_definition.args[0])
+    if type(schema_definition) is Use:
+        if schema_definition._error is not None:
+            return _delegated_validator(schema_definition)
+        return _compile_use(schema_definition._callable)
+    if type(schema_definition) is type:
+        return _compile_type(schema_definition)
+    if type(schema_definition) in (str, int, float, bool) or schema_definition is None:
+        return _compile_literal(schema_definition)
+
+    return _delegated_validator(schema_definition)
+
+
+def _compile_dict(schema_definition: dict):
+    required_keys = dict()
+    optional_keys = dict()
+    required_validator_keys = list()
+    optional_validator_keys = list()
+    for key, value in schema_definition.items():
+        if type(key) is str:
+            required_keys[key] = compile_schema(value)
+        elif type(key) is Optional and not hasattr(key, "default") and type(key.schema) is str:
+            optional_keys[key.schema] = compile_schema(value)
+        elif type(key) is Optional and not hasattr(key, "default") and type(key.schema) in (And, Use, Schema):
+            optional_validator_keys.append((compile_schema(key.schema), compile_schema(value), None))
+        elif type(key) in (And, Use, Schema):
+            required_validator_keys.append((compile_schema(key), compile_schema(value), key))
+        else:
+            return _delegated_validator(schema_definition)
+
+    if set(required_keys) & set(optional_keys):
+        return _delegated_validator(schema_definition)
+
+    # Same precedence used by Schema, literal keys first and then required keys before the optional ones
+    validator_keys = required_validator_keys + optional_validator_keys
+    required_validator_keys = {validator_key[2] for validator_key in required_validator_keys}
+
+    def validate_dict(data):
+        if not isinstance(data, dict):
+            raise ConfigurationPathError(f"{data!r} should be instance of 'dict'")
+
+        covered_validator_keys = set()
+        for key, value in data.items():
+            if isinstance(key, str):
+                value_validator = required_keys.get(key) or optional_keys.get(key)
+            else:
+                value_validator = None
+
+            if value_validator is None:
+                for key_validator, value_validator, schema_key in validator_keys:
+                    try:
+                        key_validator(key)
+                    except SchemaError:
+                        value_validator = None
+                        continue
+                    covered_validator_keys.add(schema_key)
+                    break
+                else:
+                    raise ConfigurationPathError(f"Wrong key {key!r}")
+
+            try:
+                value_validator(value)
+            except ConfigurationPathError as error:
+                error.path.append(key)
+                raise
+
+        missing_keys = [key for key in required_keys if key not in data]
+        if missing_keys:
+            raise ConfigurationPathError(f"Missing key{'s' if len(missing_keys) > 1 else ''}: {', '.join(map(repr, missing_keys))}")
+        if not required_validator_keys.issubset(covered_validator_keys):
+            raise ConfigurationPathError(f"Missing keys matching: {required_validator_keys - covered_validator_keys!r}")
+
+    return validate_dict
+
+
+def _compile_list(schema_definition: list):
+    if len(schema_definition) != 1:
+        return _delegated_validator(schema_definition)
+    item_validator = compile_schema(schema_definition[0])
+
+    def validate_list(data):
+        if not isinstance(data, list):
+            raise ConfigurationPathError(f"{data!r} should be instance of 'list'")
+        for index, item in enumerate(data):
+            try:
+                item_validator(item)
+            except ConfigurationPathError as error:
+                error.path.append(index)
+                raise
+
+    return validate_list
+
+
+def _compile_use(callable_):
+    def validate_use(data):
+        try:
+            return callable_(data)
+        except BaseException as error:
+            raise ConfigurationPathError(f"{getattr(callable_, '__name__', callable_)}({data!r}) raised {error!r}")
+
+    # Conversions that can't fail for configuration values are not called at all
+    if callable_ in (str, bool):
+        return _accept_all
+    return validate_use
+
+
+def _compile_type(type_):
+    def validate_type(data):
+        if not isinstance(data, type_) or (type_ is int and isinstance(data, bool)):
+            raise ConfigurationPathError(f"{data!r} should be instance of {type_.__name__!r}")
+
+    return validate_type
+
+
+def _compile_literal(literal):
+    def validate_literal(data):
+        if literal != data:
+            raise ConfigurationPathError(f"{literal!r} does not match {data!r}")
+
+    return validate_literal
+
+
+def _accept_all(data):
+    return data
+
+
+def _delegated_validator(schema_definition):
+    delegated_schema = schema_definition if isinstance(schema_definition, Schema) else Schema(schema_definition)
+
+    def validate_delegated(data):
+        try:
+            delegated_schema.validate(data)
+        except SchemaError as error:
+            raise ConfigurationPathError(str(error.code).replace("\n", " "))
+
+    return validate_delegated
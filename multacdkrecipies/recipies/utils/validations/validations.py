@@ -1,5 +1,4 @@
 import os
-import traceback
 
 from schema import Schema, And, Use, Optional, SchemaError
 
@@ -7,8 +6,42 @@ from multacdkrecipies.common.validations.base_validations import (
     AUTHORIZER_LAMBDA_BASE_SCHEMA,
     DYNAMODB_TABLE_SCHEMA,
     IOT_ANALYTICS_DATASET,
+    KINESIS_EVENT_SOURCE_SCHEMA,
+    KINESIS_STREAM_SCHEMA,
     LAMBDA_BASE_SCHEMA,
+    NESTED_STACK_SHARDING_SCHEMA,
     S3_BUCKET_SCHEMA,
+    SQS_DEAD_LETTER_QUEUE_SCHEMA,
+    SQS_FIFO_SCHEMA,
+    SQS_LAMBDA_HANDLER_SCHEMA,
+)
+from .schema_compiler import compiled_schema
+from ..synth_cache import is_construct_unchanged
+
+APIGATEWAY_STAGE_OPTIONS_SCHEMA = Schema(
+    {
+        "metrics_enabled": And(Use(bool)),
+        "logging_level": And(Use(str)),
+        Optional("cache_cluster"): {
+            "enabled": And(Use(bool)),
+            Optional("size"): And(Use(str)),
+            Optional("encrypted"): And(Use(bool)),
+        },
+    }
+)
+
+APIGATEWAY_METHOD_CACHE_SCHEMA = Schema(
+    {
+        Optional("enabled"): And(Use(bool)),
+        Optional("methods"): [And(Use(str))],
+        Optional("ttl"): And(Use(int)),
+        Optional("encrypted"): And(Use(bool)),
+        Optional("key_parameters"): {
+            Optional("path"): [And(Use(str))],
+            Optional("querystring"): [And(Use(str))],
+            Optional("header"): [And(Use(str))],
+        },
+    }
 )
 
 APIGATEWAY_ASYNC_WEB_SERVICE_SCHEMA = Schema(
@@ -62,7 +95,7 @@ APIGATEWAY_SIMPLE_WEB_SERVICE_SCHEMA = Schema(
                 Optional("default_http_methods"): [And(Use(str))],
                 "default_handler": LAMBDA_BASE_SCHEMA,
                 Optional("default_media_types"): [And(Use(str))],
-                Optional("default_stage_options"): {"metrics_enabled": And(Use(bool)), "logging_level": And(Use(str))},
+                Optional("default_stage_options"): APIGATEWAY_STAGE_OPTIONS_SCHEMA,
             },
             "resource": {
                 "resource_name": And(Use(str)),
@@ -103,28 +136,32 @@ APIGATEWAY_ROBUST_WEB_SERVICE_SCHEMA = Schema(
                 Optional("default_http_methods"): [And(Use(str))],
                 "default_handler": LAMBDA_BASE_SCHEMA,
                 Optional("default_media_types"): [And(Use(str))],
-                Optional("default_stage_options"): {"metrics_enabled": And(Use(bool)), "logging_level": And(Use(str))},
+                Optional("default_stage_options"): APIGATEWAY_STAGE_OPTIONS_SCHEMA,
             },
             Optional("resource_trees"): [
                 {
                     "resource_name": And(Use(str)),
                     Optional("methods"): [And(Use(str))],
                     "handler": LAMBDA_BASE_SCHEMA,
+                    Optional("cache"): APIGATEWAY_METHOD_CACHE_SCHEMA,
                     Optional("child"): {
                         "resource_name": And(Use(str)),
                         Optional("methods"): [And(Use(str))],
                         "handler": LAMBDA_BASE_SCHEMA,
+                        Optional("cache"): APIGATEWAY_METHOD_CACHE_SCHEMA,
                         Optional("childs"): [
                             {
                                 "resource_name": And(Use(str)),
                                 Optional("methods"): [And(Use(str))],
                                 "handler": LAMBDA_BASE_SCHEMA,
+                                Optional("cache"): APIGATEWAY_METHOD_CACHE_SCHEMA,
                             }
                         ],
                     },
                 }
             ],
         },
+        Optional("sharding"): NESTED_STACK_SHARDING_SCHEMA,
     }
 )
 
@@ -157,12 +194,13 @@ APIGATEWAY_FAN_OUT_WEB_SERVICE_SCHEMA = Schema(
                 Optional("default_http_methods"): [And(Use(str))],
                 "default_handler": LAMBDA_BASE_SCHEMA,
                 Optional("default_media_types"): [And(Use(str))],
-                Optional("default_stage_options"): {"metrics_enabled": And(Use(bool)), "logging_level": And(Use(str))},
+                Optional("default_stage_options"): APIGATEWAY_STAGE_OPTIONS_SCHEMA,
             },
             "resource": {
                 "resource_name": And(Use(str)),
                 Optional("methods"): [And(Use(str))],
                 Optional("handler"): LAMBDA_BASE_SCHEMA,
+                Optional("cache"): APIGATEWAY_METHOD_CACHE_SCHEMA,
             },
         },
     }
@@ -264,12 +302,14 @@ USER_SERVERLESS_BACKEND_SCHEMA = Schema(
 LAMBDA_FUNCTIONS_CLUSTER_SCHEMA = Schema(
     {
         "functions": [LAMBDA_BASE_SCHEMA],
+        Optional("sharding"): NESTED_STACK_SHARDING_SCHEMA,
     }
 )
 
 S3_BUCKETS_CLUSTER_SCHEMA = Schema(
     {
         "buckets": [S3_BUCKET_SCHEMA],
+        Optional("sharding"): NESTED_STACK_SHARDING_SCHEMA,
     }
 )
 
@@ -396,12 +436,16 @@ IOT_SNS_CONFIG_SCHEMA = Schema(
     }
 )
 
+# AWS IoT Rules SQS action does not support FIFO queues, per device ordering is done with IOT_KINESIS_CONFIG_SCHEMA
 IOT_SQS_CONFIG_SCHEMA = Schema(
     {
         "queue": {
             "queue_name": And(Use(str)),
             Optional("queue_delivery_delay"): And(Use(int)),
             Optional("queue_message_visibility"): And(Use(int)),
+            Optional("queue_receive_wait_time"): And(Use(int)),
+            Optional("queue_retention_period"): And(Use(int)),
+            Optional("dead_letter_queue"): SQS_DEAD_LETTER_QUEUE_SCHEMA,
             Optional("alarms"): [
                 {
                     "name": And(Use(str)),
@@ -413,7 +457,7 @@ IOT_SQS_CONFIG_SCHEMA = Schema(
             ],
         },
         "lambda_handlers": [
-            LAMBDA_BASE_SCHEMA,
+            SQS_LAMBDA_HANDLER_SCHEMA,
         ],
         "iot_rule": {
             "rule_name": And(Use(str)),
@@ -471,6 +515,10 @@ SQS_CONFIG_SCHEMA = Schema(
             "queue_name": And(Use(str)),
             Optional("queue_delivery_delay"): And(Use(int)),
             Optional("queue_message_visibility"): And(Use(int)),
+            Optional("queue_receive_wait_time"): And(Use(int)),
+            Optional("queue_retention_period"): And(Use(int)),
+            Optional("dead_letter_queue"): SQS_DEAD_LETTER_QUEUE_SCHEMA,
+            Optional("fifo"): SQS_FIFO_SCHEMA,
             Optional("alarms"): [
                 {
                     "name": And(Use(str)),
@@ -482,22 +530,18 @@ SQS_CONFIG_SCHEMA = Schema(
             ],
         },
         "lambda_handlers": [
-            LAMBDA_BASE_SCHEMA,
+            SQS_LAMBDA_HANDLER_SCHEMA,
         ],
     }
 )
 
 IOT_KINESIS_CONFIG_SCHEMA = Schema(
     {
-        "stream": {
-            "stream_name": And(Use(str)),
-            "shard_count": And(Use(int)),
-            Optional("retention_period"): And(Use(int)),
-        },
+        "stream": KINESIS_STREAM_SCHEMA,
         "lambda_handlers": [
             {
                 "lambda_handler": LAMBDA_BASE_SCHEMA,
-                "event_settings": {"starting_position": And(Use(str)), "batch_size": And(Use(int))},
+                "event_settings": KINESIS_EVENT_SOURCE_SCHEMA,
             }
         ],
         "iot_rule": {
@@ -506,6 +550,7 @@ IOT_KINESIS_CONFIG_SCHEMA = Schema(
             "rule_disabled": And(Use(bool)),
             "sql": And(Use(str)),
             "aws_iot_sql_version": And(Use(str)),
+            Optional("partition_key"): And(Use(str)),
         },
     }
 )
@@ -517,13 +562,29 @@ IOT_KINESIS_FIREHOSE_CONFIG_SCHEMA = Schema(
             "destinations": {
                 Optional("extended_s3_destination_configuration"): {
                     "bucket": S3_BUCKET_SCHEMA,
-                    "compression_format": And(Use(str)),
-                    "buffering_hints": And(Use(str)),
+                    Optional("compression_format"): And(Use(str)),
+                    Optional("buffering_hints"): {Optional("size"): And(Use(int)), Optional("interval"): And(Use(int))},
+                    Optional("prefix"): And(Use(str)),
+                    Optional("error_output_prefix"): And(Use(str)),
+                    Optional("data_format_conversion"): {
+                        "database_name": And(Use(str)),
+                        "table_name": And(Use(str)),
+                        Optional("table_version"): And(Use(str)),
+                        Optional("output_format"): And(Use(str)),
+                        Optional("compression"): And(Use(str)),
+                    },
+                    Optional("dynamic_partitioning"): {
+                        "enabled": And(Use(bool)),
+                        "partition_keys": {And(Use(str)): And(Use(str))},
+                        Optional("retry_duration"): And(Use(int)),
+                    },
                 },
                 Optional("s3_destination_configuration"): {
                     "bucket": S3_BUCKET_SCHEMA,
-                    "compression_format": And(Use(str)),
-                    "buffering_hints": And(Use(str)),
+                    Optional("compression_format"): And(Use(str)),
+                    Optional("buffering_hints"): {Optional("size"): And(Use(int)), Optional("interval"): And(Use(int))},
+                    Optional("prefix"): And(Use(str)),
+                    Optional("error_output_prefix"): And(Use(str)),
                 },
             },
         },
@@ -533,6 +594,8 @@ IOT_KINESIS_FIREHOSE_CONFIG_SCHEMA = Schema(
             "rule_disabled": And(Use(bool)),
             "sql": And(Use(str)),
             "aws_iot_sql_version": And(Use(str)),
+            Optional("batch_mode"): And(Use(bool)),
+            Optional("separator"): And(Use(str)),
         },
     }
 )
@@ -605,12 +668,14 @@ LAMBDA_LAYER_SCHEMA = Schema(
         Optional("description"): And(Use(str)),
         Optional("license"): And(Use(str)),
         Optional("dependencies"): And(Use(bool)),
+        Optional("build_cache"): And(Use(bool)),
         Optional("paths"): {
             "layer_code_path": And(Use(str)),
             "layer_directory_path": And(Use(str)),
             "python_requirements_file_path": And(Use(str)),
         },
         "layer_runtimes": [And(Use(str))],
+        Optional("architecture"): And(Use(str)),
         Optional("exclude"): [And(Use(str))],
     }
 )
@@ -641,16 +706,21 @@ SSM_PARAMETER_STRING_SCHEMA = Schema(
 
 def validate_configuration(configuration_schema, configuration_received):
     """
-    Validates the configuration passed to CDK Constructs.
+    Validates the configuration passed to CDK Constructs. The schema is compiled the first time it is used, see
+    'compile_schema', with the same semantics of the schema library but a lot faster for big configurations. Skipped
+    for constructs that are unchanged since the previous synthesis, see 'SynthCache'.
     :param configuration_schema: Base Multa Recipe Schema in the project.
     :param configuration_received: Configuration passed by external application.
     """
+    if is_construct_unchanged() is True:
+        return
+
     try:
-        configuration_schema.validate(configuration_received)
-    except SchemaError:
+        compiled_schema(configuration_schema)(configuration_received)
+    except SchemaError as error:
         print("Improper configuration passed to Multa CDK Construct!!!")
-        print(traceback.format_exc())
-        raise RuntimeError
+        print(error)
+        raise RuntimeError(str(error))
 
 
 def validate_file(file_path: str):